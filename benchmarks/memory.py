@@ -0,0 +1,83 @@
+"""Memory benchmark: bytes retained per parsed forecast.
+
+Compares the original representation (a list of (datetime, Weather) rows built from plain dataclasses with
+per-instance dicts) with the current slotted, columnar models.
+
+Usage: python benchmarks/memory.py [--forecasts N] [--slots N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from payloads import forecast_payload
+
+from weatherpy.api.comm import parse_weather_forecast
+
+
+@dataclass
+class LegacyWeather:
+    description: list[tuple[str, str]]
+    temp: float
+    temp_feel: float
+    pressure: int
+    humidity: int
+    wind_spd: float
+    wind_deg: int
+    rain: dict[str, int]
+    snow: dict[str, int]
+
+
+def parse_legacy(data: dict) -> list[tuple[datetime, LegacyWeather]]:
+    forecasted = []
+    for forecast in data["list"]:
+        params = forecast["main"]
+        weather = LegacyWeather(
+            description=[(x["description"], x["icon"]) for x in forecast["weather"]],
+            temp=params["temp"],
+            temp_feel=params["feels_like"],
+            pressure=params["pressure"],
+            humidity=params["humidity"],
+            wind_spd=forecast["wind"]["speed"],
+            wind_deg=forecast["wind"]["deg"],
+            rain=forecast.get("rain", {}),
+            snow=forecast.get("snow", {}),
+        )
+        forecasted.append((datetime.fromtimestamp(forecast["dt"]), weather))
+    return forecasted
+
+
+def measure(parse: Callable[[dict], object], payloads: list[dict]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    parsed = [parse(payload) for payload in payloads]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+    return (end - start) / len(payloads)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--forecasts", type=int, default=1000)
+    parser.add_argument("--slots", type=int, default=40)
+    args = parser.parse_args()
+
+    # Payload dicts are built up front and shared, so only the parsed models are measured. The legacy parser
+    # keeps references to the payload's rain/snow dicts, which slightly flatters it.
+    payloads = [forecast_payload(slots=args.slots) for _ in range(args.forecasts)]
+    before = measure(parse_legacy, payloads)
+    after = measure(parse_weather_forecast, payloads)
+    print(f"{args.forecasts} forecasts x {args.slots} slots")
+    print(f"before (rows of dataclasses): {before:10.0f} bytes/forecast")
+    print(f"after  (slotted, columnar):   {after:10.0f} bytes/forecast")
+    print(f"reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
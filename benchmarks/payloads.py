@@ -0,0 +1,55 @@
+"""Synthetic OpenWeather payloads shaped like real API responses (in standard units, as weatherpy requests them)."""
+
+import random
+
+DESCRIPTIONS: list[tuple[str, str]] = [
+    ("clear sky", "01d"),
+    ("few clouds", "02d"),
+    ("overcast clouds", "04d"),
+    ("light rain", "10d"),
+    ("light snow", "13n"),
+]
+
+
+def current_payload(lat: float = 51.5073, lon: float = -0.1276, dt: int = 1700000000) -> dict:
+    desc, icon = random.choice(DESCRIPTIONS)
+    return {
+        "coord": {"lon": lon, "lat": lat},
+        "weather": [{"id": 500, "main": "Rain", "description": desc, "icon": icon}],
+        "main": {"temp": 284.45, "feels_like": 283.75, "pressure": 1012, "humidity": 81},
+        "wind": {"speed": 4.1, "deg": 240},
+        "rain": {"1h": 0.21},
+        "dt": dt,
+        "sys": {"country": "GB", "sunrise": dt - 6 * 3600, "sunset": dt + 3 * 3600},
+        "id": 2643743,
+        "name": "London",
+        "cod": 200,
+    }
+
+
+def forecast_payload(lat: float = 51.5073, lon: float = -0.1276, dt: int = 1700000000, slots: int = 40) -> dict:
+    items = []
+    for i in range(slots):
+        desc, icon = random.choice(DESCRIPTIONS)
+        item = {
+            "dt": dt + i * 3 * 3600,
+            "main": {
+                "temp": round(random.uniform(268, 298), 2),
+                "feels_like": round(random.uniform(265, 298), 2),
+                "pressure": random.randint(990, 1030),
+                "humidity": random.randint(40, 100),
+            },
+            "weather": [{"id": 500, "main": "Rain", "description": desc, "icon": icon}],
+            "wind": {"speed": round(random.uniform(0, 12), 2), "deg": random.randint(0, 359)},
+        }
+        if icon == "10d":
+            item["rain"] = {"3h": round(random.uniform(0, 4), 2)}
+        if icon == "13n":
+            item["snow"] = {"3h": round(random.uniform(0, 4), 2)}
+        items.append(item)
+    return {
+        "cod": "200",
+        "cnt": slots,
+        "list": items,
+        "city": {"id": 2643743, "name": "London", "coord": {"lat": lat, "lon": lon}, "country": "GB"},
+    }
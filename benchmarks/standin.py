@@ -0,0 +1,153 @@
+"""Local stand-in for the OpenWeather (and ipify) API.
+
+Serves the recorded payloads from `benchmarks/data` with configurable latency and error injection. Point weatherpy
+at it with WEATHERPY_API_URL=http://HOST:PORT and WEATHERPY_IP_URL=http://HOST:PORT/ip (and WEATHERPY_CALLS_PER_MINUTE=0
+to turn off the client-side rate limiter).
+
+Usage: python benchmarks/standin.py [--port N] [--latency MS] [--jitter MS] [--error-rate P] [--error-status CODE]
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+DATA_DIR: Path = Path(__file__).parent / "data"
+
+ROUTES: dict[str, str] = {
+    "/geo/1.0/direct": "direct.json",
+    "/geo/1.0/reverse": "reverse.json",
+    "/data/2.5/weather": "current.json",
+    "/data/2.5/forecast": "forecast.json",
+}
+
+
+def _shift_timestamps(payload: dict, offset: int) -> dict:
+    """Moves recorded timestamps so that the data looks fresh, like a live response would."""
+    if "dt" in payload:
+        payload["dt"] += offset
+    if "sys" in payload:
+        for key in ("sunrise", "sunset"):
+            payload["sys"][key] += offset
+    for item in payload.get("list", []):
+        item["dt"] += offset
+    return payload
+
+
+def load_payloads(data_dir: Path = DATA_DIR) -> dict[str, bytes]:
+    now = int(time.time())
+    payloads = {}
+    for route, filename in ROUTES.items():
+        payload = json.loads((data_dir / filename).read_text(encoding="utf8"))
+        if isinstance(payload, dict):
+            base = payload.get("dt", payload.get("list", [{}])[0].get("dt", now))
+            payload = _shift_timestamps(payload, now - base)
+        payloads[route] = json.dumps(payload).encode()
+    return payloads
+
+
+@dataclass
+class StandInConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Args:
+        latency (float): Seconds added to every response.
+        jitter (float): Maximum random seconds added on top of `latency`.
+        error_rate (float): Fraction of requests answered with `error_status`.
+        error_status (int): HTTP status of injected errors.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 503
+    requests: int = 0
+    errors: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; with Nagle's algorithm on, keep-alive clients wait ~40 ms for each.
+    disable_nagle_algorithm = True
+    payloads: dict[str, bytes] = {}
+    config: StandInConfig = StandInConfig()
+
+    def do_GET(self):
+        config = self.config
+        with config.lock:
+            config.requests += 1
+        delay = config.latency + random.uniform(0, config.jitter)
+        if delay:
+            time.sleep(delay)
+        path = urlparse(self.path).path.rstrip("/")
+        if config.error_rate and random.random() < config.error_rate:
+            with config.lock:
+                config.errors += 1
+            self._send(config.error_status, json.dumps({"cod": config.error_status, "message": "injected"}).encode())
+        elif path == "/ip":
+            self._send(200, b"127.0.0.1", content_type="text/plain")
+        elif path in self.payloads:
+            self._send(200, self.payloads[path])
+        else:
+            self._send(404, b'{"cod": "404", "message": "not found"}')
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+def start_server(
+    host: str = "127.0.0.1", port: int = 0, config: Optional[StandInConfig] = None
+) -> tuple[StandInServer, str]:
+    """Starts the stand-in on a background thread and returns it with its base URL."""
+    handler = type(
+        "ConfiguredStandInHandler",
+        (StandInHandler,),
+        {"payloads": load_payloads(), "config": config or StandInConfig()},
+    )
+    server = StandInServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0, help="maximum random milliseconds added on top")
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+    config = StandInConfig(args.latency / 1000, args.jitter / 1000, args.error_rate, args.error_status)
+    server, url = start_server(args.host, args.port, config)
+    print(
+        f"Serving at {url} (WEATHERPY_API_URL={url} WEATHERPY_IP_URL={url}/ip WEATHERPY_CALLS_PER_MINUTE=0), "
+        "Ctrl+C to stop."
+    )
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
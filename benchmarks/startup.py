@@ -0,0 +1,104 @@
+"""Startup benchmark: import time and end-to-end cold start of each `wthr` subcommand.
+
+Every command runs in a fresh interpreter against a temporary home directory holding a configuration file and a
+warm response cache, so no network access is needed and the numbers reflect startup, config and rendering cost.
+
+Usage: python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from configparser import ConfigParser
+from pathlib import Path
+
+from payloads import current_payload, forecast_payload
+
+from weatherpy.api.cache import ResponseCache
+from weatherpy.api.units import STANDARD
+
+LAT, LON, UNITS = 51.5073, -0.1276, "metric"
+
+COMMANDS: dict[str, list[str]] = {
+    "wthr --help": ["--help"],
+    "wthr": [],
+    "wthr forecast": ["forecast"],
+    "wthr config --display": ["config", "--display"],
+}
+
+
+def prepare_home(home: Path, warm_cache: bool = True) -> None:
+    app_dir = home / "weatherpy"
+    app_dir.mkdir()
+    config = ConfigParser()
+    config["SETTINGS"] = {"token": "0" * 32, "units": UNITS}
+    config["HOME"] = {"name": "London", "state/region": "", "country": "GB", "lat": str(LAT), "lon": str(LON)}
+    with open(app_dir / "weatherpy.cfg", mode="w", encoding="utf8") as file:
+        config.write(file)
+    if not warm_cache:
+        return
+    cache = ResponseCache(app_dir / "cache")
+    cache.put("weather", LAT, LON, STANDARD, current_payload(LAT, LON, dt=int(time.time())))
+    cache.put("forecast", LAT, LON, STANDARD, forecast_payload(LAT, LON, dt=int(time.time())))
+
+
+def run(args: list[str], env: dict[str, str], importtime: bool = False) -> subprocess.CompletedProcess:
+    flags = ["-X", "importtime"] if importtime else []
+    return subprocess.run(
+        [sys.executable, *flags, "-m", "weatherpy", *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+
+
+def top_level_imports(stderr: str) -> dict[str, int]:
+    """Parses `-X importtime` output into cumulative microseconds per top-level import."""
+    imports: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith(" ") or name.startswith("  "):
+            continue
+        imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        prepare_home(home)
+        env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        print(f"bare interpreter: {(time.perf_counter() - start) * 1000:.0f} ms\n")
+
+        for label, command in COMMANDS.items():
+            imports = top_level_imports(run(command, env, importtime=True).stderr)
+            heaviest = sorted(imports.items(), key=lambda item: item[1], reverse=True)[:5]
+            timings = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                run(command, env)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(
+                f"{label:<24} cold start median {statistics.median(timings):6.0f} ms, min {min(timings):6.0f} ms, "
+                f"imports {sum(imports.values()) / 1000:6.0f} ms"
+            )
+            print("    " + ", ".join(f"{name} {us / 1000:.0f} ms" for name, us in heaviest))
+
+
+if __name__ == "__main__":
+    main()
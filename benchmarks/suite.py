@@ -0,0 +1,191 @@
+"""End-to-end benchmark suite run against the local OpenWeather stand-in.
+
+Measures parsing, rendering, the API functions over HTTP and full `wthr` command execution, and reports
+throughput and latency percentiles. Results can be saved and compared with a previous run to catch regressions.
+
+Usage: python benchmarks/suite.py [--iterations N] [--runs N] [--latency MS] [--error-rate P]
+                                  [--output results.json] [--compare baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import Callable
+
+from standin import DATA_DIR, StandInConfig, load_payloads, start_server
+from startup import prepare_home
+
+from weatherpy.api.comm import (
+    get_current_weather,
+    get_locations_by_name,
+    get_weather_forecast,
+    parse_current_weather,
+    parse_weather_forecast,
+)
+from weatherpy.presenter.current import show_current_weather
+from weatherpy.presenter.forecast import show_forecast
+
+TOKEN: str = "0" * 32
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    k = (len(ordered) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    return {
+        "n": len(samples),
+        "ops_per_s": len(samples) / sum(samples),
+        "p50_ms": percentile(samples, 0.50) * 1000,
+        "p95_ms": percentile(samples, 0.95) * 1000,
+        "p99_ms": percentile(samples, 0.99) * 1000,
+        "mean_ms": statistics.fmean(samples) * 1000,
+    }
+
+
+def measure(fn: Callable[[], object], iterations: int, warmup: int = 3) -> dict[str, float]:
+    for _ in range(min(warmup, iterations)):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def parsing_benchmarks(iterations: int) -> dict[str, dict]:
+    payloads = load_payloads(DATA_DIR)
+    current = json.loads(payloads["/data/2.5/weather"])
+    forecast = json.loads(payloads["/data/2.5/forecast"])
+    return {
+        "parse current": measure(lambda: parse_current_weather(current), iterations),
+        "parse forecast": measure(lambda: parse_weather_forecast(forecast), iterations),
+        "decode+parse forecast": measure(
+            lambda: parse_weather_forecast(json.loads(payloads["/data/2.5/forecast"])), iterations
+        ),
+    }
+
+
+def rendering_benchmarks(iterations: int) -> dict[str, dict]:
+    payloads = load_payloads(DATA_DIR)
+    current = parse_current_weather(json.loads(payloads["/data/2.5/weather"]))
+    forecast = parse_weather_forecast(json.loads(payloads["/data/2.5/forecast"]))
+
+    def render(fn: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            with redirect_stdout(io.StringIO()):
+                fn()
+
+        return run
+
+    return {
+        "render current": measure(render(lambda: show_current_weather(current, "metric")), iterations),
+        "render forecast": measure(render(lambda: show_forecast(forecast, "metric")), max(1, iterations // 10)),
+    }
+
+
+def api_benchmarks(iterations: int) -> dict[str, dict]:
+    # Caches are bypassed so that every call goes over HTTP to the stand-in.
+    return {
+        "api locations_by_name": measure(
+            lambda: get_locations_by_name("London", token=TOKEN, use_cache=False), iterations
+        ),
+        "api current_weather": measure(
+            lambda: get_current_weather(51.5073, -0.1276, TOKEN, use_cache=False), iterations
+        ),
+        "api weather_forecast": measure(
+            lambda: get_weather_forecast(51.5073, -0.1276, TOKEN, use_cache=False), iterations
+        ),
+    }
+
+
+def command_benchmarks(runs: int, env: dict[str, str]) -> dict[str, dict]:
+    commands = {
+        "cmd wthr": ["--no-cache"],
+        "cmd wthr --city": ["--city", "London", "--no-cache"],
+        "cmd wthr forecast": ["forecast", "--no-cache"],
+    }
+    results = {}
+    for name, args in commands.items():
+
+        def run(args: list[str] = args) -> None:
+            subprocess.run([sys.executable, "-m", "weatherpy", *args], env=env, stdout=subprocess.DEVNULL, check=True)
+
+        results[name] = measure(run, runs, warmup=1)
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> bool:
+    """Prints p50 changes against a baseline and returns whether any benchmark regressed beyond the threshold."""
+    regressed = False
+    print("\ncomparison with baseline (p50):")
+    for name, stats in results.items():
+        if name not in baseline:
+            continue
+        ratio = stats["p50_ms"] / baseline[name]["p50_ms"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {name:<24} {ratio:6.2f}x{flag}")
+    return regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200, help="iterations of in-process benchmarks")
+    parser.add_argument("--runs", type=int, default=10, help="runs of full command benchmarks")
+    parser.add_argument("--latency", type=float, default=0, help="stand-in latency in milliseconds")
+    parser.add_argument("--jitter", type=float, default=0, help="stand-in latency jitter in milliseconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of stand-in responses failing")
+    parser.add_argument("--output", type=Path, help="save results as JSON")
+    parser.add_argument("--compare", type=Path, help="compare with results saved by a previous run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    config = StandInConfig(args.latency / 1000, args.jitter / 1000, args.error_rate)
+    server, url = start_server(config=config)
+    os.environ["WEATHERPY_API_URL"] = url
+    os.environ["WEATHERPY_IP_URL"] = f"{url}/ip"
+    # The stand-in has no call budget; keep the client-side rate limiter from throttling the benchmarks.
+    os.environ["WEATHERPY_CALLS_PER_MINUTE"] = "0"
+
+    results: dict[str, dict] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        home = Path(tmp)
+        prepare_home(home, warm_cache=False)
+        env = {**os.environ, "HOME": str(home), "USERPROFILE": str(home)}
+        results.update(parsing_benchmarks(args.iterations))
+        results.update(rendering_benchmarks(args.iterations))
+        results.update(api_benchmarks(args.iterations))
+        results.update(command_benchmarks(args.runs, env))
+    server.shutdown()
+
+    print(f"{'benchmark':<24} {'n':>5} {'ops/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in results.items():
+        print(
+            f"{name:<24} {stats['n']:>5} {stats['ops_per_s']:>10.1f} "
+            f"{stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} {stats['p99_ms']:>9.2f}"
+        )
+    print(f"\nstand-in served {config.requests} requests, {config.errors} injected errors")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=1) + "\n", encoding="utf8")
+    if args.compare and compare(results, json.loads(args.compare.read_text(encoding="utf8")), args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
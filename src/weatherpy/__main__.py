@@ -1,4 +1,6 @@
 from weatherpy.ui.cli import app
 
+main = app.meta
+
 if __name__ == "__main__":
-    app()
+    main()
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional, TypeVar
+
+from .comm import get_current_weather, get_locations_by_name, get_weather_forecast, raise_for_error, send_request
+from .exceptions import BudgetExhausted
+from .models import Current, Forecast, Geolocation
+from .transport import POOL_MAXSIZE, configure_transport
+
+if TYPE_CHECKING:
+    from requests import Response
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY: int = 8
+# Batches wait their turn at the shared rate limiter rather than failing locations as soon as the budget runs out.
+DEFAULT_MAX_WAIT: float = 60.0
+
+
+class AsyncClient:
+    """
+    Asyncio client for fetching many locations at once.
+
+    Requests reuse the blocking functions from `comm` (with their caches and the pooled transport) and run them on a
+    dedicated thread pool, so at most `concurrency` requests are in flight at any time. Network errors are raised
+    instead of terminating the process, and calls wait up to `max_wait` seconds for the shared rate limiter.
+    Requests actually sent (i.e. not answered from a cache) are counted in `requests_sent`; once `budget` of them
+    have been sent, further ones raise `BudgetExhausted`.
+
+    Args:
+        token (str): OpenWeather API key.
+        concurrency (int): Maximum number of requests in flight.
+        use_cache (bool): Whether the response cache and the geocoding store are used.
+        refresh (bool): Whether cached weather responses are skipped (fresh responses are still stored).
+        max_wait (float): Longest time a call waits for the rate limiter before `RateLimited` is raised.
+        budget (int): Optional maximum number of requests to send.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        use_cache: bool = True,
+        refresh: bool = False,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        budget: Optional[int] = None,
+    ):
+        self.token = token
+        self.use_cache = use_cache
+        self.refresh = refresh
+        self.concurrency = concurrency
+        self.max_wait = max_wait
+        self.budget = budget
+        self.requests_sent = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncClient":
+        if self.concurrency > POOL_MAXSIZE:
+            configure_transport(pool_maxsize=self.concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="weatherpy")
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _request(self, url: str) -> "Response":
+        with self._lock:
+            if self.budget is not None and self.requests_sent >= self.budget:
+                raise BudgetExhausted(self.budget)
+            self.requests_sent += 1
+        return send_request(url, max_wait=self.max_wait)
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        if self._executor is None or self._semaphore is None:
+            raise RuntimeError("AsyncClient must be used as an async context manager.")
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            kwargs.setdefault("request", self._request)
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+
+    def _request_or_raise(self, url: str) -> "Response":
+        return raise_for_error(self._request(url))
+
+    async def locations_by_name(self, name: str) -> list[Geolocation]:
+        # Geocoding reads error responses as no results; raising them keeps e.g. a bad key from passing as an
+        # unknown place.
+        return await self._run(
+            get_locations_by_name,
+            name=name,
+            token=self.token,
+            use_cache=self.use_cache,
+            request=self._request_or_raise,
+        )
+
+    async def current_weather(self, lat: float, lon: float) -> Current:
+        return await self._run(
+            get_current_weather,
+            lat=lat,
+            lon=lon,
+            token=self.token,
+            use_cache=self.use_cache,
+            refresh=self.refresh,
+        )
+
+    async def weather_forecast(self, lat: float, lon: float) -> Forecast:
+        return await self._run(
+            get_weather_forecast,
+            lat=lat,
+            lon=lon,
+            token=self.token,
+            use_cache=self.use_cache,
+            refresh=self.refresh,
+        )
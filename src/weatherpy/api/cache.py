@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Callable, Hashable, Optional, TypeVar, Union
+
+from weatherpy.paths import CACHE_DIR
+
+# OpenWeather refreshes current conditions about every 10 minutes and forecasts less often than that.
+TTL: dict[str, float] = {"weather": 10 * 60, "forecast": 30 * 60}
+MAX_ENTRIES: int = 256
+MEMORY_ENTRIES: int = 1024
+COORD_PRECISION: int = 2
+
+T = TypeVar("T")
+
+
+def quantize(coord: float, precision: int = COORD_PRECISION) -> str:
+    """Rounds a coordinate so that nearby points (~1 km apart for 2 decimal places) share a cache entry."""
+    return f"{round(coord, precision):.{precision}f}"
+
+
+class ResponseCache:
+    """
+    Persistent cache of OpenWeather responses, one JSON file per entry.
+
+    Entries are keyed by endpoint, quantized coordinates and units, and expire after the endpoint's TTL. Expired
+    entries stay on disk until they are evicted, so that `get_stale` can still serve them as last-known data.
+    Files are written atomically (temporary file + rename), so concurrent processes never see partial entries.
+    The least recently used entries are evicted once the cache holds more than `max_entries` files.
+
+    Args:
+        directory (Path): Directory holding the cache entries.
+        ttl (dict[str, float]): Time to live in seconds per endpoint.
+        max_entries (int): Maximum number of entries kept on disk.
+    """
+
+    def __init__(self, directory: Path, ttl: Optional[dict[str, float]] = None, max_entries: int = MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = TTL if ttl is None else ttl
+        self.max_entries = max_entries
+
+    def path(self, endpoint: str, lat: float, lon: float, units: str) -> Path:
+        return self.directory / f"{endpoint}_{quantize(lat)}_{quantize(lon)}_{units}.json"
+
+    def get(self, endpoint: str, lat: float, lon: float, units: str) -> Optional[dict]:
+        stale = self.get_stale(endpoint, lat, lon, units)
+        if stale is None or time.time() - stale[1] > self.ttl.get(endpoint, 0):
+            return None
+        return stale[0]
+
+    def get_stale(self, endpoint: str, lat: float, lon: float, units: str) -> Optional[tuple[dict, float]]:
+        """Returns the payload with the time it was stored, however old it is."""
+        path = self.path(endpoint, lat, lon, units)
+        try:
+            with open(path, encoding="utf8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("payload") is None:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry["payload"], entry.get("stored_at", 0)
+
+    def put(self, endpoint: str, lat: float, lon: float, units: str, payload: dict) -> None:
+        import tempfile
+
+        path = self.path(endpoint, lat, lon, units)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".", suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, mode="w", encoding="utf8") as file:
+                json.dump({"stored_at": time.time(), "payload": payload}, file)
+            os.replace(tmp, path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Removes the least recently used entries above the size bound."""
+        try:
+            entries = [(entry.stat().st_mtime, entry) for entry in self.directory.glob("*.json")]
+        except OSError:
+            return
+        if len(entries) <= self.max_entries:
+            return
+        entries.sort()
+        for _, entry in entries[: len(entries) - self.max_entries]:
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        for entry in self.directory.glob("*.json"):
+            try:
+                entry.unlink()
+            except OSError:
+                pass
+
+
+class MemoryCache:
+    """
+    In-process LRU cache of parsed results for long-running processes, where every lookup in the response cache
+    would otherwise cost a file read and a JSON decode.
+
+    Concurrent lookups of a missing key are coalesced: one caller fetches the value while the others wait for it.
+    Exceptions are raised to every waiting caller and are not cached.
+
+    Args:
+        max_entries (int): Maximum number of entries kept; the least recently used ones are evicted first.
+        clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(self, max_entries: int = MEMORY_ENTRIES, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, object]] = OrderedDict()
+        self._inflight: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "evictions": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_fetch(self, key: Hashable, ttl: Union[float, Callable[[T], float]], fetch: Callable[[], T]) -> T:
+        """Returns the cached value for `key`, calling `fetch` and keeping its result for `ttl` seconds if there is
+        none yet; `ttl` can also be a function returning the number of seconds for the fetched value."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]  # type: ignore[return-value]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+        try:
+            value = fetch()
+            seconds = ttl(value) if callable(ttl) else ttl
+            with self._lock:
+                self._entries[key] = (self.clock() + seconds, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+            future.set_result(value)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Returns the process-wide response cache stored under the weatherpy home directory."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(CACHE_DIR)
+        return _cache
@@ -0,0 +1,233 @@
+import gzip
+import json
+import mmap
+import struct
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Iterator, Optional
+
+from weatherpy.paths import CITY_INDEX
+
+from .models import Geolocation
+
+MAGIC: bytes = b"WPCI\x01\x00\x00\x00"
+# number of records, offset of the string table
+HEADER = struct.Struct("<II")
+# folded name (offset, length), name (offset, length), state (offset, length), country, latitude, longitude,
+# population (0 if unknown)
+RECORD = struct.Struct("<IBIBIB2sffI")
+MAX_STRING: int = 255
+DEFAULT_LIMIT: int = 5
+
+
+def fold(text: str) -> str:
+    """Folds case, accents and whitespace, so that e.g. 'Zürich', 'zurich' and ' ZURICH ' compare equal."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _encode(value: str) -> bytes:
+    """Encodes a string for the string table, truncated to the longest length whole characters fit in."""
+    return value.encode("utf8")[:MAX_STRING].decode("utf8", errors="ignore").encode("utf8")
+
+
+def parse_city_query(query: str) -> tuple[str, str, str]:
+    """Splits a 'name[, state][, country]' query like the direct geocoding API accepts it into folded parts."""
+    parts = [fold(part) for part in query.split(",")]
+    name, rest = parts[0], [part for part in parts[1:] if part]
+    country = rest.pop() if rest and len(rest[-1]) == 2 else ""
+    state = rest[0] if rest else ""
+    return name, state, country
+
+
+class CityIndex:
+    """
+    Local index of city names for offline geocoding.
+
+    The file holds fixed-width records sorted by folded name, followed by a table of UTF-8 strings. It is
+    memory-mapped and searched with binary search, so neither loading nor lookups read the whole file.
+
+    Args:
+        path (Path): Location of the index file created with `build_city_index`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = len(MAGIC) + HEADER.size
+        if self._mm[: len(MAGIC)] != MAGIC or len(self._mm) < header_end:
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid city index file.")
+        self.size, self._strings = HEADER.unpack_from(self._mm, len(MAGIC))
+        self._records = header_end
+        if self._records + self.size * RECORD.size > self._strings or self._strings > len(self._mm):
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid city index file.")
+
+    def _string(self, offset: int, length: int) -> bytes:
+        start = self._strings + offset
+        return self._mm[start : start + length]
+
+    def _key(self, i: int) -> bytes:
+        offset, length = struct.unpack_from("<IB", self._mm, self._records + i * RECORD.size)
+        return self._string(offset, length)
+
+    def _bisect(self, key: bytes) -> int:
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _location(self, i: int) -> tuple[Geolocation, int]:
+        _, _, name_off, name_len, state_off, state_len, country, lat, lon, population = RECORD.unpack_from(
+            self._mm, self._records + i * RECORD.size
+        )
+        loc = Geolocation(
+            name=self._string(name_off, name_len).decode("utf8"),
+            country=country.decode("ascii").rstrip("\x00"),
+            state=self._string(state_off, state_len).decode("utf8"),
+            lat=round(lat, 4),
+            lon=round(lon, 4),
+        )
+        return loc, population
+
+    def _range(self, key: bytes, prefix: bool) -> Iterator[int]:
+        i = self._bisect(key)
+        while i < self.size:
+            found = self._key(i)
+            if not (found.startswith(key) if prefix else found == key):
+                return
+            yield i
+            i += 1
+
+    def search(self, query: str) -> list[tuple[Geolocation, int]]:
+        """Returns (location, population) pairs exactly matching a 'name[, state][, country]' query, most
+        populous first."""
+        name, state, country = parse_city_query(query)
+        matches = []
+        for i in self._range(name.encode("utf8"), prefix=False):
+            loc, population = self._location(i)
+            if country and loc.country.casefold() != country:
+                continue
+            if state and fold(loc.state) != state:
+                continue
+            matches.append((loc, population))
+        matches.sort(key=lambda match: -match[1])
+        return matches
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Geolocation]:
+        """Returns the most populous cities whose folded name starts with the given prefix."""
+        matches = [self._location(i) for i in self._range(fold(prefix).encode("utf8"), prefix=True)]
+        matches.sort(key=lambda match: -match[1])
+        return [loc for loc, _ in matches[:limit]]
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "CityIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _read_cities(source: Path) -> Iterator[tuple[str, str, str, float, float, int]]:
+    """Yields (name, state, country, lat, lon, population) from an OpenWeather city list (JSON, optionally
+    gzipped) or a GeoNames cities dump (tab-separated)."""
+    opener = gzip.open if source.suffix == ".gz" else open
+    with opener(source, mode="rt", encoding="utf8") as file:
+        if ".json" in source.suffixes:
+            for city in json.load(file):
+                coord = city["coord"]
+                yield city["name"], city.get("state", ""), city["country"], coord["lat"], coord["lon"], 0
+            return
+        for line in file:
+            row = line.rstrip("\n").split("\t")
+            if len(row) < 15:
+                continue
+            try:
+                yield row[1], row[10], row[8], float(row[4]), float(row[5]), int(row[14] or 0)
+            except ValueError:
+                continue
+
+
+def build_city_index(source: Path, target: Path = CITY_INDEX) -> int:
+    """Builds an index file from a city list and returns the number of cities stored.
+
+    Supported sources are OpenWeather's city.list.json(.gz) and GeoNames dumps such as cities500.txt, whose
+    population figures are used to rank cities with the same name."""
+    strings = bytearray()
+    offsets: dict[bytes, int] = {}
+
+    def intern(encoded: bytes) -> tuple[int, int]:
+        if encoded not in offsets:
+            offsets[encoded] = len(strings)
+            strings.extend(encoded)
+        return offsets[encoded], len(encoded)
+
+    entries = []
+    for name, state, country, lat, lon, population in _read_cities(source):
+        key = fold(name)
+        if not key or len(country) != 2:
+            continue
+        entries.append((_encode(key), name, state, country, lat, lon, population))
+    entries.sort(key=lambda entry: (entry[0], -entry[6]))
+
+    records = bytearray()
+    for key, name, state, country, lat, lon, population in entries:
+        key_off, key_len = intern(key)
+        name_off, name_len = intern(_encode(name))
+        state_off, state_len = intern(_encode(state))
+        records += RECORD.pack(
+            key_off, key_len, name_off, name_len, state_off, state_len, country.encode("ascii"), lat, lon, population
+        )
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "wb") as file:
+        file.write(MAGIC)
+        file.write(HEADER.pack(len(entries), len(MAGIC) + HEADER.size + len(records)))
+        file.write(records)
+        file.write(strings)
+    tmp.replace(target)
+    return len(entries)
+
+
+_index: Optional[CityIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_city_index(path: Path = CITY_INDEX) -> Optional[CityIndex]:
+    """Returns the process-wide city index, opened on first use, or None if no valid index is installed."""
+    global _index
+    with _index_lock:
+        if _index is not None and _index.path == path:
+            return _index
+        if not path.exists():
+            return None
+        try:
+            _index = CityIndex(path)
+        except (OSError, ValueError):
+            return None
+        return _index
+
+
+def lookup_city(query: str, limit: int = DEFAULT_LIMIT, path: Path = CITY_INDEX) -> Optional[list[Geolocation]]:
+    """Resolves a city query locally, or returns None when the network should be asked instead.
+
+    That is the case if there is no index, no match, or several matches that can't be ranked because the city
+    list has no population figures."""
+    index = get_city_index(path)
+    if index is None:
+        return None
+    matches = index.search(query)
+    if not matches or (len(matches) > 1 and not matches[0][1]):
+        return None
+    return [loc for loc, _ in matches[:limit]]
@@ -1,13 +1,18 @@
+import re
 from datetime import datetime
+from typing import TYPE_CHECKING, Callable, Optional
 
-import requests
-from requests import Response
-from requests.exceptions import ConnectionError, RequestException
-from rich import print
+from weatherpy.paths import DAEMON_SOCKET
+from weatherpy.profiling import span, timed
 
-from .exceptions import BadRequest
-from .models import Current, Forecast, Geolocation, Weather
+from .cache import get_response_cache
+from .exceptions import BadRequest, CircuitOpen, RateLimited
+from .geostore import get_geocoding_store
+from .history import record_history
+from .models import Current, Forecast, Geolocation, Weather, intern_description, precipitation
+from .units import STANDARD
 from .urls import (
+    api_url,
     build_current_weather_url,
     build_direct_geocoding_url,
     build_forecast_weather_url,
@@ -15,17 +20,98 @@ from .urls import (
     build_reverse_geocoding_url,
 )
 
+# Query strings of request URLs, which carry the API key (appid=...), as quoted in error messages.
+QUERY_STRING = re.compile(r"\?[^\s'\"()]*=[^\s'\"()]*")
 
-def handle_request(url: str) -> Response:
+if TYPE_CHECKING:
+    # requests takes ~100 ms to import; it is only loaded once a request actually has to be sent.
+    from requests import Response
+
+
+def send_direct_request(url: str, max_wait: Optional[float] = None) -> "Response":
+    """Sends a GET request through the shared transport, so connections are reused and every call is bounded by
+    timeouts. OpenWeather calls wait for the shared rate limiter for up to `max_wait` seconds (its default if None).
+    Network errors and `RateLimited` are raised to the caller."""
+    from .ratelimit import get_rate_limiter
+    from .transport import get_transport
+
+    limiter = get_rate_limiter() if url.startswith(api_url("")) else None
+    with span("request", endpoint=url.split("?", 1)[0]) as s:
+        if limiter is not None:
+            s.set(throttled_s=limiter.acquire(max_wait))
+        resp = get_transport().get(url=url)
+        s.set(status=resp.status_code, bytes=len(resp.content))
+    if limiter is not None and resp.status_code == 429:
+        limiter.drain()
+    return resp
+
+
+def send_request(url: str, max_wait: Optional[float] = None) -> "Response":
+    """Sends an OpenWeather request through the local daemon (`wthr daemon`) if one is running, and directly
+    otherwise. See `send_direct_request`."""
+    # Checking for the socket first keeps the daemon client (and socket) from being imported when it isn't running.
+    if url.startswith(api_url("")) and DAEMON_SOCKET.exists():
+        from .daemon import daemon_request
+
+        with span("request", endpoint=url.split("?", 1)[0], via="daemon") as s:
+            resp = daemon_request(url, path=DAEMON_SOCKET)
+            if resp is not None:
+                s.set(status=resp.status_code, bytes=len(resp.text))
+        if resp is not None:
+            return resp  # type: ignore[return-value]
+    return send_direct_request(url, max_wait=max_wait)
+
+
+def handle_request(url: str) -> "Response":
     """Handles GET requests with possible errors."""
+    from requests.exceptions import ConnectionError, RequestException
+    from rich import print
+
     try:
-        resp = requests.get(url=url)
-    except (RequestException, ConnectionError):
+        resp = send_request(url=url)
+    except (RequestException, ConnectionError, CircuitOpen):
         print("[bold red]An error occurred. Please check your network connection and try again.[/]")
         exit(1)
+    except RateLimited as exc:
+        print(f"[bold red]{exc}.[/]")
+        exit(1)
     return resp
 
 
+def request_or_raise(url: str, max_wait: Optional[float] = None) -> "Response":
+    """Sends a GET request like `send_request` and raises `BadRequest` for error responses, so that long-running
+    callers neither exit nor mistake an error for an empty geocoding result."""
+    return raise_for_error(send_request(url, max_wait=max_wait))
+
+
+def raise_for_error(resp: "Response") -> "Response":
+    """Returns a successful response and raises `BadRequest` with OpenWeather's error code and message otherwise."""
+    if resp.status_code != 200:
+        try:
+            data = resp.json()
+            code, message = int(data["cod"]), str(data["message"])
+        except (KeyError, TypeError, ValueError):
+            code, message = resp.status_code, resp.text or "unknown error"
+        raise BadRequest(code=code, message=message)
+    return resp
+
+
+def redact_query(text: str) -> str:
+    """Removes the query strings of URLs quoted in a message, so that it can be logged without the API key."""
+    return QUERY_STRING.sub("", text)
+
+
+def error_message(exc: Exception) -> str:
+    """Describes a failed request in a message that is safe to show, write out or send to clients.
+
+    Network errors from requests quote the request URL, API key included, so only their kind is kept."""
+    from requests.exceptions import RequestException
+
+    if isinstance(exc, RequestException):
+        return f"upstream request failed ({type(exc).__name__})"
+    return redact_query(str(exc))
+
+
 def get_ip_address() -> str:
     resp = handle_request(url=build_ip_url())
     return resp.text
@@ -36,52 +122,108 @@ def api_token_valid(token: str) -> bool:
     return resp.status_code == 200
 
 
-def get_locations_by_name(name: str, token: str) -> list[Geolocation]:
-    resp = handle_request(url=build_direct_geocoding_url(q=name, limit=5, appid=token))
-    if resp.status_code != 200:
-        return []
-    locs: list[Geolocation] = []
-    for loc in resp.json():
-        if "state" not in loc:
-            loc["state"] = ""
-        locs.append(
-            Geolocation(name=loc["name"], country=loc["country"], state=loc["state"], lat=loc["lat"], lon=loc["lon"])
+@timed("parse_locations")
+def parse_locations(data: list[dict]) -> list[Geolocation]:
+    return [
+        Geolocation(
+            name=loc["name"], country=loc["country"], state=loc.get("state", ""), lat=loc["lat"], lon=loc["lon"]
         )
-    return locs
+        for loc in data
+    ]
 
 
-def get_locations_by_coords(lat: float, lon: float, token: str) -> list[Geolocation]:
-    resp = handle_request(url=build_reverse_geocoding_url(lat=lat, lon=lon, limit=5, appid=token))
+def get_locations_by_name(
+    name: str, token: str, use_cache: bool = True, request: Callable[[str], "Response"] = handle_request
+) -> list[Geolocation]:
+    """Geocodes a city name using the local city index if one is installed and can answer, then the geocoding
+    store, then the API."""
+    from .citydb import lookup_city
+
+    if (locs := lookup_city(name)) is not None:
+        return locs
+    store = get_geocoding_store() if use_cache else None
+    if store is not None and (data := store.get_by_name(name)) is not None:
+        return parse_locations(data)
+    resp = request(build_direct_geocoding_url(q=name, limit=5, appid=token))
     if resp.status_code != 200:
         return []
-    locs: list[Geolocation] = []
-    for loc in resp.json():
-        if "state" not in loc:
-            loc["state"] = ""
-        locs.append(
-            Geolocation(name=loc["name"], country=loc["country"], state=loc["state"], lat=loc["lat"], lon=loc["lon"])
-        )
-    return locs
+    with span("decode"):
+        data = resp.json()
+    if store is not None and data:
+        store.put_by_name(name, data)
+    return parse_locations(data)
 
 
-def get_current_weather(lat: float, lon: float, units: str, token: str) -> Current:
-    resp = handle_request(url=build_current_weather_url(lat=lat, lon=lon, units=units, limit=5, appid=token))
-    data = resp.json()
+def get_locations_by_coords(
+    lat: float,
+    lon: float,
+    token: str,
+    use_cache: bool = True,
+    request: Callable[[str], "Response"] = handle_request,
+) -> list[Geolocation]:
+    store = get_geocoding_store() if use_cache else None
+    if store is not None and (data := store.get_by_coords(lat, lon)) is not None:
+        return parse_locations(data)
+    resp = request(build_reverse_geocoding_url(lat=lat, lon=lon, limit=5, appid=token))
     if resp.status_code != 200:
-        raise BadRequest(code=data["cod"], message=data["message"])
+        return []
+    with span("decode"):
+        data = resp.json()
+    if store is not None and data:
+        store.put_by_coords(lat, lon, data)
+    return parse_locations(data)
+
+
+def fetch_weather_data(
+    endpoint: str,
+    url: str,
+    lat: float,
+    lon: float,
+    use_cache: bool = True,
+    refresh: bool = False,
+    request: Callable[[str], "Response"] = handle_request,
+) -> dict:
+    """Returns the decoded payload of a weather endpoint, served from the response cache when it is still fresh.
+
+    `use_cache=False` bypasses the cache completely, `refresh=True` skips the lookup but stores the new payload.
+    Every payload fetched from the API is also appended to the history store, once even if the daemon shares it
+    between processes. Payloads are always in standard units, so a single cache entry serves every unit system."""
+    cache = get_response_cache() if use_cache else None
+    if cache is not None and not refresh:
+        data = cache.get(endpoint, lat, lon, STANDARD)
+        if data is not None:
+            return data
+    resp = raise_for_error(request(url))
+    with span("decode"):
+        data = resp.json()
+    if cache is not None:
+        cache.put(endpoint, lat, lon, STANDARD, data)
+    # A payload the daemon shared was fetched for, and recorded by, another process.
+    if not getattr(resp, "shared", False):
+        record_history(endpoint, lat, lon, STANDARD, data)
+    return data
+
+
+def get_last_known(endpoint: str, lat: float, lon: float) -> Optional[tuple[dict, float]]:
+    """Returns the most recent cached payload of a weather endpoint and when it was fetched, however old it is."""
+    return get_response_cache().get_stale(endpoint, lat, lon, STANDARD)
+
+
+@timed("parse_current_weather")
+def parse_current_weather(data: dict) -> Current:
     geolocation = Geolocation(
         name=data["name"], country=data["sys"]["country"], state="", lat=data["coord"]["lat"], lon=data["coord"]["lon"]
     )
     weather: Weather = Weather(
-        description=[(x["description"], x["icon"]) for x in data["weather"]],
+        description=intern_description((x["description"], x["icon"]) for x in data["weather"]),
         temp=data["main"]["temp"],
         temp_feel=data["main"]["feels_like"],
         pressure=data["main"]["pressure"],
         humidity=data["main"]["humidity"],
         wind_spd=data["wind"]["speed"],
         wind_deg=data["wind"]["deg"],
-        rain=data.get("rain", {}),
-        snow=data.get("snow", {}),
+        rain=precipitation(data.get("rain")),
+        snow=precipitation(data.get("snow")),
     )
     return Current(
         dt=datetime.fromtimestamp(data["dt"]),
@@ -89,14 +231,12 @@ def get_current_weather(lat: float, lon: float, units: str, token: str) -> Curre
         sunset=datetime.fromtimestamp(data["sys"]["sunset"]),
         loc=geolocation,
         weather=weather,
+        station_id=data.get("id") or None,
     )
 
 
-def get_weather_forecast(lat: float, lon: float, units: str, token: str) -> Forecast:
-    resp = handle_request(url=build_forecast_weather_url(lat=lat, lon=lon, units=units, limit=5, appid=token))
-    data = resp.json()
-    if resp.status_code != 200:
-        raise BadRequest(code=data["cod"], message=data["message"])
+@timed("parse_weather_forecast")
+def parse_weather_forecast(data: dict) -> Forecast:
     geolocation = Geolocation(
         name=data["city"]["name"],
         country=data["city"]["country"],
@@ -104,20 +244,65 @@ def get_weather_forecast(lat: float, lon: float, units: str, token: str) -> Fore
         lat=data["city"]["coord"]["lat"],
         lon=data["city"]["coord"]["lon"],
     )
-    forecasted: list[tuple[datetime, Weather]] = []
-    for forecast in data["list"]:
-        dt = datetime.fromtimestamp(forecast["dt"])
-        params = forecast["main"]
-        weather: Weather = Weather(
-            description=[(x["description"], x["icon"]) for x in forecast["weather"]],
+    forecast = Forecast(loc=geolocation, utc_offset=data["city"].get("timezone"))
+    for slot in data["list"]:
+        params = slot["main"]
+        forecast.append(
+            dt=slot["dt"],
+            description=intern_description((x["description"], x["icon"]) for x in slot["weather"]),
             temp=params["temp"],
             temp_feel=params["feels_like"],
             pressure=params["pressure"],
             humidity=params["humidity"],
-            wind_spd=forecast["wind"]["speed"],
-            wind_deg=forecast["wind"]["deg"],
-            rain=forecast.get("rain", {}),
-            snow=forecast.get("snow", {}),
+            wind_spd=slot["wind"]["speed"],
+            wind_deg=slot["wind"]["deg"],
+            rain=slot.get("rain", {}).get("3h", 0),
+            snow=slot.get("snow", {}).get("3h", 0),
         )
-        forecasted.append((dt, weather))
-    return Forecast(loc=geolocation, weathers=forecasted)
+    return forecast
+
+
+def get_current_weather(
+    lat: float,
+    lon: float,
+    token: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+    request: Callable[[str], "Response"] = handle_request,
+) -> Current:
+    """Returns the current weather in standard units (K, m/s, hPa); see `weatherpy.api.units` for conversions."""
+    url = build_current_weather_url(lat=lat, lon=lon, units=STANDARD, limit=5, appid=token)
+    data = fetch_weather_data("weather", url, lat, lon, use_cache=use_cache, refresh=refresh, request=request)
+    return parse_current_weather(data)
+
+
+def get_weather_forecast(
+    lat: float,
+    lon: float,
+    token: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+    request: Callable[[str], "Response"] = handle_request,
+) -> Forecast:
+    """Returns the forecast in standard units (K, m/s, hPa); see `weatherpy.api.units` for conversions."""
+    url = build_forecast_weather_url(lat=lat, lon=lon, units=STANDARD, limit=5, appid=token)
+    data = fetch_weather_data("forecast", url, lat, lon, use_cache=use_cache, refresh=refresh, request=request)
+    return parse_weather_forecast(data)
+
+
+def get_current_and_forecast(
+    lat: float,
+    lon: float,
+    token: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+    request: Callable[[str], "Response"] = handle_request,
+) -> tuple[Current, Forecast]:
+    """Fetches current weather and the forecast for one location concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    kwargs = dict(lat=lat, lon=lon, token=token, use_cache=use_cache, refresh=refresh, request=request)
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="weatherpy") as executor:
+        current = executor.submit(get_current_weather, **kwargs)
+        forecast = executor.submit(get_weather_forecast, **kwargs)
+        return current.result(), forecast.result()
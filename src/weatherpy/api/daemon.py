@@ -0,0 +1,234 @@
+import json
+import os
+import socket
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from weatherpy.paths import DAEMON_SOCKET
+
+from .cache import TTL, quantize
+from .exceptions import CircuitOpen, RateLimited
+from .geostore import coords_key, normalize_query
+
+# Weather entries live as long as in the response cache; geocoding results practically never change.
+DAEMON_TTL: dict[str, float] = {
+    "/data/2.5/weather": TTL["weather"],
+    "/data/2.5/forecast": TTL["forecast"],
+    "/geo/1.0/direct": 24 * 3600,
+    "/geo/1.0/reverse": 24 * 3600,
+}
+MAX_ENTRIES: int = 1024
+# Covers an upstream call including the transport's retries.
+CLIENT_TIMEOUT: float = 30.0
+
+
+def daemon_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def daemon_available(path: Path = DAEMON_SOCKET) -> bool:
+    """Returns whether a daemon socket exists (the daemon may still have died without removing it)."""
+    return daemon_supported() and path.exists()
+
+
+def request_key(url: str) -> str:
+    """Returns the cache key of an API URL; nearby coordinates and differently written city names share a key."""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query))
+    if "lat" in params and "lon" in params:
+        try:
+            lat, lon = float(params["lat"]), float(params["lon"])
+        except ValueError:
+            pass
+        else:
+            if parts.path.startswith("/geo/"):
+                params["lat"], params["lon"] = coords_key(lat, lon)
+            else:
+                params["lat"], params["lon"] = quantize(lat), quantize(lon)
+    if "q" in params:
+        params["q"] = normalize_query(params["q"])
+    return parts.path + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+
+class DaemonResponse:
+    """
+    Response relayed by the daemon, exposing the parts of `requests.Response` that weatherpy uses.
+
+    Args:
+        status_code (int): HTTP status code.
+        text (str): Response body.
+        shared (bool): Whether the body came from the daemon's cache or from another client's request, rather than
+            being fetched for this one.
+    """
+
+    __slots__ = ("status_code", "text", "shared")
+
+    def __init__(self, status_code: int, text: str, shared: bool = False):
+        self.status_code = status_code
+        self.text = text
+        self.shared = shared
+
+    @property
+    def content(self) -> bytes:
+        return self.text.encode("utf8")
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class Daemon:
+    """
+    In-memory cache of API responses that coalesces concurrent identical requests into a single upstream call.
+
+    Only successful responses are cached. Upstream errors are turned into error responses shaped like the API's own,
+    so clients handle them as usual.
+
+    Args:
+        fetch (Callable[[str], Any]): Sends a request upstream and returns a response.
+        clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(self, fetch: Callable[[str], Any], clock: Callable[[], float] = time.monotonic):
+        self.fetch = fetch
+        self.clock = clock
+        self._entries: dict[str, tuple[float, int, str]] = {}
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "hits": 0, "coalesced": 0, "upstream": 0}
+
+    def get(self, url: str) -> tuple[int, str]:
+        """Returns the status code and body for a URL, fetching it upstream only if no fresh or pending copy exists."""
+        status, body, _ = self.lookup(url)
+        return status, body
+
+    def lookup(self, url: str) -> tuple[int, str, bool]:
+        """Like `get`, also returning whether the response was shared (cached or coalesced) rather than fetched."""
+        key = request_key(url)
+        with self._lock:
+            self.stats["requests"] += 1
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self.clock():
+                self.stats["hits"] += 1
+                return entry[1], entry[2], True
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                self.stats["upstream"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return (*future.result(), True)
+        try:
+            result = self._fetch(url)
+            with self._lock:
+                if result[0] == 200:
+                    self._store(key, urlsplit(url).path, result)
+            future.set_result(result)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+        return (*result, False)
+
+    def _fetch(self, url: str) -> tuple[int, str]:
+        from requests.exceptions import RequestException
+
+        from .comm import error_message
+
+        try:
+            resp = self.fetch(url)
+        except RateLimited as exc:
+            return 429, json.dumps({"cod": 429, "message": str(exc)})
+        except (RequestException, CircuitOpen) as exc:
+            return 502, json.dumps({"cod": 502, "message": error_message(exc)})
+        return resp.status_code, resp.text
+
+    def _store(self, key: str, path: str, result: tuple[int, str]) -> None:
+        now = self.clock()
+        if len(self._entries) >= MAX_ENTRIES:
+            self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            while len(self._entries) >= MAX_ENTRIES:
+                del self._entries[min(self._entries, key=lambda k: self._entries[k][0])]
+        self._entries[key] = (now + DAEMON_TTL.get(path, TTL["weather"]), *result)
+
+
+def _handle_connection(daemon: Daemon, conn: socket.socket) -> None:
+    with conn, conn.makefile("rwb") as stream:
+        for line in stream:
+            try:
+                message = json.loads(line)
+                if message.get("op") == "stats":
+                    reply: dict[str, Any] = {"stats": dict(daemon.stats), "entries": len(daemon._entries)}
+                else:
+                    status, body, shared = daemon.lookup(message["url"])
+                    reply = {"status": status, "body": body, "shared": shared}
+            except (ValueError, KeyError, TypeError) as exc:
+                reply = {"error": str(exc)}
+            stream.write(json.dumps(reply).encode("utf8") + b"\n")
+            stream.flush()
+
+
+def serve(path: Path = DAEMON_SOCKET, fetch: Optional[Callable[[str], Any]] = None) -> None:
+    """Serves cached API responses on a Unix socket until interrupted."""
+    import socketserver
+
+    if not daemon_supported():
+        raise OSError("Unix sockets are not supported on this platform")
+    if daemon_stats(path) is not None:
+        raise OSError(f"A daemon is already listening on {path}")
+    if fetch is None:
+        from .comm import send_direct_request
+
+        fetch = send_direct_request
+    daemon = Daemon(fetch)
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            _handle_connection(daemon, self.request)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.unlink(missing_ok=True)
+    with socketserver.ThreadingUnixStreamServer(str(path), Handler) as server:
+        server.daemon_threads = True
+        os.chmod(path, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _exchange(message: dict, path: Path, timeout: float) -> Optional[dict]:
+    if not daemon_available(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(str(path))
+            with sock.makefile("rwb") as stream:
+                stream.write(json.dumps(message).encode("utf8") + b"\n")
+                stream.flush()
+                reply = json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None
+    return reply if isinstance(reply, dict) else None
+
+
+def daemon_request(url: str, path: Path = DAEMON_SOCKET, timeout: float = CLIENT_TIMEOUT) -> Optional[DaemonResponse]:
+    """Fetches a URL through the daemon, or returns None if no daemon is running."""
+    reply = _exchange({"url": url}, path, timeout)
+    if reply is None or "status" not in reply:
+        return None
+    return DaemonResponse(reply["status"], reply["body"], shared=bool(reply.get("shared")))
+
+
+def daemon_stats(path: Path = DAEMON_SOCKET, timeout: float = 1.0) -> Optional[dict]:
+    """Returns the counters of a running daemon, or None if no daemon is running."""
+    reply = _exchange({"op": "stats"}, path, timeout)
+    return reply if reply is not None and "stats" in reply else None
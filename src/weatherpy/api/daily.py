@@ -0,0 +1,107 @@
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+from .models import Description, Forecast, Geolocation
+
+SECONDS_PER_DAY: int = 24 * 3600
+EPOCH_ORDINAL: int = date(1970, 1, 1).toordinal()
+WIND_SECTORS: int = 8
+
+
+@dataclass(slots=True, frozen=True)
+class DailySummary:
+    """
+    Roll-up of the forecast slots falling on one local calendar day.
+
+    Args:
+        loc (Geolocation): The geolocation of the forecast.
+        day (date): The local calendar day.
+        slots (int): Number of forecast slots in the day.
+        temp_min (float): The lowest temperature.
+        temp_max (float): The highest temperature.
+        temp_mean (float): The mean temperature.
+        rain (float): Total mm of rain.
+        snow (float): Total mm of snow.
+        wind_max (float): The highest wind speed.
+        wind_deg (int): The dominant wind direction in degrees, i.e. the centre of the compass sector with the
+            largest sum of wind speeds.
+        description (tuple[tuple[str, str], ...]): The most frequent weather description.
+    """
+
+    loc: Geolocation
+    day: date
+    slots: int
+    temp_min: float
+    temp_max: float
+    temp_mean: float
+    rain: float
+    snow: float
+    wind_max: float
+    wind_deg: int
+    description: Description
+
+
+def day_numbers(forecast: Forecast) -> list[int]:
+    """Returns the local day (days since the epoch) of every slot, in the location's time zone if it is known
+    and in the machine's otherwise."""
+    if forecast.utc_offset is not None:
+        offset = forecast.utc_offset
+        return [(dt + offset) // SECONDS_PER_DAY for dt in forecast.dt]
+    return [date.fromtimestamp(dt).toordinal() - EPOCH_ORDINAL for dt in forecast.dt]
+
+
+def summarize_days(forecast: Forecast) -> list[DailySummary]:
+    """Rolls a forecast up into daily summaries in a single pass over its (time-ordered) slots."""
+    days = day_numbers(forecast)
+    temp, rain, snow = forecast.temp, forecast.rain, forecast.snow
+    wind_spd, wind_deg, description = forecast.wind_spd, forecast.wind_deg, forecast.description
+    sector_width = 360 / WIND_SECTORS
+    summaries = []
+    n = len(days)
+    i = 0
+    while i < n:
+        day = days[i]
+        temp_min = temp_max = temp[i]
+        temp_sum = rain_sum = snow_sum = wind_max = 0.0
+        sectors = [0.0] * WIND_SECTORS
+        descriptions: Counter[Description] = Counter()
+        j = i
+        while j < n and days[j] == day:
+            t = temp[j]
+            if t < temp_min:
+                temp_min = t
+            elif t > temp_max:
+                temp_max = t
+            temp_sum += t
+            rain_sum += rain[j]
+            snow_sum += snow[j]
+            speed = wind_spd[j]
+            if speed > wind_max:
+                wind_max = speed
+            sectors[int((wind_deg[j] % 360 + sector_width / 2) // sector_width) % WIND_SECTORS] += speed
+            descriptions[description[j]] += 1
+            j += 1
+        summaries.append(
+            DailySummary(
+                loc=forecast.loc,
+                day=date.fromordinal(day + EPOCH_ORDINAL),
+                slots=j - i,
+                temp_min=temp_min,
+                temp_max=temp_max,
+                temp_mean=temp_sum / (j - i),
+                rain=rain_sum,
+                snow=snow_sum,
+                wind_max=wind_max,
+                wind_deg=round(sectors.index(max(sectors)) * sector_width),
+                description=descriptions.most_common(1)[0][0],
+            )
+        )
+        i = j
+    return summaries
+
+
+def summarize_many(forecasts: Iterable[Forecast]) -> list[list[DailySummary]]:
+    """Rolls up forecasts for many locations; the cost is linear in the total number of slots."""
+    return [summarize_days(forecast) for forecast in forecasts]
@@ -0,0 +1,24 @@
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+
+def env_number(name: str, default: float, positive: bool = False) -> float:
+    """Returns the number an environment variable is set to, or `default` if it isn't set.
+
+    Values that aren't finite non-negative numbers (positive ones if `positive`) are ignored with a warning, so a
+    typo in the environment doesn't break every command."""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        number = float(value)
+    except ValueError:
+        number = math.nan
+    if not math.isfinite(number) or number < 0 or (positive and number == 0):
+        kind = "positive" if positive else "non-negative"
+        logger.warning("Ignoring %s=%r, which isn't a %s number; using %s instead.", name, value, kind, default)
+        return default
+    return number
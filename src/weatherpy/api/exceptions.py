@@ -7,3 +7,33 @@ class BadRequest(Exception):
 
     def __str__(self):
         return f"Code {self.code}: {self.message.title()}"
+
+
+class CircuitOpen(Exception):
+    """Exception raised when requests to a host are suspended after repeated failures."""
+
+    def __init__(self, host: str):
+        self.host = host
+
+    def __str__(self):
+        return f"Requests to {self.host} are suspended after repeated failures"
+
+
+class BudgetExhausted(Exception):
+    """Exception raised when a client has sent as many requests as its request budget allows."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+
+    def __str__(self):
+        return f"Request budget of {self.budget} requests exhausted"
+
+
+class RateLimited(Exception):
+    """Exception raised when a call would exceed the client-side API rate limit for longer than the caller waits."""
+
+    def __init__(self, retry_after: float):
+        self.retry_after = retry_after
+
+    def __str__(self):
+        return f"API call limit reached, try again in {self.retry_after:.0f} s"
@@ -0,0 +1,118 @@
+import json
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from weatherpy.paths import GEOCODING_DB
+
+if TYPE_CHECKING:
+    import sqlite3
+
+REVERSE_PRECISION: int = 3
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS direct (
+    query TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reverse (
+    lat TEXT NOT NULL,
+    lon TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (lat, lon)
+);
+"""
+
+
+def normalize_query(name: str) -> str:
+    """Normalizes a location query so that e.g. 'London, GB', 'london,gb' and ' LONDON ,  gb' share one key."""
+    parts = (" ".join(part.split()).casefold() for part in name.split(","))
+    return ",".join(part for part in parts if part)
+
+
+def coords_key(lat: float, lon: float, precision: int = REVERSE_PRECISION) -> tuple[str, str]:
+    """Rounds coordinates (to ~100 m for 3 decimal places) for reverse geocoding lookups."""
+    return f"{round(lat, precision):.{precision}f}", f"{round(lon, precision):.{precision}f}"
+
+
+class GeocodingStore:
+    """
+    On-disk SQLite store of geocoding API responses.
+
+    Direct lookups are keyed by normalized query and reverse lookups by rounded coordinates. Payloads are stored
+    as returned by the API, so they are parsed exactly like fresh responses. Geocoding results practically never
+    change, so entries don't expire. If the database can't be created or opened (e.g. a read-only home directory),
+    the store is treated as unavailable: lookups miss and results aren't stored, so callers fall back to the API.
+
+    Args:
+        path (Path): Location of the SQLite database file.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._initialized = False
+
+    def _connect(self) -> "sqlite3.Connection":
+        import sqlite3
+
+        if not self._initialized:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            conn.executescript(SCHEMA)
+            self._initialized = True
+        return conn
+
+    def _fetch(self, sql: str, params: tuple) -> Optional[list[dict]]:
+        import sqlite3
+
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(sql, params).fetchone()
+        except (OSError, sqlite3.Error):
+            return None
+        return json.loads(row[0]) if row else None
+
+    def _store(self, sql: str, params: tuple) -> None:
+        import sqlite3
+
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(sql, params)
+        except (OSError, sqlite3.Error):
+            pass
+
+    def get_by_name(self, name: str) -> Optional[list[dict]]:
+        return self._fetch("SELECT payload FROM direct WHERE query = ?", (normalize_query(name),))
+
+    def put_by_name(self, name: str, payload: list[dict]) -> None:
+        self._store(
+            "INSERT OR REPLACE INTO direct (query, payload, stored_at) VALUES (?, ?, ?)",
+            (normalize_query(name), json.dumps(payload), time.time()),
+        )
+
+    def get_by_coords(self, lat: float, lon: float) -> Optional[list[dict]]:
+        return self._fetch("SELECT payload FROM reverse WHERE lat = ? AND lon = ?", coords_key(lat, lon))
+
+    def put_by_coords(self, lat: float, lon: float, payload: list[dict]) -> None:
+        self._store(
+            "INSERT OR REPLACE INTO reverse (lat, lon, payload, stored_at) VALUES (?, ?, ?, ?)",
+            (*coords_key(lat, lon), json.dumps(payload), time.time()),
+        )
+
+
+_store: Optional[GeocodingStore] = None
+_store_lock = threading.Lock()
+
+
+def get_geocoding_store() -> GeocodingStore:
+    """Returns the process-wide geocoding store kept in the weatherpy home directory."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = GeocodingStore(GEOCODING_DB)
+        return _store
@@ -0,0 +1,255 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from weatherpy.paths import HISTORY_DIR
+
+from .cache import quantize
+from .ratelimit import lock_file, unlock_file
+
+logger = logging.getLogger(__name__)
+
+MAGIC: bytes = b"WPHS\x01\x00\x00\x00"
+# kind, units, condition id, icon, fetched at, valid at, temp, feels like, pressure, humidity, wind speed,
+# wind direction, rain, snow
+RECORD = struct.Struct("<BBH3sIIffHBfHff")
+
+CURRENT: int = 0
+FORECAST: int = 1
+KINDS: dict[str, int] = {"weather": CURRENT, "forecast": FORECAST}
+UNITS: tuple[str, ...] = ("standard", "metric", "imperial")
+# Number of records at the end of a segment searched for the latest observation, enough to get past the slots of a
+# forecast fetched since.
+TAIL_RECORDS: int = 64
+
+
+@dataclass(slots=True, frozen=True)
+class HistoryRecord:
+    """
+    Stored observation (current weather) or forecast slot.
+
+    Args:
+        kind (int): CURRENT or FORECAST.
+        units (str): Units of measurement the values were fetched in.
+        condition (int): OpenWeather condition id of the main weather condition.
+        icon (str): OpenWeather icon code.
+        fetched (int): When the data was fetched (Unix time).
+        dt (int): Time the data is valid for (Unix time).
+        temp (float): Temperature.
+        temp_feel (float): Perceived temperature.
+        pressure (int): Atmospheric pressure.
+        humidity (int): Humidity percentage.
+        wind_spd (float): Wind speed.
+        wind_deg (int): Wind direction in degrees.
+        rain (float): Rain volume for the last hour (current weather) or 3 hours (forecast).
+        snow (float): Snow volume for the last hour (current weather) or 3 hours (forecast).
+    """
+
+    kind: int
+    units: str
+    condition: int
+    icon: str
+    fetched: int
+    dt: int
+    temp: float
+    temp_feel: float
+    pressure: int
+    humidity: int
+    wind_spd: float
+    wind_deg: int
+    rain: float
+    snow: float
+
+    @property
+    def lead_hours(self) -> float:
+        return (self.dt - self.fetched) / 3600
+
+
+def records_from_payload(endpoint: str, data: dict, units: str, fetched: Optional[float] = None) -> list[tuple]:
+    """Converts a current weather or forecast payload to packable record tuples."""
+    kind = KINDS[endpoint]
+    fetched = int(time.time() if fetched is None else fetched)
+    unit_code = UNITS.index(units) if units in UNITS else 0
+    slots = [data] if kind == CURRENT else data["list"]
+    period = "1h" if kind == CURRENT else "3h"
+    records = []
+    for slot in slots:
+        weather = slot["weather"][0] if slot["weather"] else {}
+        params = slot["main"]
+        records.append(
+            (
+                kind,
+                unit_code,
+                weather.get("id", 0),
+                weather.get("icon", "").encode("ascii"),
+                fetched,
+                slot["dt"],
+                params["temp"],
+                params["feels_like"],
+                params["pressure"],
+                params["humidity"],
+                slot["wind"]["speed"],
+                slot["wind"]["deg"],
+                slot.get("rain", {}).get(period, 0),
+                slot.get("snow", {}).get(period, 0),
+            )
+        )
+    return records
+
+
+def _month(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m")
+
+
+def _months(start: int, end: int) -> Iterator[str]:
+    first = datetime.fromtimestamp(start, tz=timezone.utc)
+    last = datetime.fromtimestamp(end, tz=timezone.utc)
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        yield f"{year:04d}-{month:02d}"
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def _last_observation(file: BinaryIO, size: int) -> Optional[int]:
+    """Returns the valid time of the latest observation among the last records of a segment."""
+    count = min(TAIL_RECORDS, (size - len(MAGIC)) // RECORD.size)
+    file.seek(size - count * RECORD.size)
+    tail = file.read(count * RECORD.size)
+    for offset in range(len(tail) - RECORD.size, -1, -RECORD.size):
+        values = RECORD.unpack_from(tail, offset)
+        if values[0] == CURRENT:
+            return values[5]
+    return None
+
+
+def _append_segment(file: BinaryIO, records: list[tuple]) -> None:
+    """Appends records to a segment opened for reading and appending; callers hold the store lock."""
+    size = os.fstat(file.fileno()).st_size
+    header = b""
+    if size == 0:
+        header = MAGIC
+    else:
+        tail = (size - len(MAGIC)) % RECORD.size
+        if tail:
+            # A writer died mid-record (all writers hold the lock, so none is still writing it); drop the partial
+            # record so later ones stay aligned.
+            file.truncate(size - tail)
+            size -= tail
+        # Cached responses can be recorded again; an observation already stored is skipped.
+        last = _last_observation(file, size)
+        records = [record for record in records if record[0] != CURRENT or record[5] != last]
+    if records:
+        file.write(header + b"".join(RECORD.pack(*record) for record in records))
+
+
+class HistoryStore:
+    """
+    Append-only store of current weather observations and forecast slots.
+
+    Records are fixed-width and kept in one segment file per location (coordinates rounded like in the response
+    cache) and calendar month (UTC) of the time they are valid for. Appends hold a lock on the store shared by all
+    processes, and each fetch is written with a single write, so concurrent processes never interleave or cut short
+    each other's records; a partial record left by a writer that died is skipped by reads and dropped by the next
+    append. Queries only map the segments overlapping the requested range, so the store can grow to years of data for
+    many locations.
+
+    Args:
+        directory (Path): Directory holding the segments.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def location_dir(self, lat: float, lon: float) -> Path:
+        return self.directory / f"{quantize(lat)}_{quantize(lon)}"
+
+    def segment_path(self, lat: float, lon: float, month: str) -> Path:
+        return self.location_dir(lat, lon) / f"{month}.bin"
+
+    def append(self, lat: float, lon: float, records: Iterable[tuple]) -> None:
+        by_month: dict[str, list[tuple]] = {}
+        for record in records:
+            by_month.setdefault(_month(record[5]), []).append(record)
+        if not by_month:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / ".lock", "a+b") as lock:
+            lock_file(lock)
+            try:
+                for month, month_records in by_month.items():
+                    path = self.segment_path(lat, lon, month)
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    with open(path, "a+b") as file:
+                        _append_segment(file, month_records)
+            finally:
+                unlock_file(lock)
+
+    def _scan(self, path: Path, start: int, end: int, kind: Optional[int]) -> Iterator[HistoryRecord]:
+        try:
+            file = open(path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            size = os.fstat(file.fileno()).st_size
+            count, tail = divmod(size - len(MAGIC), RECORD.size)
+            if tail > 0:
+                logger.warning("Skipping a partial record of %d bytes at the end of %s", tail, path)
+            if count <= 0:
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm[: len(MAGIC)] != MAGIC:
+                    return
+                view = memoryview(mm)[len(MAGIC) : len(MAGIC) + count * RECORD.size]
+                try:
+                    for values in RECORD.iter_unpack(view):
+                        if start <= values[5] <= end and (kind is None or values[0] == kind):
+                            yield HistoryRecord(
+                                values[0],
+                                UNITS[values[1]],
+                                values[2],
+                                values[3].rstrip(b"\x00").decode("ascii"),
+                                *values[4:],
+                            )
+                finally:
+                    view.release()
+
+    def query(
+        self, lat: float, lon: float, start: float, end: float, kind: Optional[int] = None
+    ) -> list[HistoryRecord]:
+        """Returns the records valid between `start` and `end` (Unix times, inclusive), ordered by valid time and
+        then by fetch time."""
+        start, end = int(start), int(end)
+        records = [
+            record
+            for month in _months(start, end)
+            for record in self._scan(self.segment_path(lat, lon, month), start, end, kind)
+        ]
+        records.sort(key=lambda r: (r.dt, r.fetched, r.kind))
+        return records
+
+
+_store: Optional[HistoryStore] = None
+_store_lock = threading.Lock()
+
+
+def get_history_store() -> HistoryStore:
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = HistoryStore(HISTORY_DIR)
+        return _store
+
+
+def record_history(endpoint: str, lat: float, lon: float, units: str, data: dict) -> None:
+    """Appends a freshly fetched payload to the history store; failures never affect the caller."""
+    try:
+        get_history_store().append(lat, lon, records_from_payload(endpoint, data, units))
+    except (OSError, KeyError, IndexError, TypeError, ValueError, struct.error):
+        pass
@@ -0,0 +1,103 @@
+import csv
+import ipaddress
+import mmap
+import struct
+from pathlib import Path
+from typing import Optional
+
+from weatherpy.paths import IP_DATABASE
+
+MAGIC: bytes = b"WPIP\x01\x00\x00\x00"
+# start address, end address (both inclusive), latitude, longitude
+RECORD = struct.Struct("<IIff")
+
+
+class IpDatabase:
+    """
+    Local IPv4 to coordinates database.
+
+    The file holds a short header followed by fixed-width records sorted by range start. It is memory-mapped and
+    searched with binary search, so lookups don't read the whole file.
+
+    Args:
+        path (Path): Location of the database file created with `build_ip_database`.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[: len(MAGIC)] != MAGIC or (len(self._mm) - len(MAGIC)) % RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path} is not a valid IP database file.")
+        self.size = (len(self._mm) - len(MAGIC)) // RECORD.size
+
+    def record(self, i: int) -> tuple[int, int, float, float]:
+        return RECORD.unpack_from(self._mm, len(MAGIC) + i * RECORD.size)
+
+    def lookup(self, ip: str) -> Optional[tuple[float, float]]:
+        """Returns (lat, lon) of the range containing the given IPv4 address, if there is one."""
+        try:
+            address = ipaddress.IPv4Address(ip.strip())
+        except ValueError:
+            return None
+        value = int(address)
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.record(mid)[0] <= value:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        start, end, lat, lon = self.record(lo - 1)
+        return (lat, lon) if start <= value <= end else None
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "IpDatabase":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def build_ip_database(source: Path, target: Path = IP_DATABASE) -> int:
+    """Builds a database file from a CSV of IP ranges and returns the number of IPv4 ranges stored.
+
+    Each row must start with the first and last address of a range and end with its latitude and longitude,
+    which matches e.g. the DB-IP "IP to City Lite" CSV. IPv6 rows are skipped."""
+    records: list[tuple[int, int, float, float]] = []
+    with open(source, newline="", encoding="utf8") as file:
+        for row in csv.reader(file):
+            if len(row) < 4:
+                continue
+            try:
+                start, end = ipaddress.ip_address(row[0].strip()), ipaddress.ip_address(row[1].strip())
+                lat, lon = float(row[-2]), float(row[-1])
+            except ValueError:
+                continue
+            if start.version == 4 and end.version == 4:
+                records.append((int(start), int(end), lat, lon))
+    records.sort()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    with open(tmp, "wb") as file:
+        file.write(MAGIC)
+        for record in records:
+            file.write(RECORD.pack(*record))
+    tmp.replace(target)
+    return len(records)
+
+
+def lookup_ip_location(ip: str, path: Path = IP_DATABASE) -> Optional[tuple[float, float]]:
+    """Resolves an IPv4 address to (lat, lon) using the local database, if one has been installed."""
+    if not path.exists():
+        return None
+    try:
+        with IpDatabase(path) as db:
+            return db.lookup(ip)
+    except (OSError, ValueError):
+        return None
@@ -1,8 +1,28 @@
-from dataclasses import dataclass
+from array import array
+from dataclasses import dataclass, field
 from datetime import datetime
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
 
+Description = tuple[tuple[str, str], ...]
 
-@dataclass
+# Shared by every Weather without rain or snow, instead of a fresh empty dict per instance.
+NO_PRECIPITATION: Mapping[str, float] = MappingProxyType({})
+
+_DESCRIPTIONS: dict[Description, Description] = {}
+
+
+def intern_description(description: Iterable[tuple[str, str]]) -> Description:
+    """Returns the canonical tuple for a weather description, so equal descriptions share one object."""
+    key = tuple((desc, icon) for desc, icon in description)
+    return _DESCRIPTIONS.setdefault(key, key)
+
+
+def precipitation(amounts: Optional[Mapping[str, float]]) -> Mapping[str, float]:
+    return amounts if amounts else NO_PRECIPITATION
+
+
+@dataclass(slots=True, frozen=True)
 class Geolocation:
     """
     Geolocation dataclass representing a geographical location.
@@ -31,46 +51,163 @@ class Geolocation:
         return f"{', '.join(joinable[:-1])} {joinable[-1]}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Weather:
     """
     Weather dataclass representing weather information.
 
     Args:
-        description (list[tuple[str, str]]): The description of the weather.
+        description (tuple[tuple[str, str], ...]): The description of the weather.
         temp (float): The temperature.
         temp_feel (float): The perceived temperature.
         pressure (int): The atmospheric pressure.
         humidity (int): The humidity.
         wind_spd (float): The wind speed.
         wind_deg (int): The wind direction in degrees.
-        rain (dict[str, int]): A dictionary containing mm of rainfall in the last hour and last 3 hours
-        snow (dict[str, int]): A dictionary containing mm of snowfall in the last hour and last 3 hours
+        rain (Mapping[str, float]): A mapping containing mm of rainfall in the last hour and last 3 hours
+        snow (Mapping[str, float]): A mapping containing mm of snowfall in the last hour and last 3 hours
     """
 
-    description: list[tuple[str, str]]
+    description: Description
     temp: float
     temp_feel: float
     pressure: int
     humidity: int
     wind_spd: float
     wind_deg: int
-    rain: dict[str, int]
-    snow: dict[str, int]
+    rain: Mapping[str, float] = field(default_factory=lambda: NO_PRECIPITATION)
+    snow: Mapping[str, float] = field(default_factory=lambda: NO_PRECIPITATION)
+
+    def __hash__(self):
+        return hash(
+            (
+                self.description,
+                self.temp,
+                self.temp_feel,
+                self.pressure,
+                self.humidity,
+                self.wind_spd,
+                self.wind_deg,
+                tuple(sorted(self.rain.items())),
+                tuple(sorted(self.snow.items())),
+            )
+        )
+
+
+FORECAST_COLUMNS: dict[str, str] = {
+    "dt": "q",
+    "temp": "d",
+    "temp_feel": "d",
+    "pressure": "l",
+    "humidity": "l",
+    "wind_spd": "d",
+    "wind_deg": "l",
+    "rain": "d",
+    "snow": "d",
+}
 
 
 class Forecast:
     """
-    Forecast class representing a weather forecast.
+    Forecast class representing a weather forecast in columnar form.
+
+    Every numeric parameter is kept in its own contiguous `array` with one item per forecast slot, `dt` holds
+    the slots' epoch timestamps and `description` their weather descriptions. `rain` and `snow` hold mm of
+    precipitation in the 3 hours before each slot.
 
     Args:
         loc (Geolocation): The geolocation of the forecast.
-        weathers (list[tuple[datetime, Weather]]): The list of weather data for different times.
+        weathers (list[tuple[datetime, Weather]]): Optional list of weather data for different times to fill
+            the columns with.
+        utc_offset (int): Optional offset of the location's time zone from UTC in seconds.
     """
 
-    def __init__(self, loc: Geolocation, weathers: list[tuple[datetime, Weather]]):
+    __slots__ = ("loc", "utc_offset", "description", *FORECAST_COLUMNS)
+
+    def __init__(
+        self,
+        loc: Geolocation,
+        weathers: Optional[list[tuple[datetime, Weather]]] = None,
+        utc_offset: Optional[int] = None,
+    ):
         self.loc = loc
-        self.weathers = weathers
+        self.utc_offset = utc_offset
+        self.dt = array(FORECAST_COLUMNS["dt"])
+        self.temp = array(FORECAST_COLUMNS["temp"])
+        self.temp_feel = array(FORECAST_COLUMNS["temp_feel"])
+        self.pressure = array(FORECAST_COLUMNS["pressure"])
+        self.humidity = array(FORECAST_COLUMNS["humidity"])
+        self.wind_spd = array(FORECAST_COLUMNS["wind_spd"])
+        self.wind_deg = array(FORECAST_COLUMNS["wind_deg"])
+        self.rain = array(FORECAST_COLUMNS["rain"])
+        self.snow = array(FORECAST_COLUMNS["snow"])
+        self.description: list[Description] = []
+        for dt, weather in weathers or []:
+            self.append(
+                dt=int(dt.timestamp()),
+                description=intern_description(weather.description),
+                temp=weather.temp,
+                temp_feel=weather.temp_feel,
+                pressure=weather.pressure,
+                humidity=weather.humidity,
+                wind_spd=weather.wind_spd,
+                wind_deg=weather.wind_deg,
+                rain=weather.rain.get("3h", 0),
+                snow=weather.snow.get("3h", 0),
+            )
+
+    def append(
+        self,
+        dt: int,
+        description: Description,
+        temp: float,
+        temp_feel: float,
+        pressure: int,
+        humidity: int,
+        wind_spd: float,
+        wind_deg: int,
+        rain: float = 0,
+        snow: float = 0,
+    ) -> None:
+        """Appends a single forecast slot to the columns."""
+        self.dt.append(dt)
+        self.description.append(description)
+        self.temp.append(temp)
+        self.temp_feel.append(temp_feel)
+        self.pressure.append(pressure)
+        self.humidity.append(humidity)
+        self.wind_spd.append(wind_spd)
+        self.wind_deg.append(wind_deg)
+        self.rain.append(rain)
+        self.snow.append(snow)
+
+    def column(self, name: str) -> array:
+        if name not in FORECAST_COLUMNS:
+            raise KeyError(f"Unknown forecast column: {name}")
+        return getattr(self, name)
+
+    def __len__(self) -> int:
+        return len(self.dt)
+
+    def row(self, i: int) -> tuple[datetime, Weather]:
+        """Returns a single forecast slot as a (datetime, Weather) pair."""
+        rain, snow = self.rain[i], self.snow[i]
+        return datetime.fromtimestamp(self.dt[i]), Weather(
+            description=self.description[i],
+            temp=self.temp[i],
+            temp_feel=self.temp_feel[i],
+            pressure=self.pressure[i],
+            humidity=self.humidity[i],
+            wind_spd=self.wind_spd[i],
+            wind_deg=self.wind_deg[i],
+            rain={"3h": rain} if rain else NO_PRECIPITATION,
+            snow={"3h": snow} if snow else NO_PRECIPITATION,
+        )
+
+    @property
+    def weathers(self) -> list[tuple[datetime, Weather]]:
+        """Row view of the forecast, built on access."""
+        return [self.row(i) for i in range(len(self))]
 
     def __str__(self):
         s = f"Location: {self.loc}\n"
@@ -90,14 +227,27 @@ class Current:
         sunset (datetime): The time of sunset.
         loc (Geolocation): The geolocation of the current weather.
         weather (Weather): The weather information.
+        station_id (int): Optional ID of the OpenWeather city whose data was returned; nearby coordinates often
+            share one.
     """
 
-    def __init__(self, dt: datetime, sunrise: datetime, sunset: datetime, loc: Geolocation, weather: Weather):
+    __slots__ = ("dt", "sunrise", "sunset", "loc", "weather", "station_id")
+
+    def __init__(
+        self,
+        dt: datetime,
+        sunrise: datetime,
+        sunset: datetime,
+        loc: Geolocation,
+        weather: Weather,
+        station_id: Optional[int] = None,
+    ):
         self.dt = dt
         self.sunrise = sunrise
         self.sunset = sunset
         self.loc = loc
         self.weather = weather
+        self.station_id = station_id
 
     def __str__(self):
         return f"Location: {self.loc}\nWeather: {self.weather}"
@@ -0,0 +1,127 @@
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator, Optional
+
+from weatherpy.paths import RATE_LIMIT_STATE
+
+from .env import env_number
+from .exceptions import RateLimited
+
+# OpenWeather's free plan allows 60 calls per minute; paid plans can raise the rate through the environment, and
+# setting it to 0 disables the limiter (e.g. against a local stand-in server).
+RATE_ENV: str = "WEATHERPY_CALLS_PER_MINUTE"
+CALLS_PER_MINUTE: float = 60
+BURST: int = 10
+MAX_WAIT: float = 2.0
+
+# Exclusive locks on files shared by all weatherpy processes, e.g. the limiter state and the history store.
+if sys.platform == "win32":
+    import msvcrt
+
+    def lock_file(file: IO) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def unlock_file(file: IO) -> None:
+        file.seek(0)
+        msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def lock_file(file: IO) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+
+    def unlock_file(file: IO) -> None:
+        fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all weatherpy processes on the host through a locked state file.
+
+    The bucket holds up to `capacity` calls and refills at `calls_per_minute`. A call that finds the bucket empty
+    reserves the next free slot and sleeps until it, as long as that is within `max_wait` seconds; otherwise
+    `RateLimited` is raised without consuming anything. If the state file can't be used, calls are not limited.
+
+    Args:
+        path (Path): The state file.
+        calls_per_minute (float): Sustained call rate.
+        capacity (int): Number of calls that can be made in a burst.
+        max_wait (float): Longest time a call waits for its slot by default.
+    """
+
+    def __init__(
+        self, path: Path, calls_per_minute: float = CALLS_PER_MINUTE, capacity: int = BURST, max_wait: float = MAX_WAIT
+    ):
+        self.path = path
+        self.rate = calls_per_minute / 60
+        self.capacity = capacity
+        self.max_wait = max_wait
+
+    @contextmanager
+    def _state(self) -> Iterator[dict[str, float]]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, mode="a+", encoding="utf8") as file:
+            lock_file(file)
+            try:
+                file.seek(0)
+                try:
+                    state = json.loads(file.read())
+                except ValueError:
+                    state = {}
+                now = time.time()
+                tokens = float(state.get("tokens", self.capacity))
+                updated = min(float(state.get("updated", now)), now)
+                state = {"tokens": min(self.capacity, tokens + (now - updated) * self.rate), "updated": now}
+                yield state
+                file.seek(0)
+                file.truncate()
+                file.write(json.dumps(state))
+                file.flush()
+            finally:
+                unlock_file(file)
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """Takes one call from the bucket, waiting for it if needed, and returns the time waited."""
+        if self.rate <= 0:
+            return 0.0
+        max_wait = self.max_wait if max_wait is None else max_wait
+        try:
+            with self._state() as state:
+                wait = max(0.0, (1 - state["tokens"]) / self.rate)
+                if wait > max_wait:
+                    raise RateLimited(retry_after=wait)
+                state["tokens"] -= 1
+        except OSError:
+            return 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def drain(self) -> None:
+        """Empties the bucket after the API rejected a call for exceeding the limit, so all processes back off."""
+        if self.rate <= 0:
+            return
+        try:
+            with self._state() as state:
+                state["tokens"] = min(state["tokens"], 0.0)
+        except OSError:
+            pass
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Returns the process-wide rate limiter, configured from the environment on first use."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(RATE_LIMIT_STATE, calls_per_minute=env_number(RATE_ENV, CALLS_PER_MINUTE))
+        return _limiter
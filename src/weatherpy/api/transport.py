@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.exceptions import ConnectionError, Timeout
+
+from .env import env_number
+from .exceptions import CircuitOpen
+
+CONNECT_TIMEOUT: float = 3.05
+READ_TIMEOUT: float = 10.0
+MAX_RETRIES: int = 3
+BACKOFF_BASE: float = 0.25
+BACKOFF_CAP: float = 4.0
+POOL_MAXSIZE: int = 16
+RETRY_STATUSES: frozenset[int] = frozenset({500, 502, 503, 504})
+FAILURE_THRESHOLD: int = 5
+RECOVERY_TIME: float = 30.0
+# Timeouts and retries can be tuned through the environment, e.g. for slow links or a local stand-in server.
+CONNECT_TIMEOUT_ENV: str = "WEATHERPY_CONNECT_TIMEOUT"
+READ_TIMEOUT_ENV: str = "WEATHERPY_READ_TIMEOUT"
+MAX_RETRIES_ENV: str = "WEATHERPY_MAX_RETRIES"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker guarding a single host.
+
+    After `threshold` consecutive failures the circuit opens and calls are rejected until `recovery_time`
+    seconds have passed. Then a single trial call is let through (half-open state): success closes the circuit,
+    failure opens it again.
+
+    Args:
+        threshold (int): Number of consecutive failures that opens the circuit.
+        recovery_time (float): Seconds after which an open circuit lets a trial call through.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, recovery_time: float = RECOVERY_TIME):
+        self.threshold = threshold
+        self.recovery_time = recovery_time
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.recovery_time:
+                # Half-open: let one trial call through and keep the rest out until it reports back.
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_CAP) -> float:
+    """Returns a "full jitter" exponential backoff delay for the given (zero-based) retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+class Transport:
+    """
+    Shared HTTP transport with pooled keep-alive connections, timeouts, retries and per-host circuit breakers.
+
+    Args:
+        connect_timeout (float): Seconds to wait for a connection to be established.
+        read_timeout (float): Seconds to wait for the server to send data.
+        max_retries (int): How many times a failed GET is retried.
+        pool_maxsize (int): Number of connections kept alive per host.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+        pool_maxsize: int = POOL_MAXSIZE,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    def get(self, url: str) -> Response:
+        """Sends a GET request, retrying connection errors, timeouts and 5xx responses with jittered backoff."""
+        host = urlparse(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpen(host)
+        attempt = 0
+        while True:
+            try:
+                resp = self.session.get(url=url, timeout=(self.connect_timeout, self.read_timeout))
+            except (ConnectionError, Timeout):
+                breaker.record_failure()
+                if attempt >= self.max_retries or not breaker.allow():
+                    raise
+            else:
+                if resp.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return resp
+                breaker.record_failure()
+                if attempt >= self.max_retries or not breaker.allow():
+                    return resp
+            time.sleep(backoff_delay(attempt))
+            attempt += 1
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def transport_settings() -> dict[str, Any]:
+    """Returns the `Transport` timeouts and retry count configured in the environment."""
+    return {
+        "connect_timeout": env_number(CONNECT_TIMEOUT_ENV, CONNECT_TIMEOUT, positive=True),
+        "read_timeout": env_number(READ_TIMEOUT_ENV, READ_TIMEOUT, positive=True),
+        "max_retries": int(env_number(MAX_RETRIES_ENV, MAX_RETRIES)),
+    }
+
+
+_transport: Optional[Transport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """Returns the process-wide transport, creating it from the environment on first use."""
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = Transport(**transport_settings())
+        return _transport
+
+
+def configure_transport(**kwargs) -> Transport:
+    """Replaces the process-wide transport with one built from the given `Transport` arguments, taking the others
+    from the environment."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = Transport(**{**transport_settings(), **kwargs})
+        return _transport
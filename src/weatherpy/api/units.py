@@ -0,0 +1,53 @@
+from array import array
+from typing import Iterable
+
+# Weather is always fetched in OpenWeather's standard units (K, m/s, hPa) and converted locally when it is shown or
+# exported, so that one upstream request and one cache entry serve every unit system.
+STANDARD: str = "standard"
+UNIT_SYSTEMS: tuple[str, ...] = ("standard", "metric", "imperial")
+QUANTITIES: tuple[str, ...] = ("temp", "wind", "pressure")
+
+Conversion = tuple[float, float]
+IDENTITY: Conversion = (1.0, 0.0)
+
+# Every conversion from standard units is affine: converted = value * scale + offset.
+CONVERSIONS: dict[str, dict[str, Conversion]] = {
+    "standard": {"temp": IDENTITY, "wind": IDENTITY, "pressure": IDENTITY},
+    # °C, km/h, hPa
+    "metric": {"temp": (1.0, -273.15), "wind": (3.6, 0.0), "pressure": IDENTITY},
+    # °F, mph, inHg
+    "imperial": {"temp": (1.8, -459.67), "wind": (1 / 0.44704, 0.0), "pressure": (1 / 33.8639, 0.0)},
+}
+# How the API itself reports each unit system; used to read data that wasn't fetched in standard units.
+API_CONVERSIONS: dict[str, dict[str, Conversion]] = {
+    "standard": {"temp": IDENTITY, "wind": IDENTITY, "pressure": IDENTITY},
+    "metric": {"temp": (1.0, -273.15), "wind": IDENTITY, "pressure": IDENTITY},
+    "imperial": {"temp": (1.8, -459.67), "wind": (1 / 0.44704, 0.0), "pressure": IDENTITY},
+}
+
+
+def conversion(quantity: str, units: str, source: str = STANDARD) -> Conversion:
+    """Returns (scale, offset) converting a quantity from the API's `source` units to the `units` shown to users."""
+    if units not in CONVERSIONS:
+        raise ValueError(f"Unknown units: {units}. Should be one of {', '.join(UNIT_SYSTEMS)}.")
+    to_scale, to_offset = CONVERSIONS[units][quantity]
+    if source == STANDARD:
+        return to_scale, to_offset
+    from_scale, from_offset = API_CONVERSIONS[source][quantity]
+    scale = to_scale / from_scale
+    return scale, to_offset - from_offset * scale
+
+
+def convert(value: float, quantity: str, units: str, source: str = STANDARD) -> float:
+    scale, offset = conversion(quantity, units, source)
+    return value * scale + offset
+
+
+def convert_column(column: Iterable[float], quantity: str, units: str, source: str = STANDARD) -> array:
+    """Converts a whole forecast column at once; the conversion is looked up once rather than per value."""
+    scale, offset = conversion(quantity, units, source)
+    if (scale, offset) == IDENTITY:
+        return array("d", column)
+    if offset == 0:
+        return array("d", [value * scale for value in column])
+    return array("d", [value * scale + offset for value in column])
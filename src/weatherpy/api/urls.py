@@ -1,21 +1,43 @@
-from functools import partial
+import os
 from typing import TypeAlias, Union
 
 ApiURL: TypeAlias = str
 
-DIRECT_GEOCODING: ApiURL = "https://api.openweathermap.org/geo/1.0/direct?"
-REVERSE_GEOCODING: ApiURL = "https://api.openweathermap.org/geo/1.0/reverse?"
-CURRENT_WEATHER: ApiURL = "https://api.openweathermap.org/data/2.5/weather?"
-FORECAST_WEATHER: ApiURL = "https://api.openweathermap.org/data/2.5/forecast?"
+# Base URLs can be overridden, e.g. to point the app at a local stand-in server.
+API_URL_ENV: str = "WEATHERPY_API_URL"
+IP_URL_ENV: str = "WEATHERPY_IP_URL"
+
+OPEN_WEATHER: ApiURL = "https://api.openweathermap.org"
+DIRECT_GEOCODING: str = "/geo/1.0/direct?"
+REVERSE_GEOCODING: str = "/geo/1.0/reverse?"
+CURRENT_WEATHER: str = "/data/2.5/weather?"
+FORECAST_WEATHER: str = "/data/2.5/forecast?"
 IP: ApiURL = "https://api.ipify.org"
 
 
+def api_url(path: str) -> ApiURL:
+    return os.environ.get(API_URL_ENV, OPEN_WEATHER).rstrip("/") + path
+
+
 def build_url(base: ApiURL, **query_params: Union[str, float]) -> str:
     return base + "&".join([f"{k}={v}" for k, v in query_params.items()])
 
 
-build_direct_geocoding_url = partial(build_url, base=DIRECT_GEOCODING)
-build_reverse_geocoding_url = partial(build_url, base=REVERSE_GEOCODING)
-build_current_weather_url = partial(build_url, base=CURRENT_WEATHER)
-build_forecast_weather_url = partial(build_url, base=FORECAST_WEATHER)
-build_ip_url = partial(build_url, base=IP)
+def build_direct_geocoding_url(**query_params: Union[str, float]) -> str:
+    return build_url(api_url(DIRECT_GEOCODING), **query_params)
+
+
+def build_reverse_geocoding_url(**query_params: Union[str, float]) -> str:
+    return build_url(api_url(REVERSE_GEOCODING), **query_params)
+
+
+def build_current_weather_url(**query_params: Union[str, float]) -> str:
+    return build_url(api_url(CURRENT_WEATHER), **query_params)
+
+
+def build_forecast_weather_url(**query_params: Union[str, float]) -> str:
+    return build_url(api_url(FORECAST_WEATHER), **query_params)
+
+
+def build_ip_url(**query_params: Union[str, float]) -> str:
+    return build_url(os.environ.get(IP_URL_ENV, IP), **query_params)
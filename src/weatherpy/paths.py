@@ -0,0 +1,12 @@
+from pathlib import Path
+
+HOME_DIR: Path = Path.home() / "weatherpy"
+CACHE_DIR: Path = HOME_DIR / "cache"
+GEOCODING_DB: Path = HOME_DIR / "geocoding.sqlite3"
+IP_DATABASE: Path = HOME_DIR / "ipdb.bin"
+CONFIG_SNAPSHOT: Path = HOME_DIR / "weatherpy.cfg.json"
+VALIDATED_TOKENS: Path = HOME_DIR / "tokens.json"
+RATE_LIMIT_STATE: Path = HOME_DIR / "ratelimit.json"
+DAEMON_SOCKET: Path = HOME_DIR / "daemon.sock"
+HISTORY_DIR: Path = HOME_DIR / "history"
+CITY_INDEX: Path = HOME_DIR / "cities.bin"
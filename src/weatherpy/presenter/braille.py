@@ -0,0 +1,297 @@
+from dataclasses import dataclass
+from math import floor, log10
+from typing import Callable, Iterator, Optional, Sequence
+
+from rich.segment import Segment
+from rich.style import Style
+
+# A braille cell holds 2x4 dots; DOT_BITS[column][row] is the bit of each dot in the U+2800 block.
+BRAILLE_BASE: int = 0x2800
+DOT_BITS: tuple[tuple[int, ...], ...] = ((0x01, 0x02, 0x04, 0x40), (0x08, 0x10, 0x20, 0x80))
+# Series colors, in the order the plots used them before they were drawn natively.
+COLORS: tuple[str, ...] = ("bright_blue", "bright_green", "bright_red", "bright_magenta", "bright_cyan")
+LEGEND_DOTS: str = "⢕⢕"
+# Share of the space between two x values taken up by a bar.
+BAR_WIDTH: float = 0.8
+
+LINE, BARS, MARKERS = "line", "bars", "markers"
+
+Line = list[Segment]
+# Maps a data value to a dot coordinate.
+Scale = Callable[[float], int]
+
+
+@dataclass
+class Series:
+    """
+    A data series of a plot.
+
+    Args:
+        y (Sequence[float]): One value per x value.
+        label (str): The label shown in the legend.
+        kind (str): "line" draws a braille line, "bars" draws bars stacked on those of the previous bar series and
+            "markers" draws a line of glyphs, each segment with the glyph of the point it starts at.
+        glyphs (Optional[Sequence[str]]): One glyph per point for "markers"; for "bars", a single glyph filling the
+            bars instead of braille dots.
+    """
+
+    y: Sequence[float]
+    label: str = ""
+    kind: str = LINE
+    glyphs: Optional[Sequence[str]] = None
+
+
+class Canvas:
+    """
+    Grid of terminal cells holding braille dots or glyphs, each cell in the color of whatever was drawn on it last.
+
+    Args:
+        width (int): Width in cells (2 dots each).
+        height (int): Height in cells (4 dots each).
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.dots = bytearray(width * height)
+        self.glyphs: dict[int, str] = {}
+        self.colors: list[Optional[str]] = [None] * (width * height)
+
+    def text(self, col: int, row: int, text: str, color: Optional[str] = None) -> None:
+        for i, glyph in enumerate(text):
+            self.glyph(col + i, row, glyph, color)
+
+    def dot(self, x: int, y: int, color: str) -> None:
+        if 0 <= x < self.width * 2 and 0 <= y < self.height * 4:
+            cell = (y >> 2) * self.width + (x >> 1)
+            self.dots[cell] |= DOT_BITS[x & 1][y & 3]
+            self.glyphs.pop(cell, None)
+            self.colors[cell] = color
+
+    def glyph(self, col: int, row: int, glyph: str, color: Optional[str]) -> None:
+        if 0 <= col < self.width and 0 <= row < self.height:
+            cell = row * self.width + col
+            self.glyphs[cell] = glyph
+            self.colors[cell] = color
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: str) -> None:
+        """Draws a line of dots between two dots (Bresenham)."""
+        for x, y in _bresenham(x0, y0, x1, y1):
+            self.dot(x, y, color)
+
+    def char(self, cell: int) -> str:
+        glyph = self.glyphs.get(cell)
+        if glyph is not None:
+            return glyph
+        return chr(BRAILLE_BASE + self.dots[cell]) if self.dots[cell] else " "
+
+
+def _bresenham(x0: int, y0: int, x1: int, y1: int) -> Iterator[tuple[int, int]]:
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+    err = dx + dy
+    while True:
+        yield x0, y0
+        if x0 == x1 and y0 == y1:
+            return
+        e2 = 2 * err
+        if e2 >= dy:
+            err += dy
+            x0 += sx
+        if e2 <= dx:
+            err += dx
+            y0 += sy
+
+
+def _decimals(step: float) -> int:
+    """Returns enough decimals to tell apart tick labels `step` apart, e.g. 1 for 5.3 and 2 for 0.53."""
+    if step <= 0:
+        return 1
+    return min(3, max(0, 1 - floor(log10(step))))
+
+
+class BraillePlot:
+    """
+    Plot of one or more series over shared x values, rasterized straight into rich segments.
+
+    Nothing is kept in global state, so any number of plots can be rendered independently, also concurrently.
+
+    Args:
+        x (Sequence[float]): The x values, in ascending order.
+        series (Sequence[Series]): The series to draw, in drawing order; the legend lists them in this order.
+        xticks (Sequence[tuple[float, str]]): Positions on the x axis and their labels.
+    """
+
+    def __init__(self, x: Sequence[float], series: Sequence[Series], xticks: Sequence[tuple[float, str]] = ()):
+        self.x = x
+        self.series = series
+        self.xticks = xticks
+
+    def y_range(self) -> tuple[float, float]:
+        values: list[float] = []
+        stacked = [0.0] * len(self.x)
+        for series in self.series:
+            if series.kind == BARS:
+                stacked = [base + value for base, value in zip(stacked, series.y)]
+                values += stacked
+                values.append(0.0)
+            else:
+                values += series.y
+        if not values:
+            return 0.0, 1.0
+        low, high = min(values), max(values)
+        if low == high:
+            return low - 1, high + 1
+        return low, high
+
+    def render(self, width: int, height: int) -> list[Line]:
+        """Returns the plot as `height` lines of segments, each `width` cells wide."""
+        axis_rows = 2 if self.xticks else 1
+        rows = max(1, height - axis_rows)
+        low, high = self.y_range()
+        labels = self._y_labels(rows, low, high)
+        label_width = max(len(label) for label in labels if label)
+        plot_width = max(1, width - label_width - 1)
+
+        canvas = Canvas(plot_width, rows)
+        self._draw(canvas, low, high)
+        lines = [
+            [Segment(label.rjust(label_width) + ("┤" if label else "│")), *self._row(canvas, row)]
+            for row, label in enumerate(labels)
+        ]
+        lines += self._x_axis(label_width, plot_width)
+        return [_fit(line, width) for line in lines[:height]]
+
+    def _y_labels(self, rows: int, low: float, high: float) -> list[str]:
+        """Labels every other row from the top one, and the bottom one."""
+        if rows == 1:
+            return [f"{high:.1f}"]
+        values = [high - (high - low) * row / (rows - 1) for row in range(rows)]
+        decimals = _decimals(2 * (high - low) / (rows - 1))
+        return [f"{value:.{decimals}f}" if row % 2 == 0 or row == rows - 1 else "" for row, value in enumerate(values)]
+
+    def _scale(self, canvas: Canvas, low: float, high: float) -> tuple[Scale, Scale]:
+        dots_w, dots_h = canvas.width * 2, canvas.height * 4
+        x0 = self.x[0] if self.x else 0
+        x_span = (self.x[-1] - x0) if len(self.x) > 1 else 1
+
+        def px(x: float) -> int:
+            return round((x - x0) / x_span * (dots_w - 1)) if x_span else 0
+
+        def py(y: float) -> int:
+            return round((high - y) / (high - low) * (dots_h - 1))
+
+        return px, py
+
+    def _draw(self, canvas: Canvas, low: float, high: float) -> None:
+        px, py = self._scale(canvas, low, high)
+        xs = [px(x) for x in self.x]
+        stacked = [0.0] * len(self.x)
+        for index, series in enumerate(self.series):
+            color = COLORS[index % len(COLORS)]
+            if series.kind == BARS:
+                stacked = self._draw_bars(canvas, xs, stacked, series, py, color)
+                continue
+            points = [(x, py(y)) for x, y in zip(xs, series.y)]
+            if series.kind == MARKERS:
+                glyphs = series.glyphs or "•"
+                cells = [(x >> 1, y >> 2) for x, y in points]
+                for i, (start, end) in enumerate(zip(cells, cells[1:] + cells[-1:])):
+                    for col, row in _bresenham(*start, *end):
+                        canvas.glyph(col, row, glyphs[i % len(glyphs)], color)
+            else:
+                for start, end in zip(points, points[1:] or points):
+                    canvas.line(*start, *end, color)
+        self._draw_legend(canvas)
+
+    def _draw_bars(
+        self, canvas: Canvas, xs: list[int], stacked: list[float], series: Series, py: Scale, color: str
+    ) -> list[float]:
+        """Draws bars on top of the `stacked` ones and returns the new tops."""
+        spacing = (xs[-1] - xs[0]) / (len(xs) - 1) if len(xs) > 1 else canvas.width * 2
+        half = max(0, int(spacing * BAR_WIDTH / 2))
+        glyph = series.glyphs[0] if series.glyphs else None
+        tops = []
+        for x, base, value in zip(xs, stacked, series.y):
+            top = base + value
+            tops.append(top)
+            if value <= 0:
+                continue
+            y_top, y_bottom = py(top), py(base) - (1 if base > 0 else 0)
+            y_top = min(y_top, y_bottom)
+            if glyph is None:
+                for dot_x in range(x - half, x + half + 1):
+                    canvas.line(dot_x, y_top, dot_x, y_bottom, color)
+            else:
+                for col in range((x - half) >> 1, ((x + half) >> 1) + 1):
+                    for row in range(y_top >> 2, (y_bottom >> 2) + 1):
+                        canvas.glyph(col, row, glyph, color)
+        return tops
+
+    def _row(self, canvas: Canvas, row: int) -> Line:
+        """Joins a canvas row into as few segments as there are runs of one color."""
+        segments: Line = []
+        start = row * canvas.width
+        run: list[str] = []
+        run_color: Optional[str] = None
+        for cell in range(start, start + canvas.width):
+            color = canvas.colors[cell] if canvas.dots[cell] or cell in canvas.glyphs else None
+            if color != run_color and run:
+                segments.append(Segment("".join(run), _style(run_color)))
+                run = []
+            run_color = color
+            run.append(canvas.char(cell))
+        if run:
+            segments.append(Segment("".join(run), _style(run_color)))
+        return segments
+
+    def _draw_legend(self, canvas: Canvas) -> None:
+        """Writes a legend line per series into the top left corner, over whatever was drawn there."""
+        for index, series in enumerate(self.series[: canvas.height]):
+            if not series.label:
+                continue
+            if series.glyphs:
+                sample = "".join(series.glyphs[:2]) if len(series.glyphs) > 1 else series.glyphs[0] * 2
+            else:
+                sample = LEGEND_DOTS
+            if 2 + len(sample) + len(series.label) > canvas.width:
+                return
+            canvas.text(0, index, " ")
+            canvas.text(1, index, sample, COLORS[index % len(COLORS)])
+            canvas.text(1 + len(sample), index, f" {series.label}")
+
+    def _x_axis(self, label_width: int, plot_width: int) -> list[Line]:
+        axis = ["─"] * plot_width
+        label_row = [" "] * (label_width + 1 + plot_width)
+        if self.x and self.xticks:
+            x0 = self.x[0]
+            x_span = (self.x[-1] - x0) or 1
+            free_from = 0
+            for tick, label in self.xticks:
+                if not x0 <= tick <= self.x[-1]:
+                    continue
+                col = round((tick - x0) / x_span * (plot_width * 2 - 1)) >> 1
+                axis[col] = "┬"
+                start = label_width + 1 + col - len(label) // 2
+                if start >= free_from and start + len(label) <= len(label_row):
+                    label_row[start : start + len(label)] = label
+                    free_from = start + len(label) + 1
+        lines = [[Segment(" " * label_width + "└" + "".join(axis))]]
+        if self.xticks:
+            lines.append([Segment("".join(label_row))])
+        return lines
+
+
+_styles: dict[Optional[str], Optional[Style]] = {None: None}
+
+
+def _style(color: Optional[str]) -> Optional[Style]:
+    style = _styles.get(color)
+    if style is None and color is not None:
+        style = _styles[color] = Style(color=color)
+    return style
+
+
+def _fit(line: Line, width: int) -> Line:
+    """Crops or pads a line to exactly `width` cells."""
+    return Segment.adjust_line_length(line, width)
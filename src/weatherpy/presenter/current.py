@@ -1,10 +1,14 @@
+from typing import Optional
+
 from rich import print
 from rich.panel import Panel
 
 from weatherpy.api.models import Current
+from weatherpy.api.units import convert
+from weatherpy.profiling import timed
 
 from .symbols import API_ICON_TO_EMOJI
-from .utils import UNIT_MAP, get_wind_direction
+from .utils import UNIT_MAP, format_age, format_pressure, get_wind_direction
 
 
 def create_location_and_time_panel(weather_data: Current) -> Panel:
@@ -13,7 +17,7 @@ def create_location_and_time_panel(weather_data: Current) -> Panel:
     time = weather_data.dt.strftime("%H:%M")
     dt_txt: str = f":calendar: {date} :clock10: {time}\n\n"
     sun_txt: str = (
-        f":sunrise: {weather_data.sunrise.strftime('%H:%M')} " f":sunset: {weather_data.sunset.strftime('%H:%M')}"
+        f":sunrise: {weather_data.sunrise.strftime('%H:%M')} :sunset: {weather_data.sunset.strftime('%H:%M')}"
     )
     txt = loc_txt + dt_txt + sun_txt
     return Panel(
@@ -24,21 +28,22 @@ def create_location_and_time_panel(weather_data: Current) -> Panel:
     )
 
 
-def create_current_weather_panel(weather_data: Current, units: str) -> Panel:
+def create_current_weather_panel(weather_data: Current, units: str, age: Optional[float] = None) -> Panel:
+    """Builds the panel of weather parameters; `age` (in seconds) marks data that may be outdated."""
     weather_txt: str = (
         " ".join(f"{API_ICON_TO_EMOJI[icon]} {desc.title()}" for desc, icon in weather_data.weather.description) + "\n"
     )
-    weather_txt += f":thermometer: {weather_data.weather.temp:+.1f}{UNIT_MAP[units]['temp']}"
-    weather_txt += f", feels like {weather_data.weather.temp_feel:+.1f}{UNIT_MAP[units]['temp']}\n"
+    temp = convert(weather_data.weather.temp, "temp", units)
+    temp_feel = convert(weather_data.weather.temp_feel, "temp", units)
+    weather_txt += f":thermometer: {temp:+.1f}{UNIT_MAP[units]['temp']}"
+    weather_txt += f", feels like {temp_feel:+.1f}{UNIT_MAP[units]['temp']}\n"
 
-    wind_speed = weather_data.weather.wind_spd
+    wind_speed = int(convert(weather_data.weather.wind_spd, "wind", units))
     wind_dir = get_wind_direction(weather_data.weather.wind_deg).value
-    if units == "metric":
-        wind_speed *= 3.6
-    wind_speed = int(wind_speed)
     weather_txt += f":dash: {wind_speed} {UNIT_MAP[units]['wind']} {wind_dir}"
     weather_txt += "\n"
-    weather_txt += f"{weather_data.weather.pressure} hPa, :sweat_drops: {weather_data.weather.humidity}%"
+    pressure = format_pressure(convert(weather_data.weather.pressure, "pressure", units), units)
+    weather_txt += f"{pressure}, :sweat_drops: {weather_data.weather.humidity}%"
 
     if rain := weather_data.weather.rain:
         weather_txt += "\n"
@@ -50,11 +55,13 @@ def create_current_weather_panel(weather_data: Current, units: str) -> Panel:
     return Panel(
         renderable=weather_txt,
         title="[b]Current Weather Conditions[/b]",
+        subtitle=None if age is None else f"[dim]{format_age(age)}[/]",
         expand=False,
         padding=(1, 3),
     )
 
 
+@timed("show_current_weather")
 def show_current_weather(weather_data: Current, units: str) -> None:
     loc_panel = create_location_and_time_panel(weather_data)
     weather_panel = create_current_weather_panel(weather_data, units)
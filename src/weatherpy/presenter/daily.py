@@ -0,0 +1,54 @@
+from typing import Iterable, Optional
+
+from rich import print
+from rich.markup import escape
+from rich.table import Table
+
+from weatherpy.api.daily import DailySummary, summarize_many
+from weatherpy.api.models import Forecast
+from weatherpy.api.units import conversion, convert
+from weatherpy.profiling import timed
+
+from .symbols import API_ICON_TO_EMOJI
+from .utils import UNIT_MAP, format_age, get_wind_direction
+
+
+def create_daily_table(summaries: list[list[DailySummary]], units: str, age: Optional[float] = None) -> Table:
+    """Builds one compact table with a row per location and day; `age` (in seconds) marks data that may be
+    outdated."""
+    temp_unit = UNIT_MAP[units]["temp"]
+    scale, offset = conversion("temp", units)
+    table = Table(
+        title="Daily Forecast",
+        title_justify="left",
+        caption=None if age is None else format_age(age),
+        caption_justify="left",
+        padding=(0, 1),
+    )
+    table.add_column("Location")
+    table.add_column("Day")
+    table.add_column("", no_wrap=True)
+    table.add_column(escape(f"Min/Max [{temp_unit}]"), justify="right")
+    table.add_column(escape(f"Mean [{temp_unit}]"), justify="right")
+    table.add_column(escape("Rain [mm]"), justify="right")
+    table.add_column(escape("Snow [mm]"), justify="right")
+    table.add_column(escape(f"Wind [{UNIT_MAP[units]['wind']}]"), justify="right")
+    for location in summaries:
+        for i, day in enumerate(location):
+            table.add_row(
+                f"{day.loc.name}, {day.loc.country}" if i == 0 else "",
+                day.day.strftime("%a %b %d") + ("" if day.slots == 8 else f" ({day.slots * 3}h)"),
+                " ".join(API_ICON_TO_EMOJI[icon] for _, icon in day.description),
+                f"{day.temp_min * scale + offset:+.0f}/{day.temp_max * scale + offset:+.0f}",
+                f"{day.temp_mean * scale + offset:+.1f}",
+                f"{day.rain:.1f}" if day.rain else "",
+                f"{day.snow:.1f}" if day.snow else "",
+                f"{convert(day.wind_max, 'wind', units):.0f} {get_wind_direction(day.wind_deg).value}",
+                end_section=i == len(location) - 1,
+            )
+    return table
+
+
+@timed("show_daily_forecast")
+def show_daily_forecast(forecasts: Iterable[Forecast], units: str) -> None:
+    print(create_daily_table(summarize_many(forecasts), units))
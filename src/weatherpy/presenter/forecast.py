@@ -1,17 +1,41 @@
+import threading
+from array import array
+from collections import OrderedDict
 from datetime import datetime
-from typing import Callable, Optional, Union
+from typing import Any, Hashable, Optional
 
-import plotext as plt
 from rich import print
-from rich.ansi import AnsiDecoder
-from rich.console import Group
 from rich.jupyter import JupyterMixin
 from rich.layout import Layout
 from rich.panel import Panel
+from rich.segment import Segment
 
 from weatherpy.api.models import Forecast
+from weatherpy.api.units import convert_column
+from weatherpy.profiling import timed
 
-from .utils import UNIT_MAP, get_wind_direction, round_down_to_closest_multiple
+from .braille import BARS, MARKERS, BraillePlot, Line, Series
+from .utils import UNIT_MAP, format_age, round_down_to_closest_multiple, wind_direction_column
+
+CANVAS_CACHE_SIZE: int = 32
+
+# Rendered plot lines keyed by everything that affects their look, so that re-layouts (resizes, live refreshes)
+# reuse unchanged plots instead of rasterizing them again.
+_canvas_cache: "OrderedDict[Hashable, list[Line]]" = OrderedDict()
+_canvas_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, array)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, Series):
+        return (_freeze(value.y), value.label, value.kind, _freeze(value.glyphs))
+    return value
+
+
+def clear_canvas_cache() -> None:
+    with _canvas_lock:
+        _canvas_cache.clear()
 
 
 def make_layout() -> Layout:
@@ -30,49 +54,49 @@ def make_layout() -> Layout:
 
 
 class WeatherPlot(JupyterMixin):
-    def __init__(
-        self,
-        x,
-        y,
-        plotting_fn: Callable = plt.plot,
-        xlabel: str = "",
-        datalabel: Union[str, list[str]] = "",
-        datalabel2: str = "",
-        y2: Optional[list] = None,
-        markers: Optional[Union[str, list[str]]] = "braille",
-    ):
-        if y2 is None:
-            y2 = []
-        self.decoder = AnsiDecoder()
+    """
+    Forecast plot over time, drawn by `BraillePlot` to fit the space rich gives it.
+
+    Args:
+        x (list[int]): Timestamps of the forecast slots.
+        series (list[Series]): The series to plot.
+    """
+
+    def __init__(self, x: list[int], series: list[Series]):
         self.x = x
-        self.y = y
-        self.plotting_fn = plotting_fn
-        self.xlabel = xlabel
-        self.datalabel = datalabel
-        self.datalabel2 = datalabel2
-        self.y2 = y2
-        self.marker = markers
+        self.series = series
 
     def __rich_console__(self, console, options):
         self.width = options.max_width or console.width
         self.height = options.height or console.height
-        canvas = self._build()
-        self.rich_canvas = Group(*self.decoder.decode(canvas))
-        yield self.rich_canvas
-
-    def _build(self):
-        plt.clf()
-        self.plotting_fn(self.x, self.y, label=self.datalabel, marker=self.marker)
-        if self.y2:
-            self.plotting_fn(self.x, self.y2, label=self.datalabel2, marker=self.marker)
-        plt.plotsize(self.width, self.height)
-        plt.xaxes(1, 0)
-        plt.yaxes(1, 0)
-        plt.xlabel(self.xlabel)
+        key = self._fingerprint()
+        with _canvas_lock:
+            lines = _canvas_cache.get(key)
+            if lines is not None:
+                _canvas_cache.move_to_end(key)
+        if lines is None:
+            lines = self._build()
+            with _canvas_lock:
+                _canvas_cache[key] = lines
+                if len(_canvas_cache) > CANVAS_CACHE_SIZE:
+                    _canvas_cache.popitem(last=False)
+        new_line = Segment.line()
+        for line in lines:
+            yield from line
+            yield new_line
+
+    def _fingerprint(self) -> Hashable:
+        return (
+            _freeze(self.x),
+            _freeze(self.series),
+            _freeze(self._make_x_axis_labels()),
+            self.width,
+            self.height,
+        )
+
+    def _build(self) -> list[Line]:
         xticks, labels = self._make_x_axis_labels()
-        plt.xticks(ticks=xticks, labels=labels)
-        plt.theme("clear")
-        return plt.build()
+        return BraillePlot(self.x, self.series, xticks=list(zip(xticks, labels))).render(self.width, self.height)
 
     def _make_x_axis_labels(self) -> tuple[list[int], list[str]]:
         mx = self.x[-1]
@@ -89,35 +113,40 @@ class WeatherPlot(JupyterMixin):
         return xticks, labels
 
 
-def show_forecast(forecast: Forecast, units: str) -> None:
+def create_forecast_panel(forecast: Forecast, units: str, age: Optional[float] = None) -> Panel:
+    """Builds the forecast plots; `age` (in seconds) marks data that may be outdated."""
     layout = make_layout()
 
     header = layout["header"]
     title = f":globe_with_meridians: {forecast.loc}"
     header.update(title)
-    dts = [int(round(dt.timestamp())) for dt, _ in forecast.weathers]
+    dts = list(forecast.dt)
 
     temp_layout = layout["1st"]
     temp_plot = Panel(
         WeatherPlot(
             x=dts,
-            y=[weather.temp for _, weather in forecast.weathers],
-            y2=[weather.temp_feel for _, weather in forecast.weathers],
-            datalabel=f"Actual [{UNIT_MAP[units]['temp']}]",
-            datalabel2=f"Feels like [{UNIT_MAP[units]['temp']}]",
+            series=[
+                Series(convert_column(forecast.temp, "temp", units), f"Actual [{UNIT_MAP[units]['temp']}]"),
+                Series(convert_column(forecast.temp_feel, "temp", units), f"Feels like [{UNIT_MAP[units]['temp']}]"),
+            ],
         ),
         title="Temperature",
     )
     temp_layout.update(temp_plot)
 
-    mult = 3.6 if units == "metric" else 1
     wind_layout = layout["2nd"]
     wind_plot = Panel(
         WeatherPlot(
             x=dts,
-            y=[weather.wind_spd * mult for _, weather in forecast.weathers],
-            datalabel=f"Speed [{UNIT_MAP[units]['wind']}]",
-            markers=[get_wind_direction(weather.wind_deg).value for _, weather in forecast.weathers],
+            series=[
+                Series(
+                    convert_column(forecast.wind_spd, "wind", units),
+                    f"Speed [{UNIT_MAP[units]['wind']}]",
+                    kind=MARKERS,
+                    glyphs=wind_direction_column(forecast.wind_deg),
+                )
+            ],
         ),
         title="Wind",
     )
@@ -127,13 +156,10 @@ def show_forecast(forecast: Forecast, units: str) -> None:
     precipitation_plot = Panel(
         WeatherPlot(
             x=dts,
-            y=[
-                [weather.rain.get("3h", 0) for _, weather in forecast.weathers],
-                [weather.snow.get("3h", 0) for _, weather in forecast.weathers],
+            series=[
+                Series(forecast.rain, "Rain [mm]", kind=BARS),
+                Series(forecast.snow, "Snow [mm]", kind=BARS, glyphs="❄"),
             ],
-            plotting_fn=plt.stacked_bar,
-            datalabel=[" Rain [mm]", " Snow [mm]"],
-            markers=["braille", "snowflake"],
         ),
         title="Precipitation in the Last 3 Hours",
     )
@@ -143,11 +169,19 @@ def show_forecast(forecast: Forecast, units: str) -> None:
     pressure_plot = Panel(
         WeatherPlot(
             x=dts,
-            y=[weather.pressure for _, weather in forecast.weathers],
-            datalabel="Pressure [hPa]",
+            series=[
+                Series(
+                    convert_column(forecast.pressure, "pressure", units), f"Pressure [{UNIT_MAP[units]['pressure']}]"
+                )
+            ],
         ),
         title="Pressure",
     )
     pressure_layout.update(pressure_plot)
 
-    print(Panel(layout, title="Weather Report"))
+    return Panel(layout, title="Weather Report", subtitle=None if age is None else f"[dim]{format_age(age)}[/]")
+
+
+@timed("show_forecast")
+def show_forecast(forecast: Forecast, units: str) -> None:
+    print(create_forecast_panel(forecast, units))
@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from rich import print
+from rich.table import Table
+
+from weatherpy.api.history import CURRENT, HistoryRecord
+from weatherpy.api.units import convert
+from weatherpy.profiling import timed
+
+from .symbols import API_ICON_TO_EMOJI
+from .utils import UNIT_MAP, format_pressure, get_wind_direction
+
+
+def create_history_table(records: list[HistoryRecord], units: str, title: str) -> Table:
+    """Builds a table of stored records, converted to `units` from whatever units each was fetched in."""
+    symbols = UNIT_MAP[units]
+    table = Table(title=title, title_justify="left")
+    table.add_column("Valid for")
+    table.add_column("Source")
+    table.add_column("Fetched")
+    table.add_column("", no_wrap=True)
+    table.add_column("Temp", justify="right")
+    table.add_column("Feels like", justify="right")
+    table.add_column("Wind", justify="right")
+    table.add_column("Pressure", justify="right")
+    table.add_column("Humidity", justify="right")
+    table.add_column("Rain", justify="right")
+    table.add_column("Snow", justify="right")
+    for record in records:
+        temp = convert(record.temp, "temp", units, source=record.units)
+        temp_feel = convert(record.temp_feel, "temp", units, source=record.units)
+        wind_spd = convert(record.wind_spd, "wind", units, source=record.units)
+        pressure = convert(record.pressure, "pressure", units, source=record.units)
+        source = "observed" if record.kind == CURRENT else f"forecast +{record.lead_hours:.0f}h"
+        table.add_row(
+            datetime.fromtimestamp(record.dt).strftime("%a %b %d %H:%M"),
+            source,
+            datetime.fromtimestamp(record.fetched).strftime("%b %d %H:%M"),
+            API_ICON_TO_EMOJI.get(record.icon, ""),
+            f"{temp:+.1f}{symbols['temp']}",
+            f"{temp_feel:+.1f}{symbols['temp']}",
+            f"{wind_spd:.0f} {symbols['wind']} {get_wind_direction(record.wind_deg).value}",
+            format_pressure(pressure, units),
+            f"{record.humidity}%",
+            f"{record.rain:g} mm" if record.rain else "",
+            f"{record.snow:g} mm" if record.snow else "",
+        )
+    return table
+
+
+@timed("show_history")
+def show_history(records: list[HistoryRecord], units: str, title: str) -> None:
+    if not records:
+        print("[light_red]No stored weather data for this location and time range.[/]")
+        return
+    print(create_history_table(records, units, title))
@@ -1,4 +1,4 @@
-from typing import TypeAlias
+from typing import Sequence, TypeAlias
 
 from weatherpy.presenter.symbols import DEGREE, Wind
 
@@ -28,12 +28,35 @@ def get_wind_direction(deg: int) -> Wind:
         raise ValueError(f"Incorrect wind direction value: {deg}. Should be a number between 0 and 360.")
 
 
+# Symbols of the units values are converted to by `weatherpy.api.units`.
 UNIT_MAP: dict[str, dict] = {
-    "standard": {"temp": "K", "wind": "m/s"},
-    "metric": {"temp": f"{DEGREE}C", "wind": "km/h"},
-    "imperial": {"temp": f"{DEGREE}F", "wind": "mph"},
+    "standard": {"temp": "K", "wind": "m/s", "pressure": "hPa"},
+    "metric": {"temp": f"{DEGREE}C", "wind": "km/h", "pressure": "hPa"},
+    "imperial": {"temp": f"{DEGREE}F", "wind": "mph", "pressure": "inHg"},
 }
 
 
 def round_down_to_closest_multiple(num: Number, mult: Number) -> Number:
     return num // mult * mult
+
+
+def format_pressure(pressure: Number, units: str) -> str:
+    """Formats a converted pressure; inHg values need two decimals to be of any use."""
+    unit = UNIT_MAP[units]["pressure"]
+    return f"{pressure:.2f} {unit}" if unit == "inHg" else f"{pressure:.0f} {unit}"
+
+
+def format_age(seconds: Number) -> str:
+    """Describes how long ago data was fetched, e.g. 'fetched 25 min ago'."""
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "fetched just now"
+    if minutes < 60:
+        return f"fetched {minutes} min ago"
+    if minutes < 48 * 60:
+        return f"fetched {minutes // 60} h ago"
+    return f"fetched {minutes // (24 * 60)} days ago"
+
+
+def wind_direction_column(column: Sequence[int]) -> list[str]:
+    return [get_wind_direction(deg).value for deg in column]
@@ -0,0 +1,127 @@
+import json
+import sys
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Span:
+    """
+    Timing span recorded while profiling is enabled.
+
+    Args:
+        name (str): Name of the measured phase.
+        attrs (dict[str, Any]): Extra data stored with the span, e.g. the number of bytes transferred.
+    """
+
+    __slots__ = ("name", "attrs", "start", "duration", "thread")
+
+    def __init__(self, name: str, attrs: dict[str, Any]):
+        self.name = name
+        self.attrs = attrs
+        self.start = 0.0
+        self.duration = 0.0
+        self.thread = threading.current_thread().name
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.duration = time.perf_counter() - self.start
+        _spans.append(self)
+
+
+class _NullSpan:
+    """Shared stand-in returned by `span` while profiling is disabled, so that disabled spans cost one check."""
+
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+_enabled: bool = False
+_origin: float = 0.0
+_spans: list[Span] = []
+
+
+def enable() -> None:
+    global _enabled, _origin
+    _enabled = True
+    _origin = time.perf_counter()
+    _spans.clear()
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def span(name: str, **attrs: Any) -> Union[Span, _NullSpan]:
+    """Returns a context manager timing the enclosed block when profiling is enabled."""
+    if not _enabled:
+        return NULL_SPAN
+    return Span(name, attrs)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """Decorator recording a span around every call of the decorated function while profiling is enabled."""
+
+    def decorator(fn: F) -> F:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with Span(name, {}):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def trace() -> dict[str, Any]:
+    """Returns the recorded spans, ordered by start time, with times in milliseconds since profiling started."""
+    spans = sorted(_spans, key=lambda s: s.start)
+    return {
+        "total_ms": round((time.perf_counter() - _origin) * 1000, 3),
+        "spans": [
+            {
+                "name": s.name,
+                "start_ms": round((s.start - _origin) * 1000, 3),
+                "duration_ms": round(s.duration * 1000, 3),
+                "thread": s.thread,
+                **s.attrs,
+            }
+            for s in spans
+        ],
+    }
+
+
+def write_trace(target: Optional[str]) -> None:
+    """Writes the trace as JSON to a file, or to stderr if the target is '-' or empty."""
+    data = json.dumps(trace(), indent=1)
+    if not target or target == "-":
+        print(data, file=sys.stderr)
+    else:
+        Path(target).write_text(data + "\n", encoding="utf8")
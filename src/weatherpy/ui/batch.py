@@ -0,0 +1,88 @@
+import asyncio
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Iterable, Optional, Union
+
+from requests.exceptions import RequestException
+
+from weatherpy.api.aio import AsyncClient
+from weatherpy.api.comm import error_message
+from weatherpy.api.exceptions import BadRequest, CircuitOpen, RateLimited
+from weatherpy.api.models import Current, Forecast
+from weatherpy.ui.snapshot import geo_coords_valid
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of fetching a single location in a batch run.
+
+    Args:
+        query (str): The location as given in the input.
+        current (Optional[Current]): Current weather, if requested and fetched.
+        forecast (Optional[Forecast]): Weather forecast, if requested and fetched.
+        error (str): Error message if the location couldn't be fetched.
+    """
+
+    query: str
+    current: Optional[Current] = None
+    forecast: Optional[Forecast] = None
+    error: str = ""
+
+
+def parse_location_query(query: str) -> Union[str, tuple[float, float]]:
+    """Returns coordinates for 'lat,lon' queries and the (stripped) query itself for city names."""
+    parts = "".join(query.split()).split(",")
+    if len(parts) == 2 and geo_coords_valid(loc=(parts[0], parts[1])):
+        return float(parts[0]), float(parts[1])
+    return query.strip()
+
+
+def read_locations(file: Optional[Path]) -> list[str]:
+    """Reads one location per line from a file (or stdin), skipping blank lines and '#' comments."""
+    if file is None or str(file) == "-":
+        lines: Iterable[str] = sys.stdin
+    else:
+        lines = file.read_text(encoding="utf8").splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.lstrip().startswith("#")]
+
+
+async def fetch_location(client: AsyncClient, query: str, current: bool, forecast: bool) -> BatchResult:
+    result = BatchResult(query=query)
+    try:
+        location = parse_location_query(query)
+        if isinstance(location, str):
+            locs = await client.locations_by_name(location)
+            if not locs:
+                result.error = f"Location '{location}' couldn't be found."
+                return result
+            lat, lon = locs[0].lat, locs[0].lon
+        else:
+            lat, lon = location
+        fetches = []
+        if current:
+            fetches.append(client.current_weather(lat=lat, lon=lon))
+        if forecast:
+            fetches.append(client.weather_forecast(lat=lat, lon=lon))
+        fetched = list(await asyncio.gather(*fetches))
+        if current:
+            result.current = fetched.pop(0)
+        if forecast:
+            result.forecast = fetched.pop(0)
+    except (BadRequest, CircuitOpen, RateLimited, RequestException) as exc:
+        result.error = error_message(exc)
+    return result
+
+
+async def iter_batch(
+    queries: list[str], client: AsyncClient, current: bool = True, forecast: bool = False
+) -> AsyncIterator[BatchResult]:
+    """Fetches all locations concurrently and yields results in order of completion."""
+    tasks = [asyncio.create_task(fetch_location(client, query, current, forecast)) for query in queries]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        for task in tasks:
+            task.cancel()
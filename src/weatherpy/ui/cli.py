@@ -1,14 +1,112 @@
-from typing import Literal, Optional, Union
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Annotated, Callable, Literal, Optional, Union
 
 import cyclopts
+from cyclopts import Group, Parameter
 
-from weatherpy.api.comm import get_current_weather, get_locations_by_name, get_weather_forecast
-from weatherpy.api.exceptions import BadRequest
-from weatherpy.presenter.current import show_current_weather
-from weatherpy.presenter.forecast import show_forecast
-from weatherpy.ui.config import create_cfg_file, display_config, handle_config
+if TYPE_CHECKING:
+    from requests import Response
+
+    from weatherpy.api.exceptions import BadRequest
+    from weatherpy.ui.snapshot import ConfigData
+
+# Commands import their dependencies when they run, so that e.g. showing the current weather never loads the plots,
+# ip2geotools or asyncio. Keep module-level imports here limited to what every invocation needs.
 
 app = cyclopts.App(help="Weather forecast in your command line.")
+app.meta.group_parameters = Group("Session Parameters", sort_key=0)
+
+# "rich" renders tables and plots; the others write rows (see weatherpy.ui.output) without importing rich.
+OutputFormat = Literal["rich", "json", "ndjson", "csv"]
+
+
+def _request_for(format: OutputFormat) -> Callable[[str], "Response"]:
+    if format == "rich":
+        from weatherpy.api.comm import handle_request
+
+        return handle_request
+    from weatherpy.ui.output import request_or_fail
+
+    return request_or_fail
+
+
+def _error(message: str, format: OutputFormat = "rich") -> None:
+    """Prints an error; for machine-readable formats it goes to stderr and the exit status is 1."""
+    if format == "rich":
+        print(message)
+        return
+    from weatherpy.ui.output import fail
+
+    fail(message)
+
+
+def _request_error(exc: "BadRequest", token: str, format: OutputFormat = "rich") -> None:
+    """Reports a failed request like `_error`; a token the API rejected is validated again before it is trusted."""
+    from weatherpy.ui.snapshot import forget_rejected_token
+
+    forget_rejected_token(exc, token)
+    _error(str(exc), format)
+
+
+def _resolve_coords(
+    config: "ConfigData",
+    city: Optional[list[str]],
+    coords: Optional[tuple[float, float]],
+    format: OutputFormat = "rich",
+) -> Optional[tuple[float, float]]:
+    """Returns coordinates of the requested city, the given coordinates or the home location from the config."""
+    from weatherpy.api.comm import get_locations_by_name
+
+    if city:
+        name = " ".join(city).title()
+        locs = get_locations_by_name(name=name, token=config["SETTINGS"]["token"], request=_request_for(format))
+        if not locs:
+            _error(f"Location '{name}' couldn't be found.", format)
+            return None
+        return locs[0].lat, locs[0].lon
+    if coords:
+        return coords
+    return float(config["HOME"]["lat"]), float(config["HOME"]["lon"])
+
+
+def _show_last_known(
+    lat: float,
+    lon: float,
+    token: str,
+    endpoints: tuple[str, ...],
+    units: str,
+    format: OutputFormat,
+    daily: bool = False,
+) -> bool:
+    """Shows cached data right away and refreshes it in the background; False if nothing is cached yet."""
+    from weatherpy.ui.stale import Revalidator, show_last_known
+
+    return show_last_known(Revalidator(lat, lon, token, endpoints), units, format, daily=daily)
+
+
+@app.meta.default
+def main(
+    *tokens: Annotated[str, Parameter(show=False, allow_leading_hyphen=True)],
+    profile: Annotated[
+        Optional[str],
+        Parameter(
+            help="Write a JSON trace of timed phases (config, requests, decoding, parsing, rendering) to the given "
+            "file, or to stderr if it is '-'.",
+            allow_leading_hyphen=True,
+        ),
+    ] = None,
+):
+    if profile is None:
+        return app(tokens)
+
+    from weatherpy import profiling
+
+    profiling.enable()
+    try:
+        return app(tokens)
+    finally:
+        profiling.write_trace(profile)
 
 
 @app.default
@@ -16,43 +114,76 @@ def wthr(
     city: Optional[list[str]] = None,
     coords: Optional[tuple[float, float]] = None,
     units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    cache: bool = True,
+    refresh: bool = False,
+    format: OutputFormat = "rich",
+    stale: bool = False,
 ):
     """Shows the current weather parameters based on default settings from the
     configuration file (if no arguments are provided).
     Settings can be optionally overridden using arguments provided to this command.
-    If configuration file is not found, user is first led by the program through configuration step."""
+    If configuration file is not found, user is first led by the program through configuration step.
+    Responses are cached for a few minutes; use --refresh to fetch fresh data or --no-cache to bypass the cache.
+    --format json, ndjson or csv writes the data as machine-readable rows instead; errors then go to stderr.
+    --stale shows the last-known data at once, marked with its age, and refreshes it in the background: in a
+    terminal the display is updated in place, otherwise the output ends right away and the refreshed data is kept
+    for the next call."""
+    from weatherpy.api.comm import get_current_weather
+    from weatherpy.api.exceptions import BadRequest
+    from weatherpy.ui.snapshot import handle_config
+
     config = handle_config()
     api_token = config["SETTINGS"]["token"]
 
-    if city:
-        locs = get_locations_by_name(name=" ".join(city).title(), token=api_token)
-        if not locs:
-            print(f"Location '{' '.join(city).title()}' couldn't be found.")
-            return
-        loc = locs[0]
-        lat, lon = loc.lat, loc.lon
-
-    elif not coords:
-        lat = float(config["HOME"]["lat"])
-        lon = float(config["HOME"]["lon"])
-    else:
-        lat, lon = coords
+    location = _resolve_coords(config, city, coords, format)
+    if location is None:
+        return
+    lat, lon = location
 
     if not units:
         units = config["SETTINGS"]["units"]
+    if stale and cache and _show_last_known(lat, lon, api_token, ("weather",), units, format):
+        return
 
     try:
-        curr = get_current_weather(lat=lat, lon=lon, units=units, token=api_token)
+        curr = get_current_weather(
+            lat=lat,
+            lon=lon,
+            token=api_token,
+            use_cache=cache,
+            refresh=refresh,
+            request=_request_for(format),
+        )
     except BadRequest as exc:
-        print(exc)
+        _request_error(exc, api_token, format)
+        return
+    if format != "rich":
+        from weatherpy.ui.output import create_writer, current_row
+
+        with create_writer(format) as writer:
+            writer.write([current_row(curr, units)])
         return
+
+    from weatherpy.presenter.current import show_current_weather
+
     show_current_weather(weather_data=curr, units=units)
 
 
 @app.command
-def config(display: Optional[bool] = False):
-    """Lets user overwrite the configuration file or display it."""
-    if display:
+def config(display: Optional[bool] = False, ip_database: Optional[Path] = None, city_list: Optional[Path] = None):
+    """Lets user overwrite the configuration file or display it.
+
+    --ip-database imports a CSV of IP ranges (e.g. DB-IP "IP to City Lite") used to determine your location offline.
+    --city-list imports a list of cities (OpenWeather's city.list.json.gz or a GeoNames dump like cities500.txt)
+    used to resolve city names offline."""
+    from weatherpy.ui.config import create_cfg_file, display_config, import_city_list, import_ip_database
+
+    if ip_database or city_list:
+        if ip_database:
+            import_ip_database(ip_database)
+        if city_list:
+            import_city_list(city_list)
+    elif display:
         display_config()
     else:
         _ = create_cfg_file()
@@ -63,31 +194,428 @@ def forecast(
     city: Optional[list[str]] = None,
     coords: Optional[tuple[float, float]] = None,
     units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    cache: bool = True,
+    refresh: bool = False,
+    daily: bool = False,
+    format: OutputFormat = "rich",
+    stale: bool = False,
 ):
-    """Shows weather forecast for the next 5 days in 3-hour intervals."""
+    """Shows weather forecast for the next 5 days in 3-hour intervals.
+
+    --daily shows a compact table with the temperature range and mean, precipitation totals and the dominant wind
+    of each day instead, with days in the location's time zone.
+    Responses are cached for a few minutes; use --refresh to fetch fresh data or --no-cache to bypass the cache.
+    --format json, ndjson or csv writes one row per forecast slot (or per day with --daily) instead.
+    --stale shows the last-known forecast at once and refreshes it in the background, like it does for wthr."""
+    from weatherpy.api.comm import get_weather_forecast
+    from weatherpy.api.exceptions import BadRequest
+    from weatherpy.ui.snapshot import handle_config
+
     config = handle_config()
     api_token = config["SETTINGS"]["token"]
 
-    if city:
-        locs = get_locations_by_name(name=" ".join(city).title(), token=api_token)
-        if not locs:
-            print(f"Location '{' '.join(city).title()}' couldn't be found.")
-            return
-        loc = locs[0]
-        lat, lon = loc.lat, loc.lon
-
-    elif not coords:
-        lat = float(config["HOME"]["lat"])
-        lon = float(config["HOME"]["lon"])
+    location = _resolve_coords(config, city, coords, format)
+    if location is None:
+        return
+    lat, lon = location
+
+    if not units:
+        units = config["SETTINGS"]["units"]
+    if stale and cache and _show_last_known(lat, lon, api_token, ("forecast",), units, format, daily=daily):
+        return
+
+    try:
+        forecast = get_weather_forecast(
+            lat=lat,
+            lon=lon,
+            token=api_token,
+            use_cache=cache,
+            refresh=refresh,
+            request=_request_for(format),
+        )
+    except BadRequest as exc:
+        _request_error(exc, api_token, format)
+        return
+    if format != "rich":
+        from weatherpy.api.daily import summarize_days
+        from weatherpy.ui.output import DAILY_FIELDS, FIELDS, create_writer, daily_rows, forecast_rows
+
+        with create_writer(format, DAILY_FIELDS if daily else FIELDS) as writer:
+            writer.write(daily_rows(summarize_days(forecast), units) if daily else forecast_rows(forecast, units))
+        return
+    if daily:
+        from weatherpy.presenter.daily import show_daily_forecast
+
+        show_daily_forecast([forecast], units)
+        return
+
+    from weatherpy.presenter.forecast import show_forecast
+
+    show_forecast(forecast, units)
+
+
+@app.command
+def batch(
+    file: Optional[Path] = None,
+    current: bool = True,
+    forecast: bool = False,
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    concurrency: int = 8,
+    cache: bool = True,
+    refresh: bool = False,
+    daily: bool = False,
+    format: OutputFormat = "rich",
+):
+    """Shows weather for many locations at once.
+
+    Locations (city names or lat,lon pairs, one per line) are read from a file or from standard input and fetched
+    concurrently; results are shown as soon as they arrive. --daily fetches forecasts and shows the daily roll-up
+    of all locations in one table once every location has been fetched.
+    --format json, ndjson or csv streams rows as results arrive instead, each with the location's input line as
+    'query'; locations that failed get a row of kind 'error'."""
+    import asyncio
+
+    from weatherpy.api.aio import AsyncClient
+    from weatherpy.api.models import Forecast
+    from weatherpy.ui.batch import iter_batch, read_locations
+    from weatherpy.ui.snapshot import handle_config
+
+    config = handle_config()
+    api_token = config["SETTINGS"]["token"]
+    if not units:
+        units = config["SETTINGS"]["units"]
+    queries = read_locations(file)
+    if format != "rich":
+        from weatherpy.ui.output import BATCH_DAILY_FIELDS, DAILY_FIELDS, FIELDS, batch_rows, create_writer
+
+        fields = (BATCH_DAILY_FIELDS if current else DAILY_FIELDS) if daily else FIELDS
+        writer = create_writer(format, fields)
     else:
-        lat, lon = coords
+        from weatherpy.presenter.current import show_current_weather
+
+        if daily:
+            from weatherpy.presenter.daily import show_daily_forecast
+        elif forecast:
+            from weatherpy.presenter.forecast import show_forecast
+    forecasts: dict[str, Forecast] = {}
+
+    async def run() -> None:
+        async with AsyncClient(
+            token=api_token, concurrency=max(1, concurrency), use_cache=cache, refresh=refresh
+        ) as client:
+            async for result in iter_batch(queries, client, current=current, forecast=forecast or daily):
+                if format != "rich":
+                    writer.write(batch_rows(result, units, daily=daily))
+                    continue
+                if result.error:
+                    print(f"{result.query}: {result.error}")
+                    continue
+                if result.current:
+                    show_current_weather(weather_data=result.current, units=units)
+                if result.forecast and daily:
+                    forecasts[result.query] = result.forecast
+                elif result.forecast:
+                    show_forecast(result.forecast, units)
+
+    if format != "rich":
+        with writer:
+            asyncio.run(run())
+        return
+    asyncio.run(run())
+    if forecasts:
+        # Keep the input order rather than the order of arrival.
+        show_daily_forecast([forecasts[query] for query in queries if query in forecasts], units)
+
+
+@app.command
+def sweep(
+    south: float,
+    west: float,
+    north: float,
+    east: float,
+    step: float,
+    forecast: bool = True,
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    concurrency: int = 8,
+    budget: Optional[int] = None,
+    checkpoint: Optional[Path] = None,
+    cache: bool = True,
+):
+    """Fetches weather for a grid of points covering a bounding box and writes NDJSON records as they arrive.
+
+    Points are spaced --step degrees apart. Points that resolve to an OpenWeather city already swept are written as
+    'duplicate' records and their forecast isn't fetched. At most --concurrency requests are in flight and at most
+    --budget requests are sent. With --checkpoint, finished points are recorded in the given file and skipped when the
+    same sweep is run again, so an interrupted sweep can be resumed (append its output to the earlier output)."""
+    import asyncio
+
+    from weatherpy.api.aio import AsyncClient
+    from weatherpy.ui.output import create_writer, fail
+    from weatherpy.ui.snapshot import handle_config
+    from weatherpy.ui.sweep import SWEEP_FIELDS, SweepCheckpoint, grid_points, iter_sweep, sweep_rows
+
+    try:
+        points = grid_points(south, west, north, east, step)
+        progress = SweepCheckpoint(checkpoint, grid=(south, west, north, east, step)) if checkpoint else None
+        if progress is not None:
+            progress.load()
+    except (OSError, ValueError) as exc:
+        fail(str(exc))
+
+    config = handle_config()
+    if not units:
+        units = config["SETTINGS"]["units"]
+    client = AsyncClient(
+        token=config["SETTINGS"]["token"],
+        concurrency=max(1, concurrency),
+        use_cache=cache,
+        budget=budget,
+    )
+    done = progress.done if progress else set()
+    counts = {"fetched": 0, "failed": 0}
+
+    async def run() -> None:
+        async with client:
+            stations = progress.stations if progress else None
+            async for result in iter_sweep(points, client, forecast=forecast, done=done, stations=stations):
+                writer.write(sweep_rows(result, units))
+                counts["failed" if result.error else "fetched"] += 1
+                if progress is not None and not result.error:
+                    progress.record(result)
+
+    skipped = len(done)
+    with create_writer("ndjson", SWEEP_FIELDS) as writer:
+        asyncio.run(run())
+
+    print(
+        f"{counts['fetched']} of {len(points)} points fetched ({skipped} skipped, {counts['failed']} failed) "
+        f"with {client.requests_sent} requests.",
+        file=sys.stderr,
+    )
+    if skipped + counts["fetched"] < len(points) and checkpoint:
+        print(f"Run the same command again to resume from {checkpoint}.", file=sys.stderr)
+
+
+@app.command
+def dashboard(
+    city: Optional[list[str]] = None,
+    coords: Optional[tuple[float, float]] = None,
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    cache: bool = True,
+    refresh: bool = False,
+    format: OutputFormat = "rich",
+    stale: bool = False,
+):
+    """Shows the current weather above the forecast.
+
+    The location is geocoded once and both are fetched concurrently. --format json, ndjson or csv writes the
+    current weather row followed by the forecast rows instead. --stale shows the last-known data at once and refreshes
+    it in the background, like it does for wthr."""
+    from weatherpy.api.comm import get_current_and_forecast
+    from weatherpy.api.exceptions import BadRequest
+    from weatherpy.ui.snapshot import handle_config
 
+    config = handle_config()
+    location = _resolve_coords(config, city, coords, format)
+    if location is None:
+        return
+    lat, lon = location
     if not units:
         units = config["SETTINGS"]["units"]
+    token = config["SETTINGS"]["token"]
+    if stale and cache and _show_last_known(lat, lon, token, ("weather", "forecast"), units, format):
+        return
 
     try:
-        forecast = get_weather_forecast(lat=lat, lon=lon, units=units, token=api_token)
+        curr, forecast = get_current_and_forecast(
+            lat=lat,
+            lon=lon,
+            token=token,
+            use_cache=cache,
+            refresh=refresh,
+            request=_request_for(format),
+        )
     except BadRequest as exc:
-        print(exc)
+        _request_error(exc, token, format)
         return
+    if format != "rich":
+        from weatherpy.ui.output import create_writer, current_row, forecast_rows
+
+        with create_writer(format) as writer:
+            writer.write([current_row(curr, units)])
+            writer.write(forecast_rows(forecast, units))
+        return
+
+    from weatherpy.presenter.current import show_current_weather
+    from weatherpy.presenter.forecast import show_forecast
+
+    show_current_weather(weather_data=curr, units=units)
     show_forecast(forecast, units)
+
+
+@app.command
+def watch(
+    city: Optional[list[str]] = None,
+    coords: Optional[tuple[float, float]] = None,
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    interval: Optional[float] = None,
+):
+    """Keeps the current weather and the forecast on screen, updating them as new data is published.
+
+    Current weather is polled every 10 minutes and the forecast every 30 minutes, matching how often OpenWeather
+    updates them; --interval (at least 60 seconds) polls current weather more often. Panels are redrawn only when
+    their data changed."""
+    from weatherpy.api.cache import TTL
+    from weatherpy.ui.snapshot import handle_config
+    from weatherpy.ui.watch import Watcher, run_watch
+
+    config = handle_config()
+    location = _resolve_coords(config, city, coords)
+    if location is None:
+        return
+    lat, lon = location
+    if not units:
+        units = config["SETTINGS"]["units"]
+
+    watcher = Watcher(
+        lat=lat,
+        lon=lon,
+        units=units,
+        token=config["SETTINGS"]["token"],
+        current_interval=interval or TTL["weather"],
+    )
+    try:
+        run_watch(watcher)
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command
+def daemon(status: bool = False):
+    """Runs a local daemon that caches API responses for every weatherpy process on this machine.
+
+    While it runs, other wthr commands fetch through it automatically: identical requests made at the same time are
+    answered by one upstream call, and responses are reused for as long as the response cache keeps them (--refresh
+    and --no-cache only apply to local caches). Requires Unix domain sockets. --status shows the counters of the
+    running daemon."""
+    from weatherpy.api.daemon import daemon_stats, daemon_supported, serve
+    from weatherpy.paths import DAEMON_SOCKET
+
+    if not daemon_supported():
+        print("The daemon requires Unix domain sockets, which are not available on this platform.")
+        return
+    stats = daemon_stats()
+    if status or stats is not None:
+        if stats is None:
+            print("The daemon is not running.")
+        else:
+            counters = ", ".join(f"{name}: {count}" for name, count in stats["stats"].items())
+            print(f"The daemon is running on {DAEMON_SOCKET} ({counters}, cached entries: {stats['entries']}).")
+        return
+
+    import signal
+
+    # Stopping the daemon with SIGTERM should remove its socket just like Ctrl+C does.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Serving cached API responses on {DAEMON_SOCKET}. Press Ctrl+C to stop.")
+    try:
+        serve()
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"The daemon couldn't be started: {exc}")
+
+
+@app.command
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+    cache: bool = True,
+):
+    """Serves current weather, forecasts and geocoding as JSON over HTTP, for apps that would otherwise run wthr.
+
+    GET /current and /forecast take either lat and lon or city, and optionally units (default from the settings);
+    /forecast?daily=1 returns daily summaries. Rows have the same fields as --format json. GET /geocode takes q or lat
+    and lon. GET /health and /stats report the state of the service. Results are kept in memory for as long as the
+    response cache keeps them, and concurrent requests for the same data share one upstream call. Failures are
+    answered with an error status and an {"error": ...} body; they never stop the service."""
+    import signal
+
+    from weatherpy.ui.server import WeatherService, create_server
+    from weatherpy.ui.snapshot import handle_config
+
+    config = handle_config()
+    service = WeatherService(
+        token=config["SETTINGS"]["token"], units=units or config["SETTINGS"]["units"], use_cache=cache
+    )
+    try:
+        server = create_server(service, host=host, port=port)
+    except OSError as exc:
+        print(f"The server couldn't be started: {exc}")
+        return
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    print(f"Serving weather data on http://{host}:{server.server_port}. Press Ctrl+C to stop.")
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+@app.command
+def history(
+    city: Optional[list[str]] = None,
+    coords: Optional[tuple[float, float]] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    kind: Literal["all", "current", "forecast"] = "all",
+    units: Optional[Union[str, Literal["metric", "imperial", "standard"]]] = None,
+):
+    """Shows stored observations and forecasts for a location.
+
+    Every fetched current weather and forecast is stored locally. --since and --until take ISO dates or times
+    (e.g. 2024-05-01 or 2024-05-01T12:00, local time) and default to the last day and the next five days, so that
+    past observations can be compared with what was forecast for them."""
+    from datetime import datetime, timedelta
+
+    from weatherpy.api.history import CURRENT, FORECAST, get_history_store
+    from weatherpy.presenter.history import show_history
+    from weatherpy.ui.snapshot import handle_config
+
+    try:
+        start = datetime.fromisoformat(since) if since else datetime.now() - timedelta(days=1)
+        end = datetime.fromisoformat(until) if until else datetime.now() + timedelta(days=5)
+    except ValueError as exc:
+        print(f"Invalid date: {exc}")
+        return
+
+    config = handle_config()
+    location = _resolve_coords(config, city, coords)
+    if location is None:
+        return
+    lat, lon = location
+
+    if not units:
+        units = config["SETTINGS"]["units"]
+
+    kinds = {"all": None, "current": CURRENT, "forecast": FORECAST}
+    records = get_history_store().query(lat, lon, start.timestamp(), end.timestamp(), kind=kinds[kind])
+    show_history(
+        records, units, title=f"Weather history for {lat:.2f}, {lon:.2f} ({start:%b %d %H:%M} - {end:%b %d %H:%M})"
+    )
+
+
+@app.command
+def cities(prefix: str, limit: int = 10):
+    """Lists cities whose names start with the given prefix, using the city list imported with --city-list.
+
+    Case and accents are ignored; the most populous cities are listed first when the list has population figures."""
+    from weatherpy.api.citydb import get_city_index
+
+    index = get_city_index()
+    if index is None:
+        print("No city list has been imported. Use 'wthr config --city-list FILE' to import one.")
+        return
+    for loc in index.complete(prefix, limit=max(1, limit)):
+        print(loc)
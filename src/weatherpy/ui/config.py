@@ -3,16 +3,18 @@ from configparser import ConfigParser
 from pathlib import Path
 from typing import Optional
 
-from ip2geotools.databases.noncommercial import DbIpCity
 from rich import print
 from rich.pretty import pprint
 from rich.prompt import Confirm, IntPrompt, Prompt
 
 from weatherpy.api.comm import api_token_valid, get_ip_address, get_locations_by_coords, get_locations_by_name
 from weatherpy.api.models import Geolocation
+from weatherpy.paths import HOME_DIR
+
+from .snapshot import CFG_FILENAME, get_config_snapshot, get_token_validations
+from .snapshot import geo_coords_valid as geo_coords_valid
+from .snapshot import handle_config as handle_config
 
-CFG_FILENAME: str = "weatherpy.cfg"
-HOME_DIR: Path = Path.home() / "weatherpy"
 TOKEN_PATTERN: str = "^[a-z0-9]{32}$"
 
 OPEN_WEATHER_LOGIN_URL: str = "https://home.openweathermap.org/users/sign_up"
@@ -21,10 +23,8 @@ OPEN_WEATHER_API_KEY_ERROR_URL: str = "https://openweathermap.org/faq#error401"
 
 def read_cfg_file() -> ConfigParser:
     config = ConfigParser()
-    try:
-        config.read_file(open(HOME_DIR / CFG_FILENAME))
-    except FileNotFoundError as exc:
-        raise exc
+    with open(HOME_DIR / CFG_FILENAME, encoding="utf8") as file:
+        config.read_file(file)
     return config
 
 
@@ -41,12 +41,16 @@ def set_api_key() -> str:
         if not is_api_token_format_valid(token):
             print("[bold red blink]Incorrect API key format.[/] [cyan]Please check if it was pasted correctly.[/]")
             continue
+        validations = get_token_validations()
+        if validations.is_validated(token):
+            return token
         if not api_token_valid(token):
             print(
                 "[bold red blink]Invalid API key.[/] [cyan]Please see "
                 f"[underline]{OPEN_WEATHER_API_KEY_ERROR_URL}[/underline] for more info.[/]"
             )
             continue
+        validations.record(token)
         return token
 
 
@@ -145,18 +149,19 @@ def set_location_by_coords(api_token: str) -> Geolocation:
             return choice
 
 
-def geo_coords_valid(loc: tuple[str, str]) -> bool:
-    try:
-        loc2 = (float(loc[0]), float(loc[1]))
-    except (ValueError, TypeError):
-        return False
-    return -90 <= loc2[0] <= 90 and -180 <= loc2[1] <= 180
-
-
 def determine_location_based_on_ip(api_token: str) -> tuple[str, Optional[Geolocation]]:
+    from weatherpy.api.ipdb import lookup_ip_location
+
     ip = get_ip_address()
-    response = DbIpCity.get(ip_address=ip, api_key="free")
-    lat, lon = float(str(response.latitude)), float(str(response.longitude))
+    coords = lookup_ip_location(ip)
+    if coords is None:
+        # No local IP database (or no matching range): fall back to the remote lookup. ip2geotools is slow to
+        # import and only needed here.
+        from ip2geotools.databases.noncommercial import DbIpCity
+
+        response = DbIpCity.get(ip_address=ip, api_key="free")
+        coords = float(str(response.latitude)), float(str(response.longitude))
+    lat, lon = coords
     locs = get_locations_by_coords(lat, lon, token=api_token)
     return (ip, locs[0]) if locs else (ip, None)
 
@@ -209,16 +214,30 @@ def create_cfg_file() -> ConfigParser:
         Path(HOME_DIR).mkdir(exist_ok=False)
     with Path.open(HOME_DIR / CFG_FILENAME, mode="w", encoding="utf8") as file:
         config.write(file)
+    get_config_snapshot().store({section: dict(config[section]) for section in config.sections()})
     return config
 
 
-def handle_config() -> ConfigParser:
+def import_ip_database(source: Path) -> None:
+    from weatherpy.api.ipdb import build_ip_database
+
     try:
-        config = read_cfg_file()
-    except FileNotFoundError:
-        print("[bold blue]Settings file not found. Creating configuration...[/]")
-        config = create_cfg_file()
-    return config
+        count = build_ip_database(source)
+    except (OSError, UnicodeDecodeError) as exc:
+        print(f"[bold red]IP database couldn't be imported:[/] {exc}")
+        return
+    print(f"[green]Imported {count} IPv4 ranges. Your location will be determined locally during configuration.[/]")
+
+
+def import_city_list(source: Path) -> None:
+    from weatherpy.api.citydb import build_city_index
+
+    try:
+        count = build_city_index(source)
+    except (OSError, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        print(f"[bold red]City list couldn't be imported:[/] {exc}")
+        return
+    print(f"[green]Imported {count} cities. City names will be resolved locally where possible.[/]")
 
 
 def display_config() -> None:
@@ -0,0 +1,289 @@
+import abc
+import json
+import os
+import sys
+from datetime import datetime
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, NoReturn, Optional
+
+from weatherpy.api.daily import DailySummary, summarize_days
+from weatherpy.api.models import Current, Description, Forecast, Geolocation
+from weatherpy.api.units import conversion, convert, convert_column
+
+if TYPE_CHECKING:
+    from requests import Response
+
+    from weatherpy.ui.batch import BatchResult
+
+# Machine-readable output bypasses the presenter, so nothing in this module may import rich.
+
+Row = dict[str, object]
+
+# Values are converted to the requested units: K, m/s and hPa for standard, °C, km/h and hPa for metric, °F, mph and
+# inHg for imperial. `rain` and `snow` hold mm in the last hour for current weather and in the 3 hours before the slot
+# for forecasts.
+FIELDS: tuple[str, ...] = (
+    "query",
+    "kind",
+    "name",
+    "country",
+    "lat",
+    "lon",
+    "dt",
+    "sunrise",
+    "sunset",
+    "description",
+    "icon",
+    "temp",
+    "temp_feel",
+    "pressure",
+    "humidity",
+    "wind_spd",
+    "wind_deg",
+    "rain",
+    "snow",
+    "units",
+    "error",
+)
+DAILY_FIELDS: tuple[str, ...] = (
+    "query",
+    "kind",
+    "name",
+    "country",
+    "lat",
+    "lon",
+    "day",
+    "slots",
+    "description",
+    "icon",
+    "temp_min",
+    "temp_max",
+    "temp_mean",
+    "rain",
+    "snow",
+    "wind_max",
+    "wind_deg",
+    "units",
+    "error",
+)
+# Batch runs may mix current weather and daily summaries.
+BATCH_DAILY_FIELDS: tuple[str, ...] = FIELDS + tuple(field for field in DAILY_FIELDS if field not in FIELDS)
+
+
+def _timestamp(dt: datetime) -> str:
+    return dt.astimezone().isoformat(timespec="seconds")
+
+
+def _location(loc: Geolocation, query: Optional[str], kind: str, units: str) -> Row:
+    return {
+        "query": query,
+        "kind": kind,
+        "name": loc.name,
+        "country": loc.country,
+        "lat": loc.lat,
+        "lon": loc.lon,
+        "units": units,
+    }
+
+
+def _description(description: Description) -> dict[str, str]:
+    return {
+        "description": "; ".join(desc for desc, _ in description),
+        "icon": "; ".join(icon for _, icon in description),
+    }
+
+
+def current_row(current: Current, units: str, query: Optional[str] = None) -> Row:
+    weather = current.weather
+    return {
+        **_location(current.loc, query, "current", units),
+        "dt": _timestamp(current.dt),
+        "sunrise": _timestamp(current.sunrise),
+        "sunset": _timestamp(current.sunset),
+        **_description(weather.description),
+        "temp": round(convert(weather.temp, "temp", units), 2),
+        "temp_feel": round(convert(weather.temp_feel, "temp", units), 2),
+        "pressure": round(convert(weather.pressure, "pressure", units), 2),
+        "humidity": weather.humidity,
+        "wind_spd": round(convert(weather.wind_spd, "wind", units), 2),
+        "wind_deg": weather.wind_deg,
+        "rain": weather.rain.get("1h", 0),
+        "snow": weather.snow.get("1h", 0),
+    }
+
+
+def forecast_rows(forecast: Forecast, units: str, query: Optional[str] = None) -> Iterator[Row]:
+    """Yields one row per forecast slot, read straight from the forecast's columns, each converted at once."""
+    base = _location(forecast.loc, query, "forecast", units)
+    temp = convert_column(forecast.temp, "temp", units)
+    temp_feel = convert_column(forecast.temp_feel, "temp", units)
+    pressure = convert_column(forecast.pressure, "pressure", units)
+    wind_spd = convert_column(forecast.wind_spd, "wind", units)
+    for i, dt in enumerate(forecast.dt):
+        yield {
+            **base,
+            "dt": _timestamp(datetime.fromtimestamp(dt)),
+            **_description(forecast.description[i]),
+            "temp": round(temp[i], 2),
+            "temp_feel": round(temp_feel[i], 2),
+            "pressure": round(pressure[i], 2),
+            "humidity": forecast.humidity[i],
+            "wind_spd": round(wind_spd[i], 2),
+            "wind_deg": forecast.wind_deg[i],
+            "rain": forecast.rain[i],
+            "snow": forecast.snow[i],
+        }
+
+
+def daily_rows(summaries: Iterable[DailySummary], units: str, query: Optional[str] = None) -> Iterator[Row]:
+    scale, offset = conversion("temp", units)
+    for day in summaries:
+        yield {
+            **_location(day.loc, query, "daily", units),
+            "day": day.day.isoformat(),
+            "slots": day.slots,
+            **_description(day.description),
+            "temp_min": round(day.temp_min * scale + offset, 2),
+            "temp_max": round(day.temp_max * scale + offset, 2),
+            "temp_mean": round(day.temp_mean * scale + offset, 2),
+            "rain": round(day.rain, 2),
+            "snow": round(day.snow, 2),
+            "wind_max": round(convert(day.wind_max, "wind", units), 2),
+            "wind_deg": day.wind_deg,
+        }
+
+
+def location_row(loc: Geolocation) -> Row:
+    return {"name": loc.name, "state": loc.state, "country": loc.country, "lat": loc.lat, "lon": loc.lon}
+
+
+def error_row(query: str, error: str) -> Row:
+    return {"query": query, "kind": "error", "error": error}
+
+
+def batch_rows(result: "BatchResult", units: str, daily: bool = False) -> Iterator[Row]:
+    if result.error:
+        yield error_row(result.query, result.error)
+        return
+    if result.current:
+        yield current_row(result.current, units, query=result.query)
+    if result.forecast and daily:
+        yield from daily_rows(summarize_days(result.forecast), units, query=result.query)
+    elif result.forecast:
+        yield from forecast_rows(result.forecast, units, query=result.query)
+
+
+def _stdout_closed() -> NoReturn:
+    """Silences the rest of the output once the reader of stdout (e.g. `head`) has gone away."""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    sys.exit(1)
+
+
+class RowWriter(abc.ABC):
+    """
+    Writes rows incrementally, flushing after every batch so that consumers see results as they arrive.
+
+    Every row is written with the same fields, in order; fields a row doesn't have are empty (null in JSON).
+
+    Args:
+        stream (IO[str]): Where to write.
+        fields (tuple[str, ...]): The fields of every row.
+    """
+
+    def __init__(self, stream: IO[str], fields: tuple[str, ...] = FIELDS):
+        self.stream = stream
+        self.fields = fields
+
+    @abc.abstractmethod
+    def _write(self, row: Row) -> None:
+        """Writes a single row, without flushing."""
+
+    def write(self, rows: Iterable[Row]) -> None:
+        try:
+            for row in rows:
+                self._write(row)
+            self.stream.flush()
+        except BrokenPipeError:
+            _stdout_closed()
+
+    def close(self) -> None:
+        try:
+            self.stream.flush()
+        except BrokenPipeError:
+            _stdout_closed()
+
+    def __enter__(self) -> "RowWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class NdjsonWriter(RowWriter):
+    """Writes one JSON object per line."""
+
+    def _write(self, row: Row) -> None:
+        self.stream.write(json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False) + "\n")
+
+
+class JsonWriter(RowWriter):
+    """Writes a JSON array, one element per line; the array is closed by `close`."""
+
+    def __init__(self, stream: IO[str], fields: tuple[str, ...] = FIELDS):
+        super().__init__(stream, fields)
+        self._separator = "[\n"
+
+    def _write(self, row: Row) -> None:
+        self.stream.write(
+            self._separator + json.dumps({field: row.get(field) for field in self.fields}, ensure_ascii=False)
+        )
+        self._separator = ",\n"
+
+    def close(self) -> None:
+        try:
+            self.stream.write("[]\n" if self._separator == "[\n" else "\n]\n")
+        except BrokenPipeError:
+            _stdout_closed()
+        super().close()
+
+
+class CsvWriter(RowWriter):
+    """Writes CSV with a header line."""
+
+    def __init__(self, stream: IO[str], fields: tuple[str, ...] = FIELDS):
+        import csv
+
+        super().__init__(stream, fields)
+        self._writer = csv.DictWriter(stream, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+        self._writer.writeheader()
+
+    def _write(self, row: Row) -> None:
+        self._writer.writerow(row)
+
+
+WRITERS: dict[str, type[RowWriter]] = {"json": JsonWriter, "ndjson": NdjsonWriter, "csv": CsvWriter}
+
+
+def create_writer(fmt: str, fields: tuple[str, ...] = FIELDS, stream: Optional[IO[str]] = None) -> RowWriter:
+    return WRITERS[fmt](sys.stdout if stream is None else stream, fields)
+
+
+def fail(message: str) -> NoReturn:
+    """Reports an error on stderr, keeping stdout parseable, and exits with status 1."""
+    print(message, file=sys.stderr)
+    sys.exit(1)
+
+
+def request_or_fail(url: str) -> "Response":
+    """Sends a request like `weatherpy.api.comm.handle_request`, reporting errors with `fail` instead of rich."""
+    from requests.exceptions import RequestException
+
+    from weatherpy.api.comm import send_request
+    from weatherpy.api.exceptions import CircuitOpen, RateLimited
+
+    try:
+        return send_request(url=url)
+    except (RequestException, CircuitOpen):
+        fail("An error occurred. Please check your network connection and try again.")
+    except RateLimited as exc:
+        fail(f"{exc}.")
@@ -0,0 +1,249 @@
+import json
+import logging
+import threading
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.exceptions import RequestException
+
+from weatherpy.api.cache import TTL, MemoryCache, quantize
+from weatherpy.api.comm import (
+    error_message,
+    get_current_weather,
+    get_locations_by_coords,
+    get_locations_by_name,
+    get_weather_forecast,
+    redact_query,
+    request_or_raise,
+)
+from weatherpy.api.daily import summarize_days
+from weatherpy.api.exceptions import BadRequest, CircuitOpen, RateLimited
+from weatherpy.api.geostore import normalize_query
+from weatherpy.api.models import Current, Forecast, Geolocation
+from weatherpy.api.units import UNIT_SYSTEMS
+from weatherpy.ui.output import current_row, daily_rows, forecast_rows, location_row
+from weatherpy.ui.snapshot import geo_coords_valid
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+# A request handler waits this long for the rate limiter before answering 429, rather than holding the connection.
+MAX_WAIT: float = 5.0
+# Geocoding results practically never change; places that weren't found are looked up again sooner, in case the
+# geocoder was having trouble.
+GEOCODING_TTL: float = 24 * 3600
+GEOCODING_MISS_TTL: float = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+Reply = tuple[int, Any]
+
+
+def _geocoding_ttl(locs: list[Geolocation]) -> float:
+    return GEOCODING_TTL if locs else GEOCODING_MISS_TTL
+
+
+class QueryError(ValueError):
+    """Raised for requests with missing or invalid query parameters; answered with 400."""
+
+
+class NotFound(LookupError):
+    """Raised when a city or route doesn't exist; answered with 404."""
+
+
+class WeatherService:
+    """
+    Answers the JSON endpoints of `wthr serve`, independently of HTTP.
+
+    Parsed weather and geocoding results are kept in one in-memory LRU cache shared by all requests, in front of the
+    response cache and the geocoding store, and concurrent requests for the same data share one upstream call.
+    Upstream requests go through the shared transport and its connection pool. Errors are raised, never exited on.
+
+    Args:
+        token (str): OpenWeather API key.
+        units (str): Units used when a request doesn't ask for any.
+        use_cache (bool): Whether to use the response cache and the geocoding store behind the in-memory cache.
+        request (Callable[[str], Response]): Sends a request upstream and raises `BadRequest` for error responses.
+        cache (Optional[MemoryCache]): The in-memory cache, a new one if None.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        units: str = "metric",
+        use_cache: bool = True,
+        request: Callable[[str], Any] = partial(request_or_raise, max_wait=MAX_WAIT),
+        cache: Optional[MemoryCache] = None,
+    ):
+        self.token = token
+        self.units = units
+        self.use_cache = use_cache
+        self.cache = MemoryCache() if cache is None else cache
+        self._request = request
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self.counters = {"requests": 0, "upstream": 0, "errors": 0}
+        self.statuses: dict[int, int] = {}
+        self.routes: dict[str, Callable[[dict[str, str]], Any]] = {
+            "/current": self.current_endpoint,
+            "/forecast": self.forecast_endpoint,
+            "/geocode": self.geocode_endpoint,
+            "/health": self.health_endpoint,
+            "/stats": self.stats_endpoint,
+        }
+
+    def request(self, url: str) -> Any:
+        with self._lock:
+            self.counters["upstream"] += 1
+        return self._request(url)
+
+    def current(self, lat: float, lon: float) -> Current:
+        return self.cache.get_or_fetch(
+            ("weather", quantize(lat), quantize(lon)),
+            TTL["weather"],
+            lambda: get_current_weather(lat, lon, self.token, use_cache=self.use_cache, request=self.request),
+        )
+
+    def forecast(self, lat: float, lon: float) -> Forecast:
+        return self.cache.get_or_fetch(
+            ("forecast", quantize(lat), quantize(lon)),
+            TTL["forecast"],
+            lambda: get_weather_forecast(lat, lon, self.token, use_cache=self.use_cache, request=self.request),
+        )
+
+    def locations_by_name(self, name: str) -> list[Geolocation]:
+        return self.cache.get_or_fetch(
+            ("direct", normalize_query(name)),
+            _geocoding_ttl,
+            lambda: get_locations_by_name(name, self.token, use_cache=self.use_cache, request=self.request),
+        )
+
+    def locations_by_coords(self, lat: float, lon: float) -> list[Geolocation]:
+        return self.cache.get_or_fetch(
+            ("reverse", quantize(lat), quantize(lon)),
+            _geocoding_ttl,
+            lambda: get_locations_by_coords(lat, lon, self.token, use_cache=self.use_cache, request=self.request),
+        )
+
+    def units_param(self, params: dict[str, str]) -> str:
+        units = params.get("units", self.units)
+        if units not in UNIT_SYSTEMS:
+            raise QueryError(f"units should be one of {', '.join(UNIT_SYSTEMS)}")
+        return units
+
+    def coords_param(self, params: dict[str, str]) -> Optional[tuple[float, float]]:
+        if "lat" not in params and "lon" not in params:
+            return None
+        if not geo_coords_valid(loc=(params.get("lat", ""), params.get("lon", ""))):
+            raise QueryError("lat and lon should be valid coordinates")
+        return float(params["lat"]), float(params["lon"])
+
+    def location_param(self, params: dict[str, str]) -> tuple[float, float]:
+        """Returns the coordinates given as lat and lon, or those of the best match for the city given as city."""
+        coords = self.coords_param(params)
+        if coords is not None:
+            return coords
+        if not params.get("city", "").strip():
+            raise QueryError("either lat and lon or city is required")
+        locs = self.locations_by_name(params["city"])
+        if not locs:
+            raise NotFound(f"Location '{params['city']}' couldn't be found")
+        return locs[0].lat, locs[0].lon
+
+    def current_endpoint(self, params: dict[str, str]) -> Any:
+        units = self.units_param(params)
+        return current_row(self.current(*self.location_param(params)), units, query=params.get("city"))
+
+    def forecast_endpoint(self, params: dict[str, str]) -> Any:
+        units = self.units_param(params)
+        forecast = self.forecast(*self.location_param(params))
+        if params.get("daily", "").lower() in ("1", "true", "yes"):
+            return list(daily_rows(summarize_days(forecast), units, query=params.get("city")))
+        return list(forecast_rows(forecast, units, query=params.get("city")))
+
+    def geocode_endpoint(self, params: dict[str, str]) -> Any:
+        coords = self.coords_param(params)
+        if coords is not None:
+            locs = self.locations_by_coords(*coords)
+        elif params.get("q", "").strip():
+            locs = self.locations_by_name(params["q"])
+        else:
+            raise QueryError("either q or lat and lon is required")
+        return [location_row(loc) for loc in locs]
+
+    def health_endpoint(self, params: dict[str, str]) -> Any:
+        return {"status": "ok", "uptime_s": round(time.monotonic() - self.started, 1)}
+
+    def stats_endpoint(self, params: dict[str, str]) -> Any:
+        with self._lock:
+            counters = dict(self.counters)
+            statuses = {str(status): count for status, count in sorted(self.statuses.items())}
+        return {**counters, "statuses": statuses, "cache": {**self.cache.stats, "entries": len(self.cache)}}
+
+    def handle(self, path: str, params: dict[str, str]) -> Reply:
+        """Returns the status code and JSON-serializable body answering a GET request."""
+        with self._lock:
+            self.counters["requests"] += 1
+        status, body = self._dispatch(path, params)
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status >= 500:
+                self.counters["errors"] += 1
+        return status, body
+
+    def _dispatch(self, path: str, params: dict[str, str]) -> Reply:
+        endpoint = self.routes.get(path.rstrip("/") or "/")
+        try:
+            if endpoint is None:
+                raise NotFound(f"No such endpoint: {path}")
+            return 200, endpoint(params)
+        except QueryError as exc:
+            return 400, {"error": str(exc)}
+        except NotFound as exc:
+            return 404, {"error": str(exc)}
+        except RateLimited as exc:
+            return 429, {"error": str(exc), "retry_after": round(exc.retry_after, 1)}
+        except BadRequest as exc:
+            # A bad API key or an unknown location is the service's problem, not the client's.
+            return (404 if str(exc.code) == "404" else 502), {"error": str(exc)}
+        except (RequestException, CircuitOpen) as exc:
+            logger.warning("Upstream request failed answering %s: %s", path, redact_query(str(exc)))
+            return 502, {"error": error_message(exc)}
+        except Exception:
+            # A bug or an unexpected upstream payload must not take down the handler thread without an answer.
+            logger.exception("Unhandled error answering %s", path)
+            return 500, {"error": "internal server error"}
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serves a `WeatherService` over HTTP/1.1, so that clients can keep their connections open."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "weatherpy"
+    service: WeatherService
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        status, body = self.service.handle(parts.path, dict(parse_qsl(parts.query)))
+        content = json.dumps(body, ensure_ascii=False).encode("utf8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        if status == 429:
+            self.send_header("Retry-After", str(max(1, round(body["retry_after"]))))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        # Every request is counted in /stats; logging each one to stderr would only slow the service down.
+        pass
+
+
+def create_server(service: WeatherService, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> ThreadingHTTPServer:
+    """Returns an HTTP server handling each connection in its own thread; port 0 picks a free port."""
+    handler = type("ServiceHandler", (Handler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
@@ -0,0 +1,186 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+from weatherpy.api.exceptions import BadRequest
+from weatherpy.paths import CONFIG_SNAPSHOT, HOME_DIR, VALIDATED_TOKENS
+from weatherpy.profiling import timed
+
+CFG_FILENAME: str = "weatherpy.cfg"
+# A token that worked recently is trusted again without a validation request, until a request is rejected with 401.
+TOKEN_VALIDITY: float = 7 * 24 * 3600
+
+ConfigData = dict[str, dict[str, str]]
+
+
+def _write_json(path: Path, data: object) -> None:
+    """Writes JSON atomically, so that concurrent invocations never read a half-written file."""
+    import tempfile
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".", suffix=".tmp")
+    except OSError:
+        return
+    try:
+        with os.fdopen(fd, mode="w", encoding="utf8") as file:
+            json.dump(data, file)
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        with open(path, encoding="utf8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def parse_cfg_file(path: Path) -> ConfigData:
+    from configparser import ConfigParser
+
+    config = ConfigParser()
+    with open(path, encoding="utf8") as file:
+        config.read_file(file)
+    return {section: dict(config[section]) for section in config.sections()}
+
+
+class ConfigSnapshot:
+    """
+    Pre-parsed copy of the configuration file, reused while the file's modification time and size are unchanged.
+
+    The snapshot is kept in memory for the life of the process and as JSON on disk for later invocations, so that
+    repeated startups skip parsing the INI file.
+
+    Args:
+        source (Path): The configuration file.
+        snapshot (Path): Where the parsed copy is stored.
+    """
+
+    def __init__(self, source: Path, snapshot: Path):
+        self.source = source
+        self.snapshot = snapshot
+        self._loaded: Optional[tuple[list[int], ConfigData]] = None
+
+    def _signature(self) -> list[int]:
+        stat = self.source.stat()
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def load(self) -> ConfigData:
+        """Returns the configuration; raises FileNotFoundError if the configuration file doesn't exist."""
+        signature = self._signature()
+        if self._loaded and self._loaded[0] == signature:
+            return self._loaded[1]
+        stored = _read_json(self.snapshot)
+        if stored and stored.get("signature") == signature and isinstance(stored.get("sections"), dict):
+            data = stored["sections"]
+        else:
+            data = parse_cfg_file(self.source)
+            _write_json(self.snapshot, {"signature": signature, "sections": data})
+        self._loaded = signature, data
+        return data
+
+    def store(self, data: ConfigData) -> None:
+        """Records the contents of a configuration file that was just written."""
+        signature = self._signature()
+        _write_json(self.snapshot, {"signature": signature, "sections": data})
+        self._loaded = signature, data
+
+    def clear(self) -> None:
+        self._loaded = None
+        self.snapshot.unlink(missing_ok=True)
+
+
+class TokenValidations:
+    """
+    Record of when API tokens were last confirmed to work.
+
+    Tokens are stored as SHA-256 digests rather than in plain text.
+
+    Args:
+        path (Path): JSON file holding the record.
+        validity (float): Seconds for which a successful validation is trusted.
+    """
+
+    def __init__(self, path: Path, validity: float = TOKEN_VALIDITY):
+        self.path = path
+        self.validity = validity
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf8")).hexdigest()
+
+    def is_validated(self, token: str) -> bool:
+        validated_at = (_read_json(self.path) or {}).get(self._key(token))
+        return isinstance(validated_at, (int, float)) and time.time() - validated_at < self.validity
+
+    def record(self, token: str) -> None:
+        now = time.time()
+        entries = {
+            key: validated_at
+            for key, validated_at in (_read_json(self.path) or {}).items()
+            if isinstance(validated_at, (int, float)) and now - validated_at < self.validity
+        }
+        entries[self._key(token)] = now
+        _write_json(self.path, entries)
+
+    def forget(self, token: str) -> None:
+        entries = _read_json(self.path) or {}
+        if entries.pop(self._key(token), None) is not None:
+            _write_json(self.path, entries)
+
+
+_snapshot: Optional[ConfigSnapshot] = None
+_validations: Optional[TokenValidations] = None
+
+
+def get_config_snapshot() -> ConfigSnapshot:
+    global _snapshot
+    if _snapshot is None:
+        _snapshot = ConfigSnapshot(HOME_DIR / CFG_FILENAME, CONFIG_SNAPSHOT)
+    return _snapshot
+
+
+def get_token_validations() -> TokenValidations:
+    global _validations
+    if _validations is None:
+        _validations = TokenValidations(VALIDATED_TOKENS)
+    return _validations
+
+
+def forget_rejected_token(exc: Exception, token: str) -> None:
+    """Stops trusting a token the API has rejected as invalid, so that it is validated again before it is reused."""
+    if isinstance(exc, BadRequest) and str(exc.code) == "401":
+        get_token_validations().forget(token)
+
+
+def geo_coords_valid(loc: tuple[str, str]) -> bool:
+    try:
+        loc2 = (float(loc[0]), float(loc[1]))
+    except (ValueError, TypeError):
+        return False
+    return -90 <= loc2[0] <= 90 and -180 <= loc2[1] <= 180
+
+
+@timed("handle_config")
+def handle_config() -> ConfigData:
+    """Returns the configuration, leading the user through creating it first if there is none.
+
+    Loading never imports rich; only the interactive setup does."""
+    snapshot = get_config_snapshot()
+    try:
+        return snapshot.load()
+    except FileNotFoundError:
+        from rich import print
+
+        from .config import create_cfg_file
+
+        print("[bold blue]Settings file not found. Creating configuration...[/]")
+        create_cfg_file()
+    return snapshot.load()
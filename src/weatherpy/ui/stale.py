@@ -0,0 +1,217 @@
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+from requests.exceptions import RequestException
+
+from weatherpy.api.cache import TTL
+from weatherpy.api.comm import (
+    error_message,
+    get_current_weather,
+    get_last_known,
+    get_weather_forecast,
+    parse_current_weather,
+    parse_weather_forecast,
+    send_request,
+)
+from weatherpy.api.exceptions import BadRequest, CircuitOpen, RateLimited
+from weatherpy.api.models import Current, Forecast
+
+if TYPE_CHECKING:
+    from rich.console import Console, RenderableType
+
+# Longest time the process waits for the background refresh once the last-known data has been shown.
+REFRESH_TIMEOUT: float = 30.0
+
+# Current weather under "weather" and the forecast under "forecast", named after their endpoints.
+WeatherData = dict[str, Any]
+Ages = dict[str, float]
+
+PARSERS: dict[str, Callable[[dict], Union[Current, Forecast]]] = {
+    "weather": parse_current_weather,
+    "forecast": parse_weather_forecast,
+}
+FETCHERS: dict[str, Callable[..., Union[Current, Forecast]]] = {
+    "weather": get_current_weather,
+    "forecast": get_weather_forecast,
+}
+
+
+class Revalidator:
+    """
+    Serves the last-known weather for a location at once and refreshes it in a background thread.
+
+    The refresh skips the response cache lookup but stores its result there (and in the history), so the next call
+    starts from the refreshed data even if this one exits before showing it.
+
+    Args:
+        lat (float): The latitude of the location.
+        lon (float): The longitude of the location.
+        token (str): OpenWeather API key.
+        endpoints (tuple[str, ...]): The data to serve, "weather" and/or "forecast".
+        clock (Callable[[], float]): Wall clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        token: str,
+        endpoints: tuple[str, ...] = ("weather",),
+        clock: Callable[[], float] = time.time,
+    ):
+        self.lat = lat
+        self.lon = lon
+        self.token = token
+        self.endpoints = endpoints
+        self.clock = clock
+        self.fresh: Optional[WeatherData] = None
+        self.error = ""
+        self._thread: Optional[threading.Thread] = None
+
+    def last_known(self) -> Optional[tuple[WeatherData, Ages]]:
+        """Returns the cached data with its age in seconds, or None unless every endpoint has some."""
+        data: WeatherData = {}
+        ages: Ages = {}
+        now = self.clock()
+        for endpoint in self.endpoints:
+            cached = get_last_known(endpoint, self.lat, self.lon)
+            if cached is None:
+                return None
+            payload, stored_at = cached
+            try:
+                data[endpoint] = PARSERS[endpoint](payload)
+            except (KeyError, TypeError, ValueError):
+                return None
+            ages[endpoint] = max(0.0, now - stored_at)
+        return data, ages
+
+    def is_fresh(self, ages: Ages) -> bool:
+        """Whether all data is younger than its cache TTL, i.e. a refresh would most likely return the same."""
+        return all(ages[endpoint] <= TTL[endpoint] for endpoint in self.endpoints)
+
+    def _refresh(self) -> None:
+        kwargs = dict(lat=self.lat, lon=self.lon, token=self.token, refresh=True, request=send_request)
+        try:
+            self.fresh = {endpoint: FETCHERS[endpoint](**kwargs) for endpoint in self.endpoints}
+        except (BadRequest, CircuitOpen, RateLimited, RequestException) as exc:
+            self.error = error_message(exc)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._refresh, name="weatherpy-revalidate", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float = REFRESH_TIMEOUT) -> Optional[WeatherData]:
+        """Returns the refreshed data, or None if the refresh failed or didn't finish in time."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.fresh
+
+
+def render_weather(data: WeatherData, ages: Ages, units: str, daily: bool = False) -> "RenderableType":
+    """Renders current weather above the forecast (or its daily roll-up), each marked with its age if given."""
+    from rich.console import Group
+
+    parts: list["RenderableType"] = []
+    if (current := data.get("weather")) is not None:
+        from weatherpy.presenter.current import create_current_weather_panel, create_location_and_time_panel
+
+        parts += [
+            create_location_and_time_panel(current),
+            create_current_weather_panel(current, units, age=ages.get("weather")),
+        ]
+    if (forecast := data.get("forecast")) is not None and daily:
+        from weatherpy.api.daily import summarize_many
+        from weatherpy.presenter.daily import create_daily_table
+
+        parts.append(create_daily_table(summarize_many([forecast]), units, age=ages.get("forecast")))
+    elif forecast is not None:
+        from weatherpy.presenter.forecast import create_forecast_panel
+
+        parts.append(create_forecast_panel(forecast, units, age=ages.get("forecast")))
+    return Group(*parts)
+
+
+def write_rows(data: WeatherData, units: str, format: str, daily: bool = False) -> None:
+    from weatherpy.api.daily import summarize_days
+    from weatherpy.ui.output import DAILY_FIELDS, FIELDS, create_writer, current_row, daily_rows, forecast_rows
+
+    current, forecast = data.get("weather"), data.get("forecast")
+    with create_writer(format, DAILY_FIELDS if daily and current is None else FIELDS) as writer:
+        if current is not None:
+            writer.write([current_row(current, units)])
+        if forecast is not None and daily:
+            writer.write(daily_rows(summarize_days(forecast), units))
+        elif forecast is not None:
+            writer.write(forecast_rows(forecast, units))
+
+
+def detach_stdout() -> None:
+    """Closes the output for its reader (e.g. a status bar reading a pipe) while the process keeps running."""
+    sys.stdout.flush()
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+    os.close(devnull)
+
+
+def show_then_refresh(
+    revalidator: Revalidator, data: WeatherData, ages: Ages, show: Callable[[WeatherData, Ages], None]
+) -> None:
+    """Shows the last-known data, hands the output over to its reader and waits for the refresh to be stored."""
+    revalidator.start()
+    show(data, ages)
+    detach_stdout()
+    revalidator.wait()
+
+
+def live_refresh(
+    revalidator: Revalidator,
+    data: WeatherData,
+    ages: Ages,
+    render: Callable[[WeatherData, Ages], "RenderableType"],
+    console: Optional["Console"] = None,
+) -> None:
+    """Shows the last-known data in a live display and replaces it with the refreshed data once that arrives."""
+    from rich.console import Console, Group
+    from rich.live import Live
+    from rich.text import Text
+
+    revalidator.start()
+    with Live(
+        render(data, ages), console=console or Console(), auto_refresh=False, vertical_overflow="visible"
+    ) as live:
+        fresh = revalidator.wait()
+        if fresh is not None:
+            live.update(render(fresh, {}), refresh=True)
+        else:
+            reason = revalidator.error or "the request timed out"
+            live.update(Group(render(data, ages), Text(f"Couldn't refresh: {reason}", style="dim")), refresh=True)
+
+
+def show_last_known(revalidator: Revalidator, units: str, format: str = "rich", daily: bool = False) -> bool:
+    """Shows the last-known weather at once and refreshes it in the background.
+
+    Returns False if nothing is cached for the location, in which case the caller should fetch as usual. Data that
+    is still fresh is shown without being refreshed."""
+    last_known = revalidator.last_known()
+    if last_known is None:
+        return False
+    data, ages = last_known
+
+    def show(data: WeatherData, ages: Ages) -> None:
+        if format != "rich":
+            write_rows(data, units, format, daily=daily)
+            return
+        from rich import print
+
+        print(render_weather(data, ages, units, daily=daily))
+
+    if revalidator.is_fresh(ages):
+        show(data, {})
+    elif format == "rich" and sys.stdout.isatty():
+        live_refresh(revalidator, data, ages, lambda data, ages: render_weather(data, ages, units, daily=daily))
+    else:
+        show_then_refresh(revalidator, data, ages, show)
+    return True
@@ -0,0 +1,211 @@
+import asyncio
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Collection, Iterator, Optional
+
+from requests.exceptions import RequestException
+
+from weatherpy.api.aio import AsyncClient
+from weatherpy.api.comm import error_message
+from weatherpy.api.exceptions import BadRequest, BudgetExhausted, CircuitOpen, RateLimited
+from weatherpy.api.models import Current, Forecast
+
+from .output import FIELDS, Row, current_row, error_row, forecast_rows
+
+MAX_POINTS: int = 100_000
+SWEEP_FIELDS: tuple[str, ...] = ("point", "station", *FIELDS)
+Grid = tuple[float, float, float, float, float]
+
+
+def grid_points(south: float, west: float, north: float, east: float, step: float) -> list[tuple[float, float]]:
+    """Returns the points of a grid covering a bounding box, row by row from the south-west corner.
+
+    Coordinates are computed from integer offsets, so they don't drift with the number of steps."""
+    if step <= 0:
+        raise ValueError("The step must be positive.")
+    if not (-90 <= south <= north <= 90 and -180 <= west <= east <= 180):
+        raise ValueError(
+            "The bounding box must be given as south, west, north, east with south <= north and west <= east."
+        )
+    rows = int((north - south) / step + 1e-9) + 1
+    cols = int((east - west) / step + 1e-9) + 1
+    if rows * cols > MAX_POINTS:
+        raise ValueError(f"The grid has {rows * cols} points; use a larger step to stay within {MAX_POINTS}.")
+    return [(round(south + i * step, 4), round(west + j * step, 4)) for i in range(rows) for j in range(cols)]
+
+
+@dataclass
+class SweepResult:
+    """
+    Outcome of fetching a single grid point.
+
+    Args:
+        point (int): Index of the point in the grid.
+        lat (float): Latitude of the point.
+        lon (float): Longitude of the point.
+        station (Optional[int]): ID of the OpenWeather city the point resolved to.
+        current (Optional[Current]): Current weather, unless the point is a duplicate.
+        forecast (Optional[Forecast]): Weather forecast, if requested and the point isn't a duplicate.
+        duplicate (bool): Whether an earlier point already resolved to the same station.
+        error (str): Error message if the point couldn't be fetched.
+    """
+
+    point: int
+    lat: float
+    lon: float
+    station: Optional[int] = None
+    current: Optional[Current] = None
+    forecast: Optional[Forecast] = None
+    duplicate: bool = False
+    error: str = ""
+
+
+def sweep_rows(result: SweepResult, units: str) -> Iterator[Row]:
+    """Yields the records of a grid point; duplicates and errors get a single record of that kind."""
+    query = f"{result.lat},{result.lon}"
+    extra = {"point": result.point, "station": result.station}
+    if result.error:
+        yield {**error_row(query, result.error), **extra}
+    elif result.duplicate:
+        yield {"query": query, "kind": "duplicate", "lat": result.lat, "lon": result.lon, **extra}
+    else:
+        # A failed point isn't checkpointed and is fetched again, so whatever it got before failing isn't written.
+        if result.current:
+            yield {**current_row(result.current, units, query=query), **extra}
+        if result.forecast:
+            for row in forecast_rows(result.forecast, units, query=query):
+                yield {**row, **extra}
+
+
+class SweepCheckpoint:
+    """
+    Append-only record of the grid points a sweep has finished, so that an interrupted sweep can be resumed.
+
+    The first line identifies the grid; every further line records one finished point and the station it resolved
+    to. Points that failed aren't recorded and are fetched again on resume.
+
+    Args:
+        path (Path): The checkpoint file.
+        grid (Grid): South, west, north, east and step of the sweep.
+    """
+
+    def __init__(self, path: Path, grid: Grid):
+        self.path = path
+        self.grid = list(grid)
+        self.done: set[int] = set()
+        self.stations: set[int] = set()
+        self._started = False
+
+    def load(self) -> None:
+        """Reads the finished points; raises ValueError if the checkpoint is damaged or of a different grid."""
+        if not self.path.exists():
+            return
+        with open(self.path, "rb+") as file:
+            data = file.read()
+            # An interrupted write leaves a partial last line behind; drop it before appending.
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                file.truncate(end)
+        lines = data[:end].splitlines()
+        if not lines:
+            return
+        self._started = True
+        try:
+            grid = json.loads(lines[0]).get("grid")
+            entries = [json.loads(line) for line in lines[1:]]
+            done = {entry["point"] for entry in entries}
+            stations = {
+                entry["station"] for entry in entries if entry.get("station") is not None and not entry.get("duplicate")
+            }
+        except (AttributeError, KeyError, TypeError, ValueError):
+            raise ValueError(f"{self.path} isn't a sweep checkpoint or is damaged.") from None
+        if grid != self.grid:
+            raise ValueError(f"{self.path} is the checkpoint of a different sweep.")
+        self.done |= done
+        self.stations |= stations
+
+    def record(self, result: SweepResult) -> None:
+        if not self._started:
+            self._append({"grid": self.grid})
+            self._started = True
+        self._append({"point": result.point, "station": result.station, "duplicate": result.duplicate})
+        self.done.add(result.point)
+
+    def _append(self, entry: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf8") as file:
+            file.write(json.dumps(entry) + "\n")
+
+
+async def fetch_point(
+    client: AsyncClient, point: int, lat: float, lon: float, forecast: bool, stations: set[int]
+) -> SweepResult:
+    """Fetches current weather for a point and, unless its station was seen before, the forecast.
+
+    The station is only known from the current weather response, so duplicates still cost one request."""
+    result = SweepResult(point=point, lat=lat, lon=lon)
+    claimed: Optional[int] = None
+    try:
+        current = await client.current_weather(lat=lat, lon=lon)
+        result.station = current.station_id
+        if result.station is not None:
+            if result.station in stations:
+                result.duplicate = True
+                return result
+            stations.add(result.station)
+            claimed = result.station
+        result.current = current
+        if forecast:
+            result.forecast = await client.weather_forecast(lat=lat, lon=lon)
+    except (BudgetExhausted, BadRequest, CircuitOpen, RateLimited, RequestException) as exc:
+        # The point will be fetched again, so its station mustn't make other points duplicates of nothing.
+        if claimed is not None:
+            stations.discard(claimed)
+        if isinstance(exc, BudgetExhausted):
+            raise
+        result.error = error_message(exc)
+    return result
+
+
+async def iter_sweep(
+    points: list[tuple[float, float]],
+    client: AsyncClient,
+    forecast: bool = True,
+    done: Collection[int] = (),
+    stations: Optional[set[int]] = None,
+) -> AsyncIterator[SweepResult]:
+    """Fetches grid points with `client.concurrency` workers and yields results in order of completion.
+
+    Points in `done` are skipped and `stations` (the stations of points already written) is updated as new ones are
+    found. Workers stop taking new points once the client's request budget is exhausted."""
+    stations = set() if stations is None else stations
+    pending = iter([i for i in range(len(points)) if i not in done])
+    queue: asyncio.Queue[Optional[SweepResult]] = asyncio.Queue()
+    exhausted = False
+
+    async def worker() -> None:
+        nonlocal exhausted
+        for i in pending:
+            if exhausted:
+                return
+            try:
+                result = await fetch_point(client, i, *points[i], forecast=forecast, stations=stations)
+            except BudgetExhausted:
+                exhausted = True
+                return
+            await queue.put(result)
+
+    async def run() -> None:
+        try:
+            await asyncio.gather(*(worker() for _ in range(max(1, client.concurrency))))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(run())
+    try:
+        while (result := await queue.get()) is not None:
+            yield result
+        await task
+    finally:
+        task.cancel()
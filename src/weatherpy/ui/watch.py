@@ -0,0 +1,158 @@
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+from requests.exceptions import RequestException
+from rich.console import Console, Group
+from rich.layout import Layout
+from rich.live import Live
+from rich.text import Text
+
+from weatherpy.api.cache import TTL
+from weatherpy.api.comm import error_message, get_current_weather, get_weather_forecast, send_request
+from weatherpy.api.exceptions import BadRequest, CircuitOpen, RateLimited
+from weatherpy.api.models import FORECAST_COLUMNS, Current, Forecast
+from weatherpy.presenter.current import create_current_weather_panel, create_location_and_time_panel
+from weatherpy.presenter.forecast import create_forecast_panel
+
+MIN_INTERVAL: float = 60.0
+RETRY_INTERVAL: float = 60.0
+RATE_LIMITED_INTERVAL: float = 5 * 60.0
+
+
+def _current_signature(current: Current) -> tuple:
+    return current.dt, current.sunrise, current.sunset, current.loc, current.weather
+
+
+def _forecast_signature(forecast: Forecast) -> tuple:
+    return (forecast.loc, tuple(forecast.description), *(forecast.column(name) for name in FORECAST_COLUMNS))
+
+
+class Watcher:
+    """
+    Polls current weather and the forecast for a single location on separate schedules.
+
+    Current weather is polled every `current_interval` seconds and the forecast every `forecast_interval` seconds,
+    which by default follow how often OpenWeather refreshes the data. The watcher decides when data is due, so polls
+    skip the response cache lookup (they still store what they fetch). Failed polls are retried after a minute, or
+    after a few minutes when the API rate limit was hit.
+
+    Args:
+        lat (float): The latitude of the location.
+        lon (float): The longitude of the location.
+        units (str): Units of measurement.
+        token (str): OpenWeather API key.
+        current_interval (float): Seconds between current weather polls.
+        forecast_interval (float): Seconds between forecast polls.
+        clock (Callable[[], float]): Monotonic clock, replaceable in tests.
+    """
+
+    def __init__(
+        self,
+        lat: float,
+        lon: float,
+        units: str,
+        token: str,
+        current_interval: float = TTL["weather"],
+        forecast_interval: float = TTL["forecast"],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.lat = lat
+        self.lon = lon
+        self.units = units
+        self.token = token
+        self.current_interval = max(MIN_INTERVAL, current_interval)
+        self.forecast_interval = max(MIN_INTERVAL, forecast_interval)
+        self.clock = clock
+        self.current: Optional[Current] = None
+        self.forecast: Optional[Forecast] = None
+        # The error of the last poll of each view, cleared once that view is polled successfully.
+        self.errors: dict[str, str] = {"current": "", "forecast": ""}
+        self.updated: Optional[datetime] = None
+        self.next_current = 0.0
+        self.next_forecast = 0.0
+
+    @property
+    def error(self) -> str:
+        return "; ".join(error for error in self.errors.values() if error)
+
+    def _retry_delay(self, exc: Exception) -> float:
+        if isinstance(exc, BadRequest) and str(exc.code) == "429":
+            return RATE_LIMITED_INTERVAL
+        if isinstance(exc, RateLimited):
+            return max(RETRY_INTERVAL, exc.retry_after)
+        return RETRY_INTERVAL
+
+    def poll(self) -> set[str]:
+        """Fetches whatever is due and returns the names ('current', 'forecast') of views whose data changed."""
+        changed: set[str] = set()
+        now = self.clock()
+        kwargs = dict(lat=self.lat, lon=self.lon, token=self.token, refresh=True, request=send_request)
+        if now >= self.next_current:
+            try:
+                current = get_current_weather(**kwargs)
+            except (BadRequest, CircuitOpen, RateLimited, RequestException) as exc:
+                self.errors["current"] = error_message(exc)
+                self.next_current = now + self._retry_delay(exc)
+            else:
+                self.errors["current"] = ""
+                self.next_current = now + self.current_interval
+                if self.current is None or _current_signature(current) != _current_signature(self.current):
+                    self.current = current
+                    changed.add("current")
+        if now >= self.next_forecast:
+            try:
+                forecast = get_weather_forecast(**kwargs)
+            except (BadRequest, CircuitOpen, RateLimited, RequestException) as exc:
+                self.errors["forecast"] = error_message(exc)
+                self.next_forecast = now + self._retry_delay(exc)
+            else:
+                self.errors["forecast"] = ""
+                self.next_forecast = now + self.forecast_interval
+                if self.forecast is None or _forecast_signature(forecast) != _forecast_signature(self.forecast):
+                    self.forecast = forecast
+                    changed.add("forecast")
+        if changed:
+            self.updated = datetime.now()
+        return changed
+
+    def seconds_until_next_poll(self) -> float:
+        return max(0.0, min(self.next_current, self.next_forecast) - self.clock())
+
+
+def make_watch_layout() -> Layout:
+    layout = Layout(name="root")
+    layout.split(
+        Layout(name="status", size=1),
+        Layout(name="current", size=9),
+        Layout(name="forecast", ratio=1),
+    )
+    layout["current"].split_row(Layout(name="location"), Layout(name="weather"))
+    return layout
+
+
+def _status(watcher: Watcher) -> Text:
+    text = Text("Press Ctrl+C to quit.", style="dim")
+    if watcher.updated:
+        text.append(f" Last change at {watcher.updated:%H:%M}.", style="dim")
+    if watcher.error:
+        text.append(f" Last update failed: {watcher.error}", style="bold red")
+    return text
+
+
+def run_watch(watcher: Watcher, console: Optional[Console] = None) -> None:
+    """Shows a live view that is redrawn only when polled data changed."""
+    layout = make_watch_layout()
+    layout["current"].update(Group())
+    layout["forecast"].update(Group())
+    with Live(layout, console=console, auto_refresh=False, screen=True) as live:
+        while True:
+            changed = watcher.poll()
+            if "current" in changed and watcher.current is not None:
+                layout["location"].update(create_location_and_time_panel(watcher.current))
+                layout["weather"].update(create_current_weather_panel(watcher.current, watcher.units))
+            if "forecast" in changed and watcher.forecast is not None:
+                layout["forecast"].update(create_forecast_panel(watcher.forecast, watcher.units))
+            layout["status"].update(_status(watcher))
+            live.refresh()
+            time.sleep(watcher.seconds_until_next_poll())
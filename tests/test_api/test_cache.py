@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from weatherpy.api.cache import MemoryCache, ResponseCache, quantize
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResponseCache(tmp_path, ttl={"weather": 600, "forecast": 1800}, max_entries=3)
+
+
+@pytest.mark.parametrize(
+    "coord, expected",
+    [
+        (51.5073219, "51.51"),
+        (-0.1276474, "-0.13"),
+        (0, "0.00"),
+    ],
+)
+def test_quantize(coord, expected):
+    assert quantize(coord) == expected
+
+
+def test_cache_returns_stored_payload_for_nearby_coords(cache):
+    cache.put("weather", 51.5073, -0.1276, "metric", {"cod": 200})
+    assert cache.get("weather", 51.5069, -0.1281, "metric") == {"cod": 200}
+    assert cache.get("weather", 51.5073, -0.1276, "imperial") is None
+    assert cache.get("forecast", 51.5073, -0.1276, "metric") is None
+
+
+def test_cache_entries_expire_per_endpoint(cache):
+    with patch("weatherpy.api.cache.time.time", return_value=1000.0):
+        cache.put("weather", 1, 1, "metric", {"a": 1})
+        cache.put("forecast", 1, 1, "metric", {"b": 2})
+    with patch("weatherpy.api.cache.time.time", return_value=1000.0 + 601):
+        assert cache.get("weather", 1, 1, "metric") is None
+        assert cache.get("forecast", 1, 1, "metric") == {"b": 2}
+
+
+def test_cache_serves_expired_entries_as_stale(cache):
+    with patch("weatherpy.api.cache.time.time", return_value=1000.0):
+        cache.put("weather", 1, 1, "standard", {"a": 1})
+    with patch("weatherpy.api.cache.time.time", return_value=1000.0 + 3600):
+        assert cache.get("weather", 1, 1, "standard") is None
+        assert cache.get_stale("weather", 1, 1, "standard") == ({"a": 1}, 1000.0)
+    assert cache.get_stale("forecast", 1, 1, "standard") is None
+
+
+def test_cache_evicts_least_recently_used_entries(cache, tmp_path):
+    for i in range(3):
+        cache.put("weather", i, i, "metric", {"i": i})
+        os.utime(cache.path("weather", i, i, "metric"), (i, i))
+    cache.put("weather", 9, 9, "metric", {"i": 9})
+    assert cache.get("weather", 0, 0, "metric") is None
+    assert cache.get("weather", 1, 1, "metric") == {"i": 1}
+    assert len(list(tmp_path.glob("*.json"))) == 3
+
+
+def test_cache_ignores_corrupted_entries(cache):
+    cache.put("weather", 1, 1, "metric", {"a": 1})
+    cache.path("weather", 1, 1, "metric").write_text("{not json")
+    assert cache.get("weather", 1, 1, "metric") is None
+
+
+def test_memory_cache_evicts_least_recently_used_entries():
+    now = [0.0]
+    cache = MemoryCache(max_entries=2, clock=lambda: now[0])
+    for key in "abc":
+        if key == "c":
+            assert cache.get_or_fetch("a", 60, lambda: "stale") == "a"
+        cache.get_or_fetch(key, 60, lambda: key)
+    assert cache.get_or_fetch("a", 60, lambda: "refetched") == "a"
+    assert cache.get_or_fetch("b", 60, lambda: "refetched") == "refetched"
+    assert cache.stats["evictions"] == 2
+
+    now[0] = 61
+    assert cache.get_or_fetch("a", 60, lambda: "expired") == "expired"
+
+
+def test_memory_cache_coalesces_concurrent_misses_and_does_not_cache_errors():
+    cache = MemoryCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.1)
+        return len(calls)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", 60, fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [1] * 8
+    assert cache.stats["misses"] == 1
+
+    def fail():
+        raise OSError("unreachable")
+
+    with pytest.raises(OSError):
+        cache.get_or_fetch("e", 60, fail)
+    assert cache.get_or_fetch("e", 60, lambda: "ok") == "ok"
@@ -0,0 +1,89 @@
+import gzip
+import json
+
+import pytest
+from weatherpy.api.citydb import CityIndex, build_city_index, fold, lookup_city, parse_city_query
+
+GEONAMES = [
+    # geonameid, name, asciiname, alternatenames, lat, lon, class, code, country, cc2, admin1, ..., population
+    ("2643743", "London", "London", "", "51.50853", "-0.12574", "P", "PPLC", "GB", "", "ENG", "", "", "", "8961989"),
+    ("6058560", "London", "London", "", "42.98339", "-81.23304", "P", "PPL", "CA", "", "08", "", "", "", "422324"),
+    ("4298960", "London", "London", "", "37.12898", "-84.08326", "P", "PPL", "US", "", "KY", "", "", "", "8126"),
+    ("2657896", "Zürich", "Zurich", "", "47.36667", "8.55", "P", "PPLA", "CH", "", "ZH", "", "", "", "341730"),
+    (
+        "2643741",
+        "City of London",
+        "City of London",
+        "",
+        "51.51279",
+        "-0.09184",
+        "P",
+        "PPL",
+        "GB",
+        "",
+        "ENG",
+        "",
+        "",
+        "",
+        "8071",
+    ),
+    ("3067696", "Praha", "Praha", "", "50.08804", "14.42076", "P", "PPLC", "CZ", "", "52", "", "", "", "1165581"),
+]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    source = tmp_path / "cities500.txt"
+    source.write_text("".join("\t".join(row) + "\n" for row in GEONAMES), encoding="utf8")
+    target = tmp_path / "cities.bin"
+    assert build_city_index(source, target) == len(GEONAMES)
+    return target
+
+
+def test_fold_ignores_case_accents_and_spacing():
+    assert fold(" ZÜRICH ") == fold("zurich") == "zurich"
+    assert fold("São  Paulo") == "sao paulo"
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [("London", ("london", "", "")), ("london, gb", ("london", "", "gb")), ("London, KY, US", ("london", "ky", "us"))],
+)
+def test_parse_city_query(query, expected):
+    assert parse_city_query(query) == expected
+
+
+def test_search_ranks_by_population_and_filters(index_path):
+    with CityIndex(index_path) as index:
+        assert [loc.country for loc, _ in index.search("london")] == ["GB", "CA", "US"]
+        assert [loc.country for loc, _ in index.search("London, US")] == ["US"]
+        assert [loc.lat for loc, _ in index.search("London, KY, US")] == [37.129]
+        assert index.search("zurich")[0][0].name == "Zürich"
+        assert index.search("Nowhere") == []
+
+
+def test_complete_by_prefix(index_path):
+    with CityIndex(index_path) as index:
+        assert [loc.name for loc in index.complete("lo")] == ["London", "London", "London"]
+        assert [loc.name for loc in index.complete("city of")] == ["City of London"]
+        assert [loc.name for loc in index.complete("PR")] == ["Praha"]
+
+
+def test_lookup_city_falls_back_when_unranked(tmp_path):
+    assert lookup_city("London", path=tmp_path / "missing.bin") is None
+
+    source = tmp_path / "city.list.json.gz"
+    cities = [
+        {"id": 1, "name": "Springfield", "state": "IL", "country": "US", "coord": {"lat": 39.8, "lon": -89.64}},
+        {"id": 2, "name": "Springfield", "state": "MO", "country": "US", "coord": {"lat": 37.21, "lon": -93.29}},
+        {"id": 3, "name": "Kraków", "state": "", "country": "PL", "coord": {"lat": 50.08, "lon": 19.92}},
+    ]
+    with gzip.open(source, "wt", encoding="utf8") as file:
+        json.dump(cities, file)
+    target = tmp_path / "cities.bin"
+    build_city_index(source, target)
+
+    # Without population figures, ambiguous names are left to the geocoding API.
+    assert lookup_city("Springfield", path=target) is None
+    assert [loc.state for loc in lookup_city("Springfield, MO, US", path=target)] == ["MO"]
+    assert [loc.name for loc in lookup_city("krakow", path=target)] == ["Kraków"]
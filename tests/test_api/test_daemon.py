@@ -0,0 +1,142 @@
+import json
+import threading
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+from weatherpy.api import comm
+from weatherpy.api.daemon import (
+    Daemon,
+    DaemonResponse,
+    daemon_request,
+    daemon_stats,
+    daemon_supported,
+    request_key,
+    serve,
+)
+from weatherpy.api.exceptions import RateLimited
+
+WEATHER_URL = "https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&units=metric&appid=x"
+
+
+class FakeResponse:
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+
+
+class Upstream:
+    def __init__(self, status=200, delay=0.0):
+        self.status = status
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        time.sleep(self.delay)
+        return FakeResponse(self.status, json.dumps({"cod": self.status, "n": len(self.calls)}))
+
+
+def test_request_key_folds_nearby_coordinates_and_query_spelling():
+    assert request_key(WEATHER_URL.format(lat=51.5073, lon=-0.1276)) == request_key(
+        WEATHER_URL.format(lat=51.5071, lon=-0.1279)
+    )
+    assert request_key(WEATHER_URL.format(lat=51.5073, lon=-0.1276)) != request_key(
+        WEATHER_URL.format(lat=51.52, lon=-0.1276)
+    )
+    direct = "https://api.openweathermap.org/geo/1.0/direct?q={}&limit=5&appid=x"
+    assert request_key(direct.format("London, GB")) == request_key(direct.format("london,gb"))
+
+
+def test_concurrent_identical_requests_are_coalesced():
+    upstream = Upstream(delay=0.1)
+    daemon = Daemon(upstream)
+    url = WEATHER_URL.format(lat=51.5, lon=-0.13)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(daemon.get(url))) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(upstream.calls) == 1
+    assert len(set(results)) == 1
+    assert daemon.stats["upstream"] == 1
+    assert daemon.stats["coalesced"] + daemon.stats["hits"] == 9
+
+
+def test_entries_expire_after_their_ttl():
+    now = [0.0]
+    upstream = Upstream()
+    daemon = Daemon(upstream, clock=lambda: now[0])
+    url = WEATHER_URL.format(lat=51.5, lon=-0.13)
+    daemon.get(url)
+    now[0] = 599
+    daemon.get(url)
+    assert len(upstream.calls) == 1
+    now[0] = 601
+    daemon.get(url)
+    assert len(upstream.calls) == 2
+
+
+def test_errors_are_relayed_but_not_cached():
+    upstream = Upstream(status=401)
+    daemon = Daemon(upstream)
+    url = WEATHER_URL.format(lat=51.5, lon=-0.13)
+    assert daemon.get(url)[0] == 401
+    assert daemon.get(url)[0] == 401
+    assert len(upstream.calls) == 2
+
+    def limited(url):
+        raise RateLimited(retry_after=30)
+
+    status, body = Daemon(limited).get(url)
+    assert status == 429
+    assert json.loads(body)["cod"] == 429
+
+    def unreachable(url):
+        raise ConnectionError(f"Max retries exceeded with url: {url.split('.org', 1)[1]}")
+
+    status, body = Daemon(unreachable).get(url)
+    assert status == 502
+    assert json.loads(body)["message"] == "upstream request failed (ConnectionError)"
+    assert "appid" not in body
+
+
+@pytest.mark.skipif(not daemon_supported(), reason="Unix domain sockets are not available")
+def test_clients_fetch_through_a_running_daemon(tmp_path, monkeypatch):
+    path = tmp_path / "d.sock"
+    upstream = Upstream()
+    thread = threading.Thread(target=serve, kwargs={"path": path, "fetch": upstream}, daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon_stats(path) is not None:
+            break
+        time.sleep(0.01)
+
+    url = WEATHER_URL.format(lat=51.5, lon=-0.13)
+    first = daemon_request(url, path=path)
+    second = daemon_request(url, path=path)
+    assert first.status_code == second.status_code == 200
+    assert first.json() == second.json() == {"cod": 200, "n": 1}
+    assert (first.shared, second.shared) == (False, True)
+    assert daemon_stats(path)["stats"]["hits"] == 1
+
+    monkeypatch.setattr(comm, "DAEMON_SOCKET", path)
+    assert comm.send_request(url).json()["n"] == 1
+
+
+def test_shared_payloads_are_recorded_once(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(comm, "record_history", lambda *args: recorded.append(args))
+    for shared in (False, True, True):
+        response = DaemonResponse(200, json.dumps({"cod": 200, "dt": 1714521600}), shared=shared)
+        comm.fetch_weather_data("weather", "url", 51.5, -0.13, use_cache=False, request=lambda url: response)
+    assert len(recorded) == 1
+
+
+def test_missing_daemon_is_reported_as_none(tmp_path):
+    assert daemon_request(WEATHER_URL.format(lat=0, lon=0), path=tmp_path / "missing.sock") is None
+    stale = tmp_path / "stale.sock"
+    stale.touch()
+    assert daemon_stats(stale) is None
@@ -0,0 +1,65 @@
+from datetime import date, datetime, timezone
+
+import pytest
+from weatherpy.api.daily import day_numbers, summarize_days, summarize_many
+from weatherpy.api.models import Forecast, Geolocation
+
+LOC = Geolocation(name="Tokyo", country="JP", state="", lat=35.68, lon=139.69)
+CLOUDS = (("broken clouds", "04d"),)
+RAIN = (("light rain", "10d"),)
+# 2024-05-01 00:00 UTC
+START = int(datetime(2024, 5, 1, tzinfo=timezone.utc).timestamp())
+
+
+def make_forecast(utc_offset, slots=16):
+    forecast = Forecast(LOC, utc_offset=utc_offset)
+    for i in range(slots):
+        forecast.append(
+            dt=START + i * 3 * 3600,
+            description=RAIN if i % 3 == 0 else CLOUDS,
+            temp=10 + i,
+            temp_feel=9 + i,
+            pressure=1010,
+            humidity=70,
+            wind_spd=2.0 if i % 2 else 6.0,
+            wind_deg=90 if i % 2 else 270,
+            rain=0.5 if i % 3 == 0 else 0,
+        )
+    return forecast
+
+
+def test_days_follow_utc_without_offset_shift():
+    summaries = summarize_days(make_forecast(utc_offset=0))
+    assert [s.day for s in summaries] == [date(2024, 5, 1), date(2024, 5, 2)]
+    first = summaries[0]
+    assert first.slots == 8
+    assert (first.temp_min, first.temp_max) == (10, 17)
+    assert first.temp_mean == pytest.approx(13.5)
+    assert first.rain == pytest.approx(1.5)
+    assert first.wind_max == 6.0
+    # Westerly slots are stronger than easterly ones.
+    assert first.wind_deg == 270
+    assert first.description == CLOUDS
+
+
+def test_days_follow_the_location_time_zone():
+    # In UTC+9 the first slot (00:00 UTC) is at 09:00, so only 5 slots fall on May 1st.
+    summaries = summarize_days(make_forecast(utc_offset=9 * 3600))
+    assert [(s.day, s.slots) for s in summaries] == [
+        (date(2024, 5, 1), 5),
+        (date(2024, 5, 2), 8),
+        (date(2024, 5, 3), 3),
+    ]
+    assert sum(s.slots for s in summaries) == 16
+
+
+def test_machine_time_zone_is_used_when_offset_is_unknown():
+    forecast = make_forecast(utc_offset=None)
+    assert day_numbers(forecast) == [
+        datetime.fromtimestamp(dt).date().toordinal() - date(1970, 1, 1).toordinal() for dt in forecast.dt
+    ]
+
+
+def test_summarize_many_keeps_locations_apart():
+    result = summarize_many([make_forecast(0, slots=8), make_forecast(0, slots=3), Forecast(LOC)])
+    assert [[s.slots for s in location] for location in result] == [[8], [3], []]
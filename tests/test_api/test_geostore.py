@@ -0,0 +1,47 @@
+import pytest
+from weatherpy.api.geostore import GeocodingStore, coords_key, normalize_query
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("London", "london"),
+        ("  london  ", "london"),
+        ("London, GB", "london,gb"),
+        ("london,gb", "london,gb"),
+        ("New   York ,  US", "new york,us"),
+        ("London, Kentucky, US", "london,kentucky,us"),
+        ("London,", "london"),
+    ],
+)
+def test_normalize_query(query, expected):
+    assert normalize_query(query) == expected
+
+
+def test_coords_key_rounds_to_three_decimals():
+    assert coords_key(51.50735, -0.12776) == ("51.507", "-0.128")
+
+
+def test_store_answers_normalized_direct_lookups(tmp_path):
+    store = GeocodingStore(tmp_path / "geo.sqlite3")
+    payload = [{"name": "London", "country": "GB", "lat": 51.5, "lon": -0.12}]
+    assert store.get_by_name("London, GB") is None
+    store.put_by_name("London, GB", payload)
+    assert store.get_by_name("  LONDON ,gb") == payload
+    assert store.get_by_name("London") is None
+
+
+def test_store_answers_reverse_lookups_for_rounded_coords(tmp_path):
+    store = GeocodingStore(tmp_path / "geo.sqlite3")
+    payload = [{"name": "London", "country": "GB", "lat": 51.5, "lon": -0.12}]
+    store.put_by_coords(51.50735, -0.12776, payload)
+    assert store.get_by_coords(51.5074, -0.1278) == payload
+    assert store.get_by_coords(51.6, -0.1278) is None
+
+
+def test_store_is_unavailable_if_it_cannot_be_created(tmp_path):
+    (tmp_path / "home").write_text("not a directory")
+    store = GeocodingStore(tmp_path / "home" / "geo.sqlite3")
+    store.put_by_name("London", [{"name": "London", "country": "GB", "lat": 51.5, "lon": -0.12}])
+    assert store.get_by_name("London") is None
+    assert store.get_by_coords(51.5, -0.12) is None
@@ -0,0 +1,103 @@
+import subprocess
+import sys
+
+import pytest
+from weatherpy.api.history import CURRENT, FORECAST, MAGIC, RECORD, HistoryStore, records_from_payload
+
+from .test_models import FORECAST_PAYLOAD
+
+CURRENT_PAYLOAD = {
+    "dt": 1714564800,
+    "weather": [{"id": 500, "description": "light rain", "icon": "10d"}],
+    "main": {"temp": 11.5, "feels_like": 10.2, "pressure": 1009, "humidity": 81},
+    "wind": {"speed": 4.1, "deg": 250},
+    "rain": {"1h": 0.4},
+}
+
+LAT, LON = 51.5073, -0.1276
+
+
+def test_records_from_payload():
+    (record,) = records_from_payload("weather", CURRENT_PAYLOAD, "metric", fetched=1714565000)
+    assert record == (CURRENT, 1, 500, b"10d", 1714565000, 1714564800, 11.5, 10.2, 1009, 81, 4.1, 250, 0.4, 0)
+    records = records_from_payload("forecast", FORECAST_PAYLOAD, "metric", fetched=1714565000)
+    assert len(records) == len(FORECAST_PAYLOAD["list"])
+    assert all(record[0] == FORECAST for record in records)
+
+
+def test_append_and_query_time_range(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append(LAT, LON, records_from_payload("forecast", FORECAST_PAYLOAD, "metric", fetched=1000))
+    store.append(LAT, LON, records_from_payload("weather", CURRENT_PAYLOAD, "metric", fetched=2000))
+
+    slots = sorted(slot["dt"] for slot in FORECAST_PAYLOAD["list"])
+    records = store.query(LAT, LON, slots[1], slots[-1])
+    assert [r.dt for r in records if r.kind == FORECAST] == slots[1:]
+    assert all(slots[1] <= r.dt <= slots[-1] for r in records)
+
+    assert [r.kind for r in store.query(LAT, LON, 0, 2**32 - 1, kind=CURRENT)] == [CURRENT]
+    # Nearby coordinates share a location, distant ones don't.
+    assert store.query(51.5071, -0.1279, 0, 2**32 - 1)
+    assert not store.query(48.85, 2.35, 0, 2**32 - 1)
+
+
+def test_segments_are_split_by_month(tmp_path):
+    store = HistoryStore(tmp_path)
+    payload = {**CURRENT_PAYLOAD}
+    for dt in (1706745599, 1706745600):  # Jan 31 and Feb 1 2024, 23:59:59 and 00:00:00 UTC
+        store.append(LAT, LON, records_from_payload("weather", {**payload, "dt": dt}, "metric"))
+    location = store.location_dir(LAT, LON)
+    assert sorted(p.name for p in location.iterdir()) == ["2024-01.bin", "2024-02.bin"]
+    assert [r.dt for r in store.query(LAT, LON, 1706745600, 1706745600)] == [1706745600]
+
+
+def test_partial_records_are_ignored_and_repaired(tmp_path, caplog):
+    store = HistoryStore(tmp_path)
+    store.append(LAT, LON, records_from_payload("weather", CURRENT_PAYLOAD, "metric"))
+    path = store.segment_path(LAT, LON, "2024-05")
+    with open(path, "ab") as file:
+        file.write(b"\x01\x02\x03")
+    assert len(store.query(LAT, LON, 0, 2**32 - 1)) == 1
+    assert "partial record of 3 bytes" in caplog.text
+
+    store.append(LAT, LON, records_from_payload("weather", {**CURRENT_PAYLOAD, "dt": 1714565400}, "metric"))
+    assert path.stat().st_size == len(MAGIC) + 2 * RECORD.size
+    assert len(store.query(LAT, LON, 0, 2**32 - 1)) == 2
+
+
+def test_observations_are_not_recorded_twice(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append(LAT, LON, records_from_payload("weather", CURRENT_PAYLOAD, "metric", fetched=1000))
+    store.append(LAT, LON, records_from_payload("forecast", FORECAST_PAYLOAD, "metric", fetched=1100))
+    store.append(LAT, LON, records_from_payload("weather", CURRENT_PAYLOAD, "metric", fetched=1200))
+    assert [r.fetched for r in store.query(LAT, LON, 0, 2**32 - 1, kind=CURRENT)] == [1000]
+    store.append(LAT, LON, records_from_payload("weather", {**CURRENT_PAYLOAD, "dt": 1714565400}, "metric"))
+    assert len(store.query(LAT, LON, 0, 2**32 - 1, kind=CURRENT)) == 2
+
+
+def test_concurrent_processes_append_whole_records(tmp_path):
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from weatherpy.api.history import HistoryStore, records_from_payload\n"
+        "store = HistoryStore(Path(sys.argv[1]))\n"
+        "payload = {'weather': [], 'main': {'temp': 1, 'feels_like': 1, 'pressure': 1000, 'humidity': 50},\n"
+        "           'wind': {'speed': 1, 'deg': 0}}\n"
+        "for i in range(50):\n"
+        "    dt = 1714521600 + int(sys.argv[2]) * 1000 + i\n"
+        "    store.append(51.5, -0.13, records_from_payload('weather', {**payload, 'dt': dt}, 'metric'))\n"
+    )
+    writers = [subprocess.Popen([sys.executable, "-c", code, str(tmp_path), str(n)]) for n in range(4)]
+    assert [writer.wait() for writer in writers] == [0] * 4
+
+    store = HistoryStore(tmp_path)
+    path = store.segment_path(51.5, -0.13, "2024-05")
+    assert path.read_bytes().startswith(MAGIC)
+    assert path.stat().st_size == len(MAGIC) + 200 * RECORD.size
+    records = store.query(51.5, -0.13, 0, 2**32 - 1)
+    assert sorted(r.dt for r in records) == sorted(1714521600 + n * 1000 + i for n in range(4) for i in range(50))
+
+
+@pytest.mark.parametrize("start, end", [(0, 10), (2**32 - 10, 2**32 - 1)])
+def test_query_without_data(tmp_path, start, end):
+    assert HistoryStore(tmp_path).query(LAT, LON, start, end) == []
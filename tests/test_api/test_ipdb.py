@@ -0,0 +1,53 @@
+import pytest
+from weatherpy.api.ipdb import IpDatabase, build_ip_database, lookup_ip_location
+
+CSV = """1.0.0.0,1.0.0.255,OC,AU,Queensland,South Brisbane,-27.4748,153.017
+2001:200::,2001:200:ffff:ffff:ffff:ffff:ffff:ffff,AS,JP,Tokyo,Tokyo,35.6895,139.692
+8.8.8.0,8.8.8.255,NA,US,California,Mountain View,37.4223,-122.085
+1.0.4.0,1.0.7.255,OC,AU,Victoria,Melbourne,-37.814,144.963
+not,a,valid,row
+"""
+
+
+@pytest.fixture
+def database(tmp_path):
+    source = tmp_path / "ranges.csv"
+    source.write_text(CSV)
+    target = tmp_path / "ipdb.bin"
+    assert build_ip_database(source, target) == 3
+    return target
+
+
+@pytest.mark.parametrize(
+    "ip, expected",
+    [
+        ("1.0.0.0", (-27.4748, 153.017)),
+        ("1.0.0.255", (-27.4748, 153.017)),
+        ("1.0.5.17", (-37.814, 144.963)),
+        ("8.8.8.8\n", (37.4223, -122.085)),
+        ("1.0.1.0", None),
+        ("0.255.255.255", None),
+        ("9.0.0.0", None),
+        ("2001:200::1", None),
+        ("garbage", None),
+    ],
+)
+def test_lookup_finds_containing_range(database, ip, expected):
+    with IpDatabase(database) as db:
+        result = db.lookup(ip)
+    if expected is None:
+        assert result is None
+    else:
+        assert result == pytest.approx(expected, abs=1e-4)
+
+
+def test_lookup_ip_location_without_database_returns_none(tmp_path):
+    assert lookup_ip_location("8.8.8.8", path=tmp_path / "missing.bin") is None
+
+
+def test_invalid_database_file_is_rejected(tmp_path):
+    path = tmp_path / "ipdb.bin"
+    path.write_bytes(b"not a database")
+    with pytest.raises(ValueError):
+        IpDatabase(path)
+    assert lookup_ip_location("8.8.8.8", path=path) is None
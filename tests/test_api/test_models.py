@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from weatherpy.api.comm import parse_weather_forecast
+from weatherpy.api.models import NO_PRECIPITATION, Forecast, Geolocation, Weather
+
+FORECAST_PAYLOAD = {
+    "city": {"name": "London", "country": "GB", "coord": {"lat": 51.5073, "lon": -0.1276}},
+    "list": [
+        {
+            "dt": 1700000000 + i * 3 * 3600,
+            "main": {"temp": 10.0 + i, "feels_like": 8.0 + i, "pressure": 1000 + i, "humidity": 80},
+            "weather": [{"description": "light rain", "icon": "10d"}],
+            "wind": {"speed": 3.5, "deg": 90 + i},
+            **({"rain": {"3h": 0.5 * i}} if i % 2 else {}),
+        }
+        for i in range(4)
+    ],
+}
+
+
+def test_parse_weather_forecast_fills_columns():
+    forecast = parse_weather_forecast(FORECAST_PAYLOAD)
+    assert len(forecast) == 4
+    assert list(forecast.dt) == [1700000000 + i * 3 * 3600 for i in range(4)]
+    assert list(forecast.temp) == [10.0, 11.0, 12.0, 13.0]
+    assert list(forecast.pressure) == [1000, 1001, 1002, 1003]
+    assert list(forecast.rain) == [0, 0.5, 0, 1.5]
+    assert list(forecast.snow) == [0, 0, 0, 0]
+    assert forecast.column("wind_deg").tolist() == [90, 91, 92, 93]
+
+
+def test_forecast_row_view_matches_columns():
+    forecast = parse_weather_forecast(FORECAST_PAYLOAD)
+    dt, weather = forecast.weathers[1]
+    assert dt == datetime.fromtimestamp(1700000000 + 3 * 3600)
+    assert weather == Weather(
+        description=(("light rain", "10d"),),
+        temp=11.0,
+        temp_feel=9.0,
+        pressure=1001,
+        humidity=80,
+        wind_spd=3.5,
+        wind_deg=91,
+        rain={"3h": 0.5},
+        snow={},
+    )
+
+
+def test_forecast_can_be_built_from_rows():
+    forecast = parse_weather_forecast(FORECAST_PAYLOAD)
+    rebuilt = Forecast(loc=Geolocation("London", "GB", "", 51.5, -0.12), weathers=forecast.weathers)
+    assert rebuilt.weathers == forecast.weathers
+
+
+def test_forecast_rows_share_descriptions_and_empty_precipitation():
+    forecast = parse_weather_forecast(FORECAST_PAYLOAD)
+    assert all(description is forecast.description[0] for description in forecast.description)
+    (_, first), (_, second) = forecast.weathers[0], forecast.weathers[2]
+    assert first.rain is second.rain is first.snow is NO_PRECIPITATION
+
+
+def test_models_are_slotted_and_hashable():
+    loc = Geolocation("London", "GB", "", 51.5, -0.12)
+    _, weather = parse_weather_forecast(FORECAST_PAYLOAD).weathers[1]
+    assert not hasattr(loc, "__dict__") and not hasattr(weather, "__dict__")
+    assert len({loc, Geolocation("London", "GB", "", 51.5, -0.12)}) == 1
+    assert hash(weather) == hash(parse_weather_forecast(FORECAST_PAYLOAD).weathers[1][1])
@@ -0,0 +1,95 @@
+import json
+import threading
+
+import pytest
+from weatherpy.api import ratelimit
+from weatherpy.api.exceptions import RateLimited
+from weatherpy.api.ratelimit import RateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    state = {"now": 1000.0, "slept": []}
+
+    def sleep(seconds):
+        state["slept"].append(seconds)
+        state["now"] += seconds
+
+    monkeypatch.setattr(ratelimit.time, "time", lambda: state["now"])
+    monkeypatch.setattr(ratelimit.time, "sleep", sleep)
+    return state
+
+
+def test_burst_is_served_without_waiting(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=60, capacity=3)
+    assert [limiter.acquire() for _ in range(3)] == [0, 0, 0]
+    assert clock["slept"] == []
+
+
+def test_calls_over_budget_wait_for_their_slot(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=60, capacity=1, max_wait=2)
+    limiter.acquire()
+    assert limiter.acquire() == pytest.approx(1)
+    assert clock["slept"] == [pytest.approx(1)]
+
+
+def test_calls_fail_fast_when_the_wait_is_too_long(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=6, capacity=1, max_wait=2)
+    limiter.acquire()
+    with pytest.raises(RateLimited) as exc_info:
+        limiter.acquire()
+    assert exc_info.value.retry_after == pytest.approx(10)
+    # A rejected call doesn't consume from the bucket.
+    clock["now"] += 10
+    assert limiter.acquire() == 0
+
+
+def test_bucket_is_shared_through_the_state_file(tmp_path, clock):
+    first = RateLimiter(tmp_path / "state.json", calls_per_minute=60, capacity=2, max_wait=0)
+    second = RateLimiter(tmp_path / "state.json", calls_per_minute=60, capacity=2, max_wait=0)
+    first.acquire()
+    second.acquire()
+    with pytest.raises(RateLimited):
+        first.acquire()
+
+
+def test_drain_empties_the_bucket(tmp_path, clock):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=60, capacity=5, max_wait=0)
+    limiter.drain()
+    assert json.loads((tmp_path / "state.json").read_text())["tokens"] == 0
+    with pytest.raises(RateLimited):
+        limiter.acquire()
+
+
+def test_concurrent_callers_never_overdraw(tmp_path):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=1, capacity=20, max_wait=0)
+    granted, rejected = [], []
+
+    def call():
+        try:
+            limiter.acquire()
+            granted.append(1)
+        except RateLimited:
+            rejected.append(1)
+
+    threads = [threading.Thread(target=call) for _ in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(granted) == 20
+    assert len(rejected) == 20
+
+
+def test_zero_rate_disables_limiting(tmp_path):
+    limiter = RateLimiter(tmp_path / "state.json", calls_per_minute=0)
+    assert limiter.acquire() == 0
+    assert not (tmp_path / "state.json").exists()
+
+
+@pytest.mark.parametrize("value, rate", [("120", 120), ("0", 0), ("60/min", 60), ("-5", 60), ("nan", 60)])
+def test_rate_is_read_from_the_environment(monkeypatch, caplog, value, rate):
+    monkeypatch.setenv(ratelimit.RATE_ENV, value)
+    monkeypatch.setattr(ratelimit, "_limiter", None)
+    assert ratelimit.get_rate_limiter().rate * 60 == rate
+    assert ("Ignoring WEATHERPY_CALLS_PER_MINUTE" in caplog.text) == (rate == 60)
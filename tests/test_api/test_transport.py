@@ -0,0 +1,87 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from requests.exceptions import ConnectionError
+from weatherpy.api import comm
+from weatherpy.api.exceptions import BadRequest, CircuitOpen
+from weatherpy.api.transport import CircuitBreaker, Transport, backoff_delay, transport_settings
+
+
+def _response(status_code: int) -> MagicMock:
+    resp = MagicMock()
+    resp.status_code = status_code
+    return resp
+
+
+def test_circuit_breaker_opens_after_threshold_and_recovers():
+    breaker = CircuitBreaker(threshold=2, recovery_time=10)
+    with patch("weatherpy.api.transport.time.monotonic", return_value=100.0):
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+    with patch("weatherpy.api.transport.time.monotonic", return_value=111.0):
+        assert breaker.allow()
+        assert not breaker.allow()
+        breaker.record_success()
+        assert breaker.allow()
+
+
+@pytest.mark.parametrize("attempt", [0, 1, 5, 20])
+def test_backoff_delay_is_bounded(attempt):
+    assert 0 <= backoff_delay(attempt, base=0.5, cap=3) <= min(3, 0.5 * 2**attempt)
+
+
+@patch("weatherpy.api.transport.time.sleep")
+def test_transport_retries_server_errors(sleep):
+    transport = Transport(max_retries=3)
+    transport.session.get = MagicMock(side_effect=[_response(503), _response(502), _response(200)])
+    resp = transport.get("https://example.com/x")
+    assert resp.status_code == 200
+    assert transport.session.get.call_count == 3
+    assert sleep.call_count == 2
+
+
+@patch("weatherpy.api.transport.time.sleep")
+def test_transport_does_not_retry_client_errors(sleep):
+    transport = Transport(max_retries=3)
+    transport.session.get = MagicMock(return_value=_response(401))
+    assert transport.get("https://example.com/x").status_code == 401
+    assert transport.session.get.call_count == 1
+
+
+@patch("weatherpy.api.transport.time.sleep")
+def test_transport_passes_timeouts_and_raises_after_retries(sleep):
+    transport = Transport(connect_timeout=1, read_timeout=2, max_retries=2)
+    transport.session.get = MagicMock(side_effect=ConnectionError())
+    with pytest.raises(ConnectionError):
+        transport.get("https://example.com/x")
+    assert transport.session.get.call_count == 3
+    assert transport.session.get.call_args.kwargs["timeout"] == (1, 2)
+
+
+@patch("weatherpy.api.transport.time.sleep")
+def test_transport_rejects_calls_while_circuit_is_open(sleep):
+    transport = Transport(max_retries=10)
+    transport.session.get = MagicMock(side_effect=ConnectionError())
+    with pytest.raises(ConnectionError):
+        transport.get("https://example.com/x")
+    with pytest.raises(CircuitOpen):
+        transport.get("https://example.com/y")
+
+
+def test_timeouts_and_retries_are_read_from_the_environment(monkeypatch, caplog):
+    monkeypatch.setenv("WEATHERPY_CONNECT_TIMEOUT", "1.5")
+    monkeypatch.setenv("WEATHERPY_READ_TIMEOUT", "0")
+    monkeypatch.setenv("WEATHERPY_MAX_RETRIES", "1")
+    assert transport_settings() == {"connect_timeout": 1.5, "read_timeout": 10.0, "max_retries": 1}
+    assert "Ignoring WEATHERPY_READ_TIMEOUT='0'" in caplog.text
+
+
+def test_server_errors_without_a_json_body_raise_bad_request():
+    resp = _response(503)
+    resp.text = "<html><body>503 Service Unavailable</body></html>"
+    resp.json.side_effect = ValueError("Expecting value")
+    with pytest.raises(BadRequest) as exc:
+        comm.fetch_weather_data("weather", "url", 51.5, -0.13, use_cache=False, request=lambda url: resp)
+    assert exc.value.code == 503
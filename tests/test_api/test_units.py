@@ -0,0 +1,51 @@
+from array import array
+
+import pytest
+from weatherpy.api.units import convert, convert_column
+
+
+@pytest.mark.parametrize(
+    "value, quantity, units, expected",
+    [
+        (273.15, "temp", "metric", 0),
+        (273.15, "temp", "imperial", 32),
+        (310.15, "temp", "imperial", 98.6),
+        (273.15, "temp", "standard", 273.15),
+        (10, "wind", "metric", 36),
+        (10, "wind", "imperial", 22.369),
+        (10, "wind", "standard", 10),
+        (1013.25, "pressure", "metric", 1013.25),
+        (1013.25, "pressure", "imperial", 29.921),
+    ],
+)
+def test_convert(value, quantity, units, expected):
+    assert convert(value, quantity, units) == pytest.approx(expected, abs=1e-3)
+
+
+@pytest.mark.parametrize(
+    "value, quantity, units, source, expected",
+    [
+        # OpenWeather reports metric wind speed in m/s and imperial pressure in hPa.
+        (10, "wind", "metric", "metric", 36),
+        (10, "wind", "standard", "metric", 10),
+        (1013.25, "pressure", "imperial", "imperial", 29.921),
+        (50, "temp", "metric", "imperial", 10),
+        (22.369, "wind", "metric", "imperial", 36),
+        (20, "temp", "standard", "metric", 293.15),
+    ],
+)
+def test_convert_from_api_units(value, quantity, units, source, expected):
+    assert convert(value, quantity, units, source=source) == pytest.approx(expected, abs=1e-3)
+
+
+def test_convert_column():
+    column = array("d", [273.15, 283.15, 293.15])
+    assert list(convert_column(column, "temp", "metric")) == pytest.approx([0, 10, 20])
+    assert list(convert_column(array("l", [1000, 1010]), "pressure", "metric")) == [1000, 1010]
+    assert list(convert_column(array("d", [1, 2]), "wind", "metric")) == pytest.approx([3.6, 7.2])
+    assert list(convert_column([], "temp", "imperial")) == []
+
+
+def test_unknown_units():
+    with pytest.raises(ValueError):
+        convert(1, "temp", "kelvin")
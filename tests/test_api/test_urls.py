@@ -0,0 +1,17 @@
+from weatherpy.api.urls import build_current_weather_url, build_direct_geocoding_url, build_ip_url
+
+
+def test_urls_point_at_open_weather_by_default(monkeypatch):
+    monkeypatch.delenv("WEATHERPY_API_URL", raising=False)
+    monkeypatch.delenv("WEATHERPY_IP_URL", raising=False)
+    assert build_direct_geocoding_url(q="London", limit=5) == (
+        "https://api.openweathermap.org/geo/1.0/direct?q=London&limit=5"
+    )
+    assert build_ip_url() == "https://api.ipify.org"
+
+
+def test_base_urls_can_be_overridden(monkeypatch):
+    monkeypatch.setenv("WEATHERPY_API_URL", "http://127.0.0.1:8000/")
+    monkeypatch.setenv("WEATHERPY_IP_URL", "http://127.0.0.1:8000/ip")
+    assert build_current_weather_url(lat=1, lon=2) == "http://127.0.0.1:8000/data/2.5/weather?lat=1&lon=2"
+    assert build_ip_url() == "http://127.0.0.1:8000/ip"
@@ -0,0 +1,91 @@
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from rich.segment import Segment
+from weatherpy.presenter.braille import BARS, MARKERS, BraillePlot, Canvas, Series
+
+
+def _text(lines):
+    return ["".join(segment.text for segment in line) for line in lines]
+
+
+def test_canvas_dots_map_to_braille_cells():
+    canvas = Canvas(2, 1)
+    canvas.dot(0, 0, "red")
+    canvas.dot(1, 3, "red")
+    canvas.dot(2, 1, "blue")
+    assert [canvas.char(0), canvas.char(1)] == ["⢁", "⠂"]
+    assert canvas.colors == ["red", "blue"]
+
+
+def test_line_is_continuous():
+    canvas = Canvas(4, 1)
+    canvas.line(0, 3, 7, 0, "red")
+    assert all(canvas.dots)
+    assert canvas.char(0) == "⣀"
+
+
+@pytest.mark.parametrize("width, height", [(40, 8), (80, 12), (10, 3)])
+def test_render_fills_the_given_size(width, height):
+    plot = BraillePlot(
+        x=[0, 1, 2, 3],
+        series=[Series([1, 5, 3, 8], "Temp"), Series([0, 4, 2, 6], "Feels like")],
+        xticks=[(0, "00:00"), (2, "06:00")],
+    )
+    lines = plot.render(width, height)
+    assert len(lines) == height
+    assert all(Segment.get_line_length(line) == width for line in lines)
+
+
+def test_render_labels_axes_and_legend():
+    plot = BraillePlot(x=[0, 1, 2], series=[Series([1000, 1010, 1020], "Pressure")], xticks=[(1, "12:00")])
+    text = _text(plot.render(40, 8))
+    assert text[0].startswith("1020.0┤ ⢕⢕ Pressure")
+    assert text[5].startswith("1000.0┤")
+    assert "┬" in text[6]
+    assert text[7].strip() == "12:00"
+
+
+def test_stacked_bars_and_glyphs():
+    plot = BraillePlot(
+        x=[0, 1, 2, 3],
+        series=[Series([2, 0, 0, 1], "Rain", kind=BARS), Series([2, 0, 4, 0], "Snow", kind=BARS, glyphs="❄")],
+    )
+    assert plot.y_range() == (0, 4)
+    text = _text(plot.render(20, 5))
+    # Snow is stacked on the rain at x=0 and fills whole cells; rain is drawn with braille dots from the bottom.
+    assert "❄" in text[0]
+    assert "⣿" in text[3]
+
+
+def test_markers_use_the_glyph_of_each_point():
+    plot = BraillePlot(x=[0, 1], series=[Series([1, 1], kind=MARKERS, glyphs=["↑", "→"])])
+    text = _text(plot.render(12, 3))
+    assert "↑" in text[0] or "↑" in text[1]
+    assert "→" in "".join(text)
+
+
+def test_plots_render_concurrently():
+    plots = [BraillePlot(x=list(range(40)), series=[Series([(i * k) % 17 for i in range(40)])]) for k in range(8)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        concurrent = list(executor.map(lambda plot: _text(plot.render(60, 10)), plots))
+    assert concurrent == [_text(plot.render(60, 10)) for plot in plots]
+
+
+def test_forecast_panel_does_not_need_plotext():
+    code = (
+        "import io, sys\n"
+        "from rich.console import Console\n"
+        "from weatherpy.api.models import Forecast, Geolocation\n"
+        "from weatherpy.presenter.forecast import create_forecast_panel\n"
+        "forecast = Forecast(Geolocation(name='X', country='Y', state='', lat=0, lon=0), utc_offset=0)\n"
+        "for i in range(8):\n"
+        "    forecast.append(dt=1714521600 + i * 10800, description=(('mist', '50d'),), temp=280 + i, temp_feel=279,\n"
+        "                    pressure=1010, humidity=70, wind_spd=2, wind_deg=45 * i, rain=0.5, snow=0)\n"
+        "Console(file=io.StringIO(), width=100, height=60).print(create_forecast_panel(forecast, 'metric'))\n"
+        "print('plotext' in sys.modules)\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,52 @@
+import io
+import time
+from unittest.mock import patch
+
+import pytest
+from rich.console import Console
+from weatherpy.presenter import forecast as presenter
+from weatherpy.presenter.braille import Series
+from weatherpy.presenter.forecast import WeatherPlot
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    presenter.clear_canvas_cache()
+    yield
+    presenter.clear_canvas_cache()
+
+
+START = int(time.time())
+
+
+def _plot(y) -> WeatherPlot:
+    return WeatherPlot(x=[START + i * 3 * 3600 for i in range(len(y))], series=[Series(y, "Pressure [hPa]")])
+
+
+def _render(plot: WeatherPlot, width: int = 80) -> str:
+    console = Console(file=io.StringIO(), width=width, height=10, color_system=None)
+    console.print(plot)
+    return console.file.getvalue()
+
+
+def test_unchanged_plot_is_built_once():
+    with patch.object(WeatherPlot, "_build", autospec=True, side_effect=WeatherPlot._build) as build:
+        first = _render(_plot([1000, 1002, 1001]))
+        second = _render(_plot([1000, 1002, 1001]))
+    assert build.call_count == 1
+    assert first == second
+
+
+def test_plot_is_rebuilt_when_data_or_size_changes():
+    with patch.object(WeatherPlot, "_build", autospec=True, side_effect=WeatherPlot._build) as build:
+        _render(_plot([1000, 1002, 1001]))
+        _render(_plot([1000, 1002, 1003]))
+        _render(_plot([1000, 1002, 1003]), width=100)
+    assert build.call_count == 3
+
+
+def test_cache_is_bounded():
+    with patch.object(presenter, "CANVAS_CACHE_SIZE", 2):
+        for i in range(4):
+            _render(_plot([1000, 1002, 1000 + i]))
+    assert len(presenter._canvas_cache) == 2
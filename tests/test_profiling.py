@@ -0,0 +1,51 @@
+import json
+
+import pytest
+from weatherpy import profiling
+
+
+@pytest.fixture
+def enabled():
+    profiling.enable()
+    yield
+    profiling.disable()
+
+
+def test_spans_are_not_recorded_when_disabled():
+    profiling.disable()
+    with profiling.span("request") as s:
+        s.set(bytes=10)
+    assert s is profiling.NULL_SPAN
+
+    @profiling.timed("fn")
+    def fn():
+        return 42
+
+    assert fn() == 42
+
+
+def test_spans_and_timed_functions_are_recorded(enabled):
+    @profiling.timed("parse")
+    def parse():
+        with profiling.span("decode") as s:
+            s.set(bytes=123)
+        return 1
+
+    assert parse() == 1
+    spans = profiling.trace()["spans"]
+    assert [s["name"] for s in spans] == ["parse", "decode"]
+    assert spans[1]["bytes"] == 123
+    assert spans[0]["duration_ms"] >= spans[1]["duration_ms"] >= 0
+
+
+def test_write_trace_to_file(enabled, tmp_path):
+    with profiling.span("handle_config"):
+        pass
+    target = tmp_path / "trace.json"
+    profiling.write_trace(str(target))
+    assert json.loads(target.read_text())["spans"][0]["name"] == "handle_config"
+
+
+def test_write_trace_to_stderr(enabled, capsys):
+    profiling.write_trace("-")
+    assert json.loads(capsys.readouterr().err) == {"total_ms": pytest.approx(0, abs=1000), "spans": []}
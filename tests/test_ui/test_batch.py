@@ -0,0 +1,97 @@
+import asyncio
+import time
+
+import pytest
+from requests.exceptions import ConnectionError
+from weatherpy.api import aio
+from weatherpy.api.aio import AsyncClient
+from weatherpy.api.exceptions import BadRequest
+from weatherpy.api.models import Geolocation
+from weatherpy.ui.batch import iter_batch, parse_location_query, read_locations
+
+
+class FakeClient:
+    delays = {"Slow": 0.2, "Fast": 0.01, "Medium": 0.1}
+
+    async def locations_by_name(self, name):
+        if name == "Nowhere":
+            return []
+        if name == "Down":
+            raise BadRequest(code=503, message="service unavailable")
+        return [Geolocation(name=name, country="GB", state="", lat=self.delays[name], lon=0)]
+
+    async def current_weather(self, lat, lon):
+        if lat == 66:
+            raise BadRequest(code=401, message="invalid API key")
+        if lat == 77:
+            raise ConnectionError(f"Max retries exceeded with url: /data/2.5/weather?lat={lat}&lon={lon}&appid=s3cr3t")
+        await asyncio.sleep(lat)
+        return ("current", lat, lon)
+
+    async def weather_forecast(self, lat, lon):
+        await asyncio.sleep(lat)
+        return ("forecast", lat, lon)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("London", "London"),
+        ("  London, GB ", "London, GB"),
+        ("51.5,-0.12", (51.5, -0.12)),
+        ("51.5 , -0.12", (51.5, -0.12)),
+        ("91,0", "91,0"),
+    ],
+)
+def test_parse_location_query(query, expected):
+    assert parse_location_query(query) == expected
+
+
+def test_read_locations_skips_blank_lines_and_comments(tmp_path):
+    file = tmp_path / "sites.txt"
+    file.write_text("London\n\n# comment\n 51.5,-0.12 \n")
+    assert read_locations(file) == ["London", "51.5,-0.12"]
+
+
+def test_iter_batch_yields_results_as_they_complete():
+    async def collect():
+        return [result async for result in iter_batch(["Slow", "Fast", "Medium"], FakeClient(), forecast=True)]
+
+    start = time.perf_counter()
+    results = asyncio.run(collect())
+    elapsed = time.perf_counter() - start
+
+    assert [result.query for result in results] == ["Fast", "Medium", "Slow"]
+    assert all(result.current[0] == "current" and result.forecast[0] == "forecast" for result in results)
+    assert elapsed < 0.3
+
+
+def test_iter_batch_reports_errors_per_location():
+    async def collect():
+        return [result async for result in iter_batch(["Nowhere", "Down", "66,0", "77,0"], FakeClient())]
+
+    results = {result.query: result for result in asyncio.run(collect())}
+    assert results["Nowhere"].error == "Location 'Nowhere' couldn't be found."
+    assert results["Down"].error == "Code 503: Service Unavailable"
+    assert results["66,0"].error == "Code 401: Invalid Api Key"
+    assert results["77,0"].error == "upstream request failed (ConnectionError)"
+
+
+def test_async_geocoding_raises_error_responses(monkeypatch):
+    class ErrorResponse:
+        status_code = 401
+        text = '{"cod": 401, "message": "Invalid API key"}'
+
+        def json(self):
+            return {"cod": 401, "message": "Invalid API key"}
+
+    monkeypatch.setattr(aio, "send_request", lambda url, max_wait=None: ErrorResponse())
+    monkeypatch.setattr("weatherpy.api.citydb.lookup_city", lambda name: None)
+
+    async def geocode():
+        async with AsyncClient(token="token", use_cache=False) as client:
+            return await client.locations_by_name("London")
+
+    with pytest.raises(BadRequest) as exc:
+        asyncio.run(geocode())
+    assert exc.value.code == 401
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from weatherpy.api.models import Current, Forecast, Geolocation, Weather
+from weatherpy.ui.batch import BatchResult
+from weatherpy.ui.output import (
+    BATCH_DAILY_FIELDS,
+    FIELDS,
+    RowWriter,
+    batch_rows,
+    create_writer,
+    current_row,
+    forecast_rows,
+)
+
+LOC = Geolocation(name="Zürich", country="CH", state="", lat=47.37, lon=8.54)
+START = 1714521600  # 2024-05-01 00:00 UTC
+
+
+def make_forecast(slots=3):
+    forecast = Forecast(LOC, utc_offset=7200)
+    for i in range(slots):
+        forecast.append(
+            dt=START + i * 3 * 3600,
+            description=(("light rain", "10d"), ("mist", "50d")),
+            temp=283.15 + i,
+            temp_feel=282.15 + i,
+            pressure=1010,
+            humidity=70,
+            wind_spd=2.5,
+            wind_deg=180,
+            rain=0.5 * i,
+        )
+    return forecast
+
+
+def make_current():
+    dt = datetime.fromtimestamp(START)
+    weather = Weather(
+        description=(("clear sky", "01d"),),
+        temp=285.65,
+        temp_feel=284.15,
+        pressure=1015,
+        humidity=60,
+        wind_spd=3.0,
+        wind_deg=90,
+        rain={"1h": 0.2},
+    )
+    return Current(dt=dt, sunrise=dt, sunset=dt, loc=LOC, weather=weather)
+
+
+def test_current_row():
+    row = current_row(make_current(), "metric")
+    assert row["kind"] == "current"
+    assert row["name"] == "Zürich"
+    assert row["temp"] == 12.5
+    assert row["temp_feel"] == 11.0
+    assert row["wind_spd"] == 10.8
+    assert row["pressure"] == 1015
+    assert row["rain"] == 0.2
+    assert row["snow"] == 0
+    assert datetime.fromisoformat(row["dt"]).timestamp() == START
+    assert set(row) <= set(FIELDS)
+
+
+def test_forecast_rows():
+    rows = list(forecast_rows(make_forecast(), "imperial", query="zurich"))
+    assert [row["temp"] for row in rows] == [50.0, 51.8, 53.6]
+    assert {row["wind_spd"] for row in rows} == {5.59}
+    assert {row["pressure"] for row in rows} == {29.83}
+    assert [row["rain"] for row in rows] == [0, 0.5, 1.0]
+    assert rows[0]["description"] == "light rain; mist"
+    assert rows[0]["icon"] == "10d; 50d"
+    assert {row["query"] for row in rows} == {"zurich"}
+    assert {row["units"] for row in rows} == {"imperial"}
+
+
+def test_ndjson_writer():
+    stream = io.StringIO()
+    with create_writer("ndjson", stream=stream) as writer:
+        writer.write(forecast_rows(make_forecast(), "metric"))
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert list(json.loads(lines[0])) == list(FIELDS)
+    assert json.loads(lines[0])["error"] is None
+
+
+@pytest.mark.parametrize("slots", [0, 1, 3])
+def test_json_writer_produces_one_array(slots):
+    stream = io.StringIO()
+    with create_writer("json", stream=stream) as writer:
+        writer.write(forecast_rows(make_forecast(slots), "metric"))
+        writer.write([])
+    assert [row["temp"] for row in json.loads(stream.getvalue())] == [10 + i for i in range(slots)]
+
+
+def test_csv_writer_writes_header_once():
+    stream = io.StringIO()
+    with create_writer("csv", stream=stream) as writer:
+        writer.write([current_row(make_current(), "metric")])
+        writer.write(forecast_rows(make_forecast(), "metric"))
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row["kind"] for row in rows] == ["current", "forecast", "forecast", "forecast"]
+    assert rows[0]["name"] == "Zürich"
+    assert rows[1]["sunrise"] == ""
+
+
+def test_row_writer_requires_write():
+    class IncompleteWriter(RowWriter):
+        pass
+
+    with pytest.raises(TypeError):
+        IncompleteWriter(io.StringIO())
+
+
+def test_batch_rows():
+    failed = list(batch_rows(BatchResult(query="Nowhere", error="not found"), "metric"))
+    assert failed == [{"query": "Nowhere", "kind": "error", "error": "not found"}]
+
+    result = BatchResult(query="Zurich", current=make_current(), forecast=make_forecast(slots=16))
+    rows = list(batch_rows(result, "metric", daily=True))
+    assert [row["kind"] for row in rows] == ["current", "daily", "daily"]
+    assert all(set(row) <= set(BATCH_DAILY_FIELDS) for row in rows)
+    assert [row["slots"] for row in rows[1:]] == [8, 8]
+
+
+def test_output_path_does_not_import_rich_or_plotext():
+    code = (
+        "import sys\n"
+        "import weatherpy.ui.cli, weatherpy.ui.batch, weatherpy.ui.output, weatherpy.ui.snapshot\n"
+        "loaded = sorted(name for name in sys.modules if name.split('.')[0] in ('rich', 'plotext'))\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,195 @@
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+from requests.exceptions import ConnectionError
+from weatherpy.api import comm
+from weatherpy.api.cache import MemoryCache
+from weatherpy.api.exceptions import BadRequest, RateLimited
+from weatherpy.ui.server import GEOCODING_MISS_TTL, WeatherService, create_server
+
+CURRENT = {
+    "coord": {"lat": 51.51, "lon": -0.13},
+    "weather": [{"description": "clear sky", "icon": "01d"}],
+    "main": {"temp": 283.15, "feels_like": 282.15, "pressure": 1015, "humidity": 60},
+    "wind": {"speed": 2.0, "deg": 90},
+    "dt": 1714521600,
+    "sys": {"country": "GB", "sunrise": 1714500000, "sunset": 1714550000},
+    "id": 2643743,
+    "name": "London",
+}
+FORECAST = {
+    "city": {"name": "London", "country": "GB", "coord": {"lat": 51.51, "lon": -0.13}, "timezone": 3600},
+    "list": [
+        {
+            "dt": 1714521600 + i * 3 * 3600,
+            "main": {"temp": 283.15 + i, "feels_like": 282.15, "pressure": 1015, "humidity": 60},
+            "weather": [{"description": "clear sky", "icon": "01d"}],
+            "wind": {"speed": 2.0, "deg": 90},
+        }
+        for i in range(4)
+    ],
+}
+DIRECT = [{"name": "London", "country": "GB", "state": "England", "lat": 51.5073, "lon": -0.1276}]
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def json(self):
+        return self.data
+
+
+class Upstream:
+    """Answers API URLs by path and only knows London; `error` is raised instead if set."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = []
+
+    def __call__(self, url):
+        self.calls.append(url)
+        if self.error is not None:
+            raise self.error
+        for path, data in (("/weather?", CURRENT), ("/forecast?", FORECAST), ("/direct?q=london", DIRECT)):
+            if path in url.lower():
+                return FakeResponse(data)
+        return FakeResponse([])
+
+
+@pytest.fixture(autouse=True)
+def no_history(monkeypatch):
+    monkeypatch.setattr(comm, "record_history", lambda *args: None)
+    monkeypatch.setattr("weatherpy.api.citydb.lookup_city", lambda name: None)
+
+
+def make_service(upstream):
+    return WeatherService(token="token", units="metric", use_cache=False, request=upstream)
+
+
+def test_current_is_converted_and_cached_in_memory():
+    upstream = Upstream()
+    service = make_service(upstream)
+    status, body = service.handle("/current", {"lat": "51.5073", "lon": "-0.1276"})
+    assert status == 200
+    assert (body["name"], body["temp"], body["units"]) == ("London", 10.0, "metric")
+    status, body = service.handle("/current", {"lat": "51.5071", "lon": "-0.1279", "units": "imperial"})
+    assert (status, body["temp"]) == (200, 50.0)
+    assert len(upstream.calls) == 1
+    assert service.stats_endpoint({})["cache"]["hits"] == 1
+
+
+def test_forecast_by_city_and_daily():
+    upstream = Upstream()
+    service = make_service(upstream)
+    status, rows = service.handle("/forecast", {"city": "London"})
+    assert status == 200
+    assert len(rows) == 4
+    assert rows[0]["query"] == "London"
+    status, days = service.handle("/forecast", {"city": "london", "daily": "1"})
+    assert status == 200
+    assert {day["kind"] for day in days} == {"daily"}
+    assert len(upstream.calls) == 2
+
+
+def test_geocode():
+    status, body = make_service(Upstream()).handle("/geocode", {"q": "London"})
+    assert status == 200
+    assert body == [{"name": "London", "state": "England", "country": "GB", "lat": 51.5073, "lon": -0.1276}]
+
+
+@pytest.mark.parametrize(
+    "path, params, error, status",
+    [
+        ("/current", {}, None, 400),
+        ("/current", {"lat": "95", "lon": "0"}, None, 400),
+        ("/current", {"lat": "50", "lon": "0", "units": "kelvin"}, None, 400),
+        ("/current", {"city": "Atlantis"}, None, 404),
+        ("/nowhere", {}, None, 404),
+        ("/current", {"lat": "50", "lon": "0"}, BadRequest(code=401, message="Invalid API key"), 502),
+        ("/current", {"lat": "50", "lon": "0"}, ConnectionError("unreachable"), 502),
+        ("/current", {"lat": "50", "lon": "0"}, RateLimited(retry_after=12), 429),
+        ("/current", {"lat": "50", "lon": "0"}, KeyError("main"), 500),
+    ],
+)
+def test_errors_are_answered_not_raised(path, params, error, status):
+    service = make_service(Upstream(error=error))
+    assert service.handle(path, params)[0] == status
+    assert service.handle("/health", {})[0] == 200
+
+
+def test_upstream_errors_do_not_leak_the_api_key():
+    def unreachable(url):
+        path = url.split("openweathermap.org", 1)[-1]
+        raise ConnectionError(
+            f"HTTPSConnectionPool(host='api.openweathermap.org', port=443): Max retries exceeded "
+            f"with url: {path} (Caused by NewConnectionError('Failed to establish a connection'))"
+        )
+
+    service = WeatherService(token="s3cr3t-key", use_cache=False, request=unreachable)
+    status, body = service.handle("/current", {"lat": "50", "lon": "0"})
+    assert status == 502
+    assert body == {"error": "upstream request failed (ConnectionError)"}
+    assert "s3cr3t-key" not in json.dumps(body)
+
+
+def test_locations_not_found_are_cached_briefly():
+    now = [0.0]
+    upstream = Upstream()
+    service = WeatherService(token="token", use_cache=False, request=upstream, cache=MemoryCache(clock=lambda: now[0]))
+    for city in ("London", "Atlantis", "London", "Atlantis"):
+        service.handle("/geocode", {"q": city})
+    assert len(upstream.calls) == 2
+    now[0] += GEOCODING_MISS_TTL + 1
+    service.handle("/geocode", {"q": "London"})
+    service.handle("/geocode", {"q": "Atlantis"})
+    assert [url.lower().count("atlantis") for url in upstream.calls] == [0, 1, 1]
+
+
+def test_error_messages_leave_out_query_strings():
+    text = "Read timed out. (url: /data/2.5/forecast?lat=1&lon=2&appid=s3cr3t-key) Really?"
+    assert comm.redact_query(text) == "Read timed out. (url: /data/2.5/forecast) Really?"
+    assert comm.error_message(ConnectionError(text)) == "upstream request failed (ConnectionError)"
+    assert comm.error_message(BadRequest(code=401, message="Invalid API key")) == "Code 401: Invalid Api Key"
+
+
+def test_request_or_raise(monkeypatch):
+    class ErrorResponse:
+        status_code = 401
+        text = '{"cod": 401, "message": "Invalid API key"}'
+
+        def json(self):
+            return json.loads(self.text)
+
+    monkeypatch.setattr(comm, "send_request", lambda url, max_wait=None: ErrorResponse())
+    with pytest.raises(BadRequest) as exc:
+        comm.request_or_raise("https://api.openweathermap.org/geo/1.0/direct?q=London")
+    assert exc.value.code == 401
+
+
+def test_http_roundtrip():
+    service = make_service(Upstream())
+    server = create_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        with urlopen(f"{base}/current?lat=51.5&lon=-0.13") as resp:
+            assert resp.headers["Content-Type"].startswith("application/json")
+            assert json.load(resp)["name"] == "London"
+        with pytest.raises(HTTPError) as exc:
+            urlopen(f"{base}/current?lat=abc&lon=0")
+        assert exc.value.code == 400
+        assert "error" in json.load(exc.value)
+        with urlopen(f"{base}/stats") as resp:
+            stats = json.load(resp)
+        assert stats["requests"] == 3
+        assert stats["statuses"] == {"200": 1, "400": 1}
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+from weatherpy.api.exceptions import BadRequest
+from weatherpy.ui import cli, snapshot
+from weatherpy.ui.snapshot import ConfigSnapshot, TokenValidations
+
+CONFIG = "[SETTINGS]\ntoken = {token}\nunits = metric\n\n[HOME]\nlat = 51.5\nlon = -0.13\n"
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    path = tmp_path / "weatherpy.cfg"
+    path.write_text(CONFIG.format(token="a" * 32), encoding="utf8")
+    return path
+
+
+def test_load_parses_the_config_file(cfg, tmp_path):
+    data = ConfigSnapshot(cfg, tmp_path / "snapshot.json").load()
+    assert data == {"SETTINGS": {"token": "a" * 32, "units": "metric"}, "HOME": {"lat": "51.5", "lon": "-0.13"}}
+
+
+def test_unchanged_file_is_not_parsed_again(cfg, tmp_path, monkeypatch):
+    ConfigSnapshot(cfg, tmp_path / "snapshot.json").load()
+
+    def fail(path):
+        raise AssertionError("parsed again")
+
+    monkeypatch.setattr(snapshot, "parse_cfg_file", fail)
+    store = ConfigSnapshot(cfg, tmp_path / "snapshot.json")
+    assert store.load()["SETTINGS"]["units"] == "metric"
+    assert store.load() is store.load()
+
+
+def test_modified_file_invalidates_the_snapshot(cfg, tmp_path):
+    store = ConfigSnapshot(cfg, tmp_path / "snapshot.json")
+    store.load()
+    cfg.write_text(CONFIG.format(token="b" * 32), encoding="utf8")
+    later = time.time() + 10
+    os.utime(cfg, (later, later))
+    assert store.load()["SETTINGS"]["token"] == "b" * 32
+
+
+def test_missing_config_file_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        ConfigSnapshot(tmp_path / "missing.cfg", tmp_path / "snapshot.json").load()
+
+
+def test_token_validations_expire_and_store_digests(tmp_path):
+    validations = TokenValidations(tmp_path / "tokens.json", validity=60)
+    token = "c" * 32
+    assert not validations.is_validated(token)
+
+    validations.record(token)
+    assert validations.is_validated(token)
+    assert token not in (tmp_path / "tokens.json").read_text()
+
+    assert not TokenValidations(tmp_path / "tokens.json", validity=0).is_validated(token)
+    validations.forget(token)
+    assert not validations.is_validated(token)
+
+
+def test_rejected_tokens_are_no_longer_trusted(tmp_path, monkeypatch, capsys):
+    validations = TokenValidations(tmp_path / "tokens.json")
+    monkeypatch.setattr(snapshot, "_validations", validations)
+    token = "d" * 32
+    validations.record(token)
+
+    cli._request_error(BadRequest(code=500, message="Internal error"), token)
+    assert validations.is_validated(token)
+    cli._request_error(BadRequest(code=401, message="Invalid API key"), token)
+    assert not validations.is_validated(token)
+    assert "Code 401: Invalid Api Key" in capsys.readouterr().out
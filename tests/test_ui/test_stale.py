@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+
+import pytest
+from requests.exceptions import ReadTimeout
+from weatherpy.api.exceptions import BadRequest
+from weatherpy.api.models import Current, Geolocation, Weather
+from weatherpy.presenter.utils import format_age
+from weatherpy.ui import stale
+from weatherpy.ui.stale import Revalidator, show_last_known
+
+NOW = 1714521600.0
+
+
+def make_current(temp=285.65):
+    dt = datetime.fromtimestamp(NOW)
+    weather = Weather(
+        description=(("clear sky", "01d"),),
+        temp=temp,
+        temp_feel=temp,
+        pressure=1015,
+        humidity=60,
+        wind_spd=3.0,
+        wind_deg=90,
+    )
+    loc = Geolocation(name="Zürich", country="CH", state="", lat=47.37, lon=8.54)
+    return Current(dt=dt, sunrise=dt, sunset=dt, loc=loc, weather=weather)
+
+
+@pytest.fixture
+def cached(monkeypatch):
+    """Serves a cached payload per endpoint, stored at the given time; parsing just returns the payload."""
+    entries = {}
+    monkeypatch.setattr(stale, "get_last_known", lambda endpoint, lat, lon: entries.get(endpoint))
+    monkeypatch.setattr(stale, "PARSERS", {"weather": lambda data: data, "forecast": lambda data: data})
+    return entries
+
+
+@pytest.fixture
+def fetched(monkeypatch):
+    """Records refresh calls and answers them with the given data, or raises it if it's an exception."""
+    calls = []
+    answers = {}
+
+    def fetcher(endpoint):
+        def fetch(**kwargs):
+            calls.append((endpoint, kwargs))
+            if isinstance(answers[endpoint], Exception):
+                raise answers[endpoint]
+            return answers[endpoint]
+
+        return fetch
+
+    monkeypatch.setattr(stale, "FETCHERS", {"weather": fetcher("weather"), "forecast": fetcher("forecast")})
+    return calls, answers
+
+
+def test_last_known_requires_every_endpoint(cached):
+    cached["weather"] = ({"temp": 1}, NOW - 900)
+    revalidator = Revalidator(1, 2, "token", endpoints=("weather", "forecast"), clock=lambda: NOW)
+    assert revalidator.last_known() is None
+
+    cached["forecast"] = ({"temp": 2}, NOW - 60)
+    data, ages = revalidator.last_known()
+    assert data == {"weather": {"temp": 1}, "forecast": {"temp": 2}}
+    assert ages == {"weather": 900, "forecast": 60}
+    assert not revalidator.is_fresh(ages)
+    assert revalidator.is_fresh({"weather": 60, "forecast": 60})
+
+
+def test_refresh_bypasses_cache(fetched):
+    calls, answers = fetched
+    answers["weather"] = "fresh"
+    revalidator = Revalidator(1, 2, "token")
+    revalidator.start()
+    assert revalidator.wait(timeout=5) == {"weather": "fresh"}
+    assert calls[0][1]["refresh"] is True
+
+
+def test_failed_refresh_keeps_reason(fetched):
+    _, answers = fetched
+    answers["weather"] = BadRequest(code=401, message="Invalid API key")
+    revalidator = Revalidator(1, 2, "token")
+    revalidator.start()
+    assert revalidator.wait(timeout=5) is None
+    assert revalidator.error == "Code 401: Invalid Api Key"
+
+    answers["weather"] = ReadTimeout("Read timed out. (url: /data/2.5/weather?lat=1&lon=2&appid=s3cr3t)")
+    revalidator = Revalidator(1, 2, "s3cr3t")
+    revalidator.start()
+    assert revalidator.wait(timeout=5) is None
+    assert revalidator.error == "upstream request failed (ReadTimeout)"
+
+
+def test_show_last_known_writes_stale_rows_then_refreshes(cached, fetched, monkeypatch, capsys):
+    monkeypatch.setattr(stale, "detach_stdout", lambda: None)
+    calls, answers = fetched
+    cached["weather"] = (make_current(temp=280.15), NOW - 3600)
+    answers["weather"] = make_current(temp=290.15)
+    assert show_last_known(Revalidator(1, 2, "token"), "metric", format="ndjson")
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [row["temp"] for row in rows] == [7.0]
+    assert len(calls) == 1
+
+
+def test_show_last_known_skips_refresh_of_fresh_data(cached, fetched, capsys):
+    calls, _ = fetched
+    cached["weather"] = (make_current(), NOW - 60)
+    assert show_last_known(Revalidator(1, 2, "token", clock=lambda: NOW), "metric", format="ndjson")
+    assert capsys.readouterr().out
+    assert calls == []
+
+
+def test_show_last_known_falls_back_without_cached_data(cached, fetched):
+    calls, _ = fetched
+    assert not show_last_known(Revalidator(1, 2, "token"), "metric", format="ndjson")
+    assert calls == []
+
+
+@pytest.mark.parametrize(
+    "seconds, expected",
+    [
+        (10, "fetched just now"),
+        (600, "fetched 10 min ago"),
+        (7200, "fetched 2 h ago"),
+        (3 * 86400, "fetched 3 days ago"),
+    ],
+)
+def test_format_age(seconds, expected):
+    assert format_age(seconds) == expected
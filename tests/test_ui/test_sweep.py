@@ -0,0 +1,150 @@
+import asyncio
+import json
+
+import pytest
+from requests.exceptions import ReadTimeout
+from weatherpy.api import aio
+from weatherpy.api.aio import AsyncClient
+from weatherpy.api.exceptions import BadRequest, BudgetExhausted
+from weatherpy.ui.sweep import SweepCheckpoint, SweepResult, fetch_point, grid_points, iter_sweep, sweep_rows
+
+GRID = (50.0, 10.0, 51.0, 11.0, 0.5)
+
+
+class FakeCurrent:
+    def __init__(self, station_id):
+        self.station_id = station_id
+
+
+class FakeClient:
+    """Resolves points to one station per whole degree of longitude and fails at latitude 50.5, lon 11."""
+
+    concurrency = 3
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self.calls = []
+
+    def _spend(self):
+        if self.budget is not None and len(self.calls) >= self.budget:
+            raise BudgetExhausted(self.budget)
+
+    async def current_weather(self, lat, lon):
+        self._spend()
+        self.calls.append(("current", lat, lon))
+        await asyncio.sleep(0)
+        if (lat, lon) == (50.5, 11.0):
+            raise BadRequest(code=500, message="internal error")
+        return FakeCurrent(station_id=int(lon))
+
+    async def weather_forecast(self, lat, lon):
+        self._spend()
+        self.calls.append(("forecast", lat, lon))
+        await asyncio.sleep(0)
+        return ("forecast", lat, lon)
+
+
+async def collect(points, client, **kwargs):
+    return [result async for result in iter_sweep(points, client, **kwargs)]
+
+
+def test_grid_points():
+    points = grid_points(*GRID)
+    assert len(points) == 9
+    assert points[0] == (50.0, 10.0)
+    assert points[-1] == (51.0, 11.0)
+    assert grid_points(0, 0, 0.3, 0.3, 0.1)[-1] == (0.3, 0.3)
+
+
+@pytest.mark.parametrize(
+    "grid",
+    [(50, 10, 51, 11, 0), (51, 10, 50, 11, 0.5), (-91, 10, 50, 11, 0.5), (-80, -170, 80, 170, 0.01)],
+)
+def test_grid_points_rejects_invalid_grids(grid):
+    with pytest.raises(ValueError):
+        grid_points(*grid)
+
+
+def test_sweep_skips_forecasts_of_duplicate_stations():
+    client = FakeClient()
+    results = asyncio.run(collect(grid_points(*GRID), client))
+    assert len(results) == 9
+    errors = [r for r in results if r.error]
+    assert [(r.lat, r.lon) for r in errors] == [(50.5, 11.0)]
+    written = [r for r in results if r.current]
+    assert sorted(r.station for r in written) == [10, 11]
+    assert all(r.forecast for r in written)
+    assert len([call for call in client.calls if call[0] == "forecast"]) == 2
+    assert all(r.station in (10, 11) for r in results if r.duplicate)
+
+
+def test_sweep_rows():
+    duplicate = SweepResult(point=4, lat=50.5, lon=10.5, station=10, duplicate=True)
+    assert list(sweep_rows(duplicate, "metric")) == [
+        {"query": "50.5,10.5", "kind": "duplicate", "lat": 50.5, "lon": 10.5, "point": 4, "station": 10}
+    ]
+    # The current weather of a point whose forecast failed isn't written; the point is fetched again on resume.
+    failed = SweepResult(point=5, lat=50.5, lon=11.0, current=FakeCurrent(11), error="Code 500: Internal Error")
+    assert list(sweep_rows(failed, "metric")) == [
+        {"query": "50.5,11.0", "kind": "error", "error": "Code 500: Internal Error", "point": 5, "station": None}
+    ]
+
+
+def test_failed_points_do_not_leak_the_api_key():
+    class TimingOut(FakeClient):
+        async def weather_forecast(self, lat, lon):
+            raise ReadTimeout(f"Read timed out. (url: /data/2.5/forecast?lat={lat}&lon={lon}&appid=s3cr3t)")
+
+    result = asyncio.run(fetch_point(TimingOut(), 0, 50.0, 10.0, forecast=True, stations=set()))
+    assert result.error == "upstream request failed (ReadTimeout)"
+    assert "s3cr3t" not in json.dumps(list(sweep_rows(result, "metric")))
+
+
+def test_sweep_resumes_from_checkpoint(tmp_path):
+    points = grid_points(*GRID)
+    path = tmp_path / "sweep.ckpt"
+    written = []
+    budgets = [4, 4, None]
+    for budget in budgets:
+        checkpoint = SweepCheckpoint(path, grid=GRID)
+        checkpoint.load()
+        stations = checkpoint.stations
+        for result in asyncio.run(collect(points, FakeClient(budget), done=checkpoint.done, stations=stations)):
+            if result.current:
+                written.append(result.station)
+            if not result.error:
+                checkpoint.record(result)
+    # Every station is written exactly once over all runs, and only the failing point is left.
+    assert sorted(written) == [10, 11]
+    assert checkpoint.done == set(range(9)) - {5}
+
+
+def test_checkpoint_drops_partial_line_and_checks_grid(tmp_path):
+    path = tmp_path / "sweep.ckpt"
+    path.write_text(json.dumps({"grid": list(GRID)}) + "\n" + '{"point": 3, "station": 7}\n{"poi')
+    checkpoint = SweepCheckpoint(path, grid=GRID)
+    checkpoint.load()
+    assert checkpoint.done == {3}
+    assert checkpoint.stations == {7}
+    assert path.read_text().endswith("}\n")
+
+    with pytest.raises(ValueError):
+        SweepCheckpoint(path, grid=(0, 0, 1, 1, 0.5)).load()
+
+
+@pytest.mark.parametrize("content", ['{"grid": [50.0]\n', "[1, 2]\n", '{"grid": [50.0]}\n{"station": 7}\n'])
+def test_damaged_checkpoint_raises_value_error(tmp_path, content):
+    path = tmp_path / "sweep.ckpt"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="damaged"):
+        SweepCheckpoint(path, grid=GRID).load()
+
+
+def test_async_client_budget(monkeypatch):
+    monkeypatch.setattr(aio, "send_request", lambda url, max_wait=None: url)
+    client = AsyncClient(token="token", budget=2)
+    assert client._request("a") == "a"
+    assert client._request("b") == "b"
+    with pytest.raises(BudgetExhausted):
+        client._request("c")
+    assert client.requests_sent == 2
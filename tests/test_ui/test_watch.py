@@ -0,0 +1,184 @@
+from datetime import datetime
+
+import pytest
+from requests.exceptions import ConnectionError
+from weatherpy.api import cache, comm
+from weatherpy.api.cache import ResponseCache
+from weatherpy.api.exceptions import BadRequest
+from weatherpy.api.models import Current, Forecast, Geolocation, Weather
+from weatherpy.ui import watch
+from weatherpy.ui.watch import RATE_LIMITED_INTERVAL, RETRY_INTERVAL, Watcher
+
+LOC = Geolocation(name="London", country="GB", state="England", lat=51.5, lon=-0.13)
+
+
+def make_current(temp: float) -> Current:
+    weather = Weather(
+        description=(("Clouds", "03d"),),
+        temp=temp,
+        temp_feel=temp,
+        pressure=1012,
+        humidity=80,
+        wind_spd=3.0,
+        wind_deg=200,
+    )
+    now = datetime(2024, 5, 1, 12)
+    return Current(dt=now, sunrise=now, sunset=now, loc=LOC, weather=weather)
+
+
+def make_forecast(temp: float) -> Forecast:
+    forecast = Forecast(LOC)
+    forecast.append(1714564800, (("Clouds", "03d"),), temp, temp, 1012, 80, 3.0, 200)
+    return forecast
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def api(monkeypatch):
+    calls = {"current": [], "forecast": []}
+    results = {"current": make_current(10), "forecast": make_forecast(10)}
+
+    def fetch(kind):
+        def inner(**kwargs):
+            calls[kind].append(kwargs)
+            result = results[kind]
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return inner
+
+    monkeypatch.setattr(watch, "get_current_weather", fetch("current"))
+    monkeypatch.setattr(watch, "get_weather_forecast", fetch("forecast"))
+    return calls, results
+
+
+def test_polls_follow_separate_schedules(api):
+    calls, _ = api
+    clock = Clock()
+    watcher = Watcher(51.5, -0.13, "metric", "token", current_interval=600, forecast_interval=1800, clock=clock)
+
+    assert watcher.poll() == {"current", "forecast"}
+    assert watcher.seconds_until_next_poll() == 600
+
+    clock.now = 300
+    assert watcher.poll() == set()
+    assert len(calls["current"]) == 1
+
+    clock.now = 600
+    watcher.poll()
+    assert len(calls["current"]) == 2
+    assert len(calls["forecast"]) == 1
+
+    clock.now = 1800
+    watcher.poll()
+    assert len(calls["current"]) == 3
+    assert len(calls["forecast"]) == 2
+
+
+def test_only_changed_views_are_reported(api):
+    _, results = api
+    clock = Clock()
+    watcher = Watcher(51.5, -0.13, "metric", "token", current_interval=600, forecast_interval=600, clock=clock)
+    watcher.poll()
+
+    clock.now = 600
+    results["current"] = make_current(10)
+    results["forecast"] = make_forecast(11)
+    assert watcher.poll() == {"forecast"}
+
+    clock.now = 1200
+    results["current"] = make_current(12)
+    assert watcher.poll() == {"current"}
+
+
+@pytest.mark.parametrize("code, delay", [(500, RETRY_INTERVAL), (429, RATE_LIMITED_INTERVAL)])
+def test_failed_polls_keep_last_data_and_back_off(api, code, delay):
+    _, results = api
+    clock = Clock()
+    watcher = Watcher(51.5, -0.13, "metric", "token", current_interval=600, forecast_interval=1800, clock=clock)
+    watcher.poll()
+    previous = watcher.current
+
+    clock.now = 600
+    results["current"] = BadRequest(code=code, message="failure")
+    assert watcher.poll() == set()
+    assert watcher.current is previous
+    assert watcher.error
+    assert watcher.next_current == 600 + delay
+
+
+def test_intervals_have_a_lower_bound():
+    watcher = Watcher(0, 0, "metric", "token", current_interval=1, forecast_interval=1)
+    assert watcher.current_interval == watcher.forecast_interval == watch.MIN_INTERVAL
+
+
+def test_errors_are_tracked_per_view(api):
+    _, results = api
+    clock = Clock()
+    watcher = Watcher(51.5, -0.13, "metric", "token", current_interval=600, forecast_interval=600, clock=clock)
+    results["current"] = BadRequest(code=500, message="failure")
+    watcher.poll()
+    assert "Failure" in watcher.error
+
+    clock.now = 600
+    results["forecast"] = make_forecast(11)
+    watcher.poll()  # the forecast succeeds, current weather still fails
+    assert "Failure" in watcher.error
+
+    clock.now = 1200
+    results["current"] = make_current(10)
+    watcher.poll()
+    assert watcher.error == ""
+
+
+def test_network_errors_do_not_show_the_api_key(api):
+    _, results = api
+    watcher = Watcher(51.5, -0.13, "metric", "s3cr3t", current_interval=600, forecast_interval=600, clock=Clock())
+    results["current"] = ConnectionError("Max retries exceeded with url: /data/2.5/weather?lat=51.5&appid=s3cr3t")
+    watcher.poll()
+    assert watcher.error == "upstream request failed (ConnectionError)"
+
+
+def test_polls_within_the_cache_ttl_reach_the_api(monkeypatch, tmp_path):
+    payload = {
+        "coord": {"lat": 51.5, "lon": -0.13},
+        "weather": [{"description": "clear sky", "icon": "01d"}],
+        "main": {"temp": 283.15, "feels_like": 282.15, "pressure": 1015, "humidity": 60},
+        "wind": {"speed": 2.0, "deg": 90},
+        "dt": 1714521600,
+        "sys": {"country": "GB", "sunrise": 1714500000, "sunset": 1714550000},
+        "name": "London",
+    }
+    forecast = {"city": {"name": "London", "country": "GB", "coord": {"lat": 51.5, "lon": -0.13}}, "list": []}
+    sent = []
+
+    class Response:
+        status_code = 200
+
+        def __init__(self, data):
+            self.data = data
+
+        def json(self):
+            return self.data
+
+    def send(url, max_wait=None):
+        sent.append(url)
+        return Response(forecast if "/forecast?" in url else payload)
+
+    monkeypatch.setattr(cache, "_cache", ResponseCache(tmp_path))
+    monkeypatch.setattr(comm, "record_history", lambda *args: None)
+    monkeypatch.setattr(watch, "send_request", send)
+    clock = Clock()
+    watcher = Watcher(51.5, -0.13, "metric", "token", current_interval=60, clock=clock)
+    watcher.poll()
+    clock.now = 60
+    watcher.poll()
+    assert len([url for url in sent if "/weather?" in url]) == 2